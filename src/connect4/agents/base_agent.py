@@ -0,0 +1,86 @@
+import numpy as np
+
+from connect4.constants import CONNECT
+from connect4.utils.game_state import GameState
+
+
+class BaseAgent:
+    """
+    Interface shared by all agents.
+
+    A harness keeps one ``GameState`` per game and hands that same object to
+    ``get_move`` on every turn, so agents read the position without copies and can
+    keep incremental state (search trees, transposition tables) for the whole
+    game. Agents may make and undo moves on it while thinking but must leave it
+    as they found it.
+
+    The hooks are optional and do nothing by default:
+
+    * ``reset`` is called before each new game.
+    * ``notify_move`` is called on both agents after every move, with the move
+      already played on the ``GameState``.
+    * ``ponder`` may be called while the opponent is thinking, for up to the given
+      number of seconds.
+
+    Attributes:
+        player_id (int): The ID representing this agent (1 or 2).
+        name (str): Agent's display name.
+    """
+
+    def __init__(self, player_id: int, name: str) -> None:
+        """
+        Initializes the agent with a player ID and a name.
+        """
+        self.player_id = player_id
+        self.name = name
+
+    def get_move(self, game) -> int:
+        """
+        Selects a move.
+
+        Args:
+            game: The shared GameState. An ndarray board with this agent to move is
+                accepted too.
+
+        Returns:
+            int: The selected column index.
+        """
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """
+        Clears any state kept from the previous game.
+        """
+
+    def notify_move(self, game: GameState, col: int, player: int) -> None:
+        """
+        Tells the agent that ``player`` played ``col``; ``game`` already shows the move.
+        """
+
+    def ponder(self, game: GameState, seconds: float) -> None:
+        """
+        Uses up to ``seconds`` of idle time to think about ``game``.
+        """
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def as_game_state(game, player_id: int) -> GameState:
+    """
+    Returns ``game`` if it is a GameState, else wraps an ndarray board with
+    ``player_id`` to move and the ``constants.CONNECT`` win length.
+    """
+    # Duck-typed, since scripts that import ``utils.game_state`` get another class.
+    if hasattr(game, "position"):
+        return game
+    return GameState(np.asarray(game), player_id, CONNECT)
+
+
+def as_board(game) -> np.ndarray:
+    """
+    Returns the (rows, cols) board of a GameState or an ndarray board.
+    """
+    if hasattr(game, "position"):
+        return game.board
+    return game
@@ -0,0 +1,176 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from connect4.agents.base_agent import BaseAgent, as_game_state
+from connect4.agents.minimax_agent import WIN_SCORE
+from connect4.agents.ml_agent import MLAgent
+
+# Expected outcomes (0 to 1 for player 1) are mapped onto -EVAL_SCALE..EVAL_SCALE,
+# far below the win score.
+EVAL_SCALE = 100
+
+# Leaf values remembered across moves and games, by canonical Zobrist hash.
+LEAF_CACHE_SIZE = 1 << 18
+
+
+class HybridAgent(BaseAgent):
+    """
+    Depth-limited negamax that scores its frontier with MLAgent's model.
+
+    A search runs in two passes. The first grows the tree ``depth`` plies deep
+    with make/undo moves on the shared GameState. It resolves wins and full
+    boards exactly, stops expanding a node as soon as one of its moves wins, and
+    collects every leaf, keyed by canonical Zobrist hash (the smaller of ``hash``
+    and ``mirror_hash``) so transpositions and mirror images are scored once. The
+    second pass turns the leaves not already cached into win probabilities with
+    one ``MLAgent.win_probabilities`` call and backs the values up.
+
+    A leaf's value depends only on its position, so the cache holds up to
+    ``LEAF_CACHE_SIZE`` of them for the agent's lifetime, across moves and games.
+    Openings repeated over a tournament, or a search that reaches deeper than
+    the last one, then reuse earlier model results.
+
+    The tree is deliberately full width, without alpha-beta: a cutoff would need
+    leaf values before the batch is scored. The node count grows as ``cols **
+    depth``, which keeps the practical depth around 4.
+
+    Attributes:
+        player_id (int): The ID representing this agent (1 or 2).
+        name (str): Agent's display name.
+        depth (int): Search depth in plies.
+        ml_agent (MLAgent): Agent whose model scores the leaves.
+        last_scores (Dict[int, float]): Negamax score of each root move from the last ``get_move``.
+        last_leaves (int): Frontier positions reached by the last ``get_move``.
+        last_batch (int): Distinct positions sent to the model by the last ``get_move``.
+        last_cache_hits (int): Distinct leaves of the last ``get_move`` found in the cache.
+    """
+
+    def __init__(self, player_id: int, depth: int = 4, ml_agent: Optional[MLAgent] = None,
+                 name: str = "HybridAgent", **ml_kwargs) -> None:
+        """
+        Initializes the HybridAgent instance.
+
+        Args:
+            player_id (int): The agent's ID (1 or 2).
+            depth (int): Search depth in plies.
+            ml_agent (MLAgent or None): Agent whose model scores leaves, so one
+                loaded model can be shared. A new MLAgent is built if omitted.
+            name (str): Optional name of the agent.
+            **ml_kwargs: Passed on to ``MLAgent`` when one is built.
+        """
+        super().__init__(player_id, name)
+        self.depth = depth
+        self.ml_agent = ml_agent if ml_agent is not None else MLAgent(player_id, **ml_kwargs)
+        self._cache: Dict[int, float] = {}
+        self._leaf_values: Dict[int, float] = {}
+        self._pending: Dict[int, np.ndarray] = {}
+        self.last_scores = {}
+        self.last_leaves = 0
+        self.last_batch = 0
+        self.last_cache_hits = 0
+
+    def get_move(self, game) -> int:
+        """
+        Searches ``depth`` plies and returns the move with the best backed-up score.
+
+        Args:
+            game: The shared GameState, or an ndarray board with this agent to move.
+
+        Returns:
+            int: Best column index to play.
+        """
+        game = as_game_state(game, self.player_id)
+        player = game.current_player
+        moves = self._ordered_moves(game)
+        if not moves:
+            raise ValueError(f"[{self.name}] No valid moves available.")
+
+        self.last_leaves = 0
+        self._pending = {}
+        self._leaf_values = {}
+        children = {}
+        for col in moves:
+            game.make_move(col, player)
+            if game.winner == player:
+                game.undo_move(col)
+                self.last_scores = {col: WIN_SCORE}
+                self.last_batch = self.last_cache_hits = 0
+                return col
+            children[col] = self._grow(game, self.depth - 1, 1)
+            game.undo_move(col)
+
+        self._score_pending()
+        self.last_scores = {col: -self._back_up(node, 3 - player) for col, node in children.items()}
+        # ``moves`` is centre-first, so ties go to the more central column.
+        return max(moves, key=lambda col: self.last_scores[col])
+
+    def _grow(self, game, depth: int, ply: int):
+        """
+        Builds the search tree below the current position.
+
+        Returns:
+            A float for a resolved score (for the player to move), the leaf's hash
+            key as an int, or a list of child nodes.
+        """
+        if game.position.is_full():
+            return 0.0
+        if depth <= 0:
+            self.last_leaves += 1
+            key = min(game.hash, game.mirror_hash)
+            if key not in self._leaf_values and key not in self._pending:
+                cached = self._cache.get(key)
+                if cached is None:
+                    self._pending[key] = game.board
+                else:
+                    self._leaf_values[key] = cached
+            return key
+
+        player = game.current_player
+        children = []
+        for col in self._ordered_moves(game):
+            game.make_move(col, player)
+            if game.winner == player:
+                game.undo_move(col)
+                return float(WIN_SCORE - ply - 1)
+            children.append(self._grow(game, depth - 1, ply + 1))
+            game.undo_move(col)
+        return children
+
+    def _score_pending(self) -> None:
+        """
+        Scores the collected leaves missing from the cache with a single model call.
+
+        The values of this search's tree are kept apart from the cache, so
+        clearing a full cache can't drop any of them before they are backed up.
+        """
+        self.last_batch = len(self._pending)
+        self.last_cache_hits = len(self._leaf_values)
+        if not self._pending:
+            return
+        wins = self.ml_agent.win_probabilities(np.stack(list(self._pending.values())))
+        values = dict(zip(self._pending, ((wins - 0.5) * (2 * EVAL_SCALE)).tolist()))
+        self._leaf_values.update(values)
+        if len(self._cache) + len(values) > LEAF_CACHE_SIZE:
+            self._cache.clear()
+        self._cache.update(values)
+        self._pending = {}
+
+    def _back_up(self, node, player: int) -> float:
+        """
+        Returns the negamax value of ``node`` for ``player``, the player to move there.
+        """
+        if isinstance(node, float):
+            return node
+        if isinstance(node, int):
+            value = self._leaf_values[node]
+            return value if player == 1 else -value
+        return max(-self._back_up(child, 3 - player) for child in node)
+
+    @staticmethod
+    def _ordered_moves(game) -> list:
+        """
+        Returns the playable columns, centre first.
+        """
+        cols = game.position.cols
+        return sorted(game.get_valid_moves(), key=lambda col: abs(2 * col - (cols - 1)))
@@ -0,0 +1,496 @@
+import math
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+from connect4.agents.base_agent import BaseAgent, as_game_state
+from connect4.utils.solver import Solver
+
+# Rollout policies: uniformly random moves, or SmartAgent's win/block/random rule.
+ROLLOUT_POLICIES = ("random", "smart")
+
+# Values of ``NodePool.terminal``.
+ONGOING = 0
+WIN = 1   # The move into the node completed four in a row.
+DRAW = 2  # The move into the node filled the board.
+
+# How many iterations are run between clock checks.
+_CLOCK_CHECK_INTERVAL = 64
+
+# Agent of the current worker process, created by ``_init_worker``.
+_WORKER_AGENT = None
+
+
+class NodePool:
+    """
+    Struct-of-arrays storage for the MCTS tree.
+
+    Node ``i`` is entry ``i`` of every array, and nodes hold no positions: the
+    search replays moves from the root instead. The children of a node are stored
+    next to each other, from ``first_child[i]`` to ``first_child[i] + child_count[i] - 1``.
+
+    Attributes:
+        move (array): Column played to reach the node.
+        first_child (array): Index of the first child, -1 until the node is expanded.
+        child_count (array): Number of children.
+        visits (array): Simulations that went through the node.
+        value (array): Summed results for the player who moved into the node
+            (1 for a win, 0.5 for a draw, 0 for a loss).
+        terminal (array): ``ONGOING``, ``WIN`` or ``DRAW``.
+    """
+
+    __slots__ = ("move", "first_child", "child_count", "visits", "value", "terminal")
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        """Removes every node."""
+        self.move = array("b")
+        self.first_child = array("i")
+        self.child_count = array("b")
+        self.visits = array("i")
+        self.value = array("d")
+        self.terminal = array("b")
+
+    def __len__(self) -> int:
+        return len(self.move)
+
+    def add(self, move: int, terminal: int = ONGOING) -> int:
+        """
+        Appends an unexpanded node and returns its index.
+        """
+        self.move.append(move)
+        self.first_child.append(-1)
+        self.child_count.append(0)
+        self.visits.append(0)
+        self.value.append(0.0)
+        self.terminal.append(terminal)
+        return len(self.move) - 1
+
+    def children(self, node: int) -> range:
+        """Returns the indices of the children of ``node``."""
+        first = self.first_child[node]
+        return range(first, first + self.child_count[node]) if first >= 0 else range(0)
+
+    def compact(self, root: int) -> "NodePool":
+        """
+        Returns a new pool holding only the subtree under ``root``, which becomes node 0.
+        """
+        pool = NodePool()
+        pool.add(self.move[root], self.terminal[root])
+        pool.visits[0] = self.visits[root]
+        pool.value[0] = self.value[root]
+        queue = [(root, 0)]
+        for old, new in queue:
+            kids = self.children(old)
+            if not len(kids):
+                continue
+            pool.first_child[new] = len(pool)
+            pool.child_count[new] = len(kids)
+            for child in kids:
+                index = pool.add(self.move[child], self.terminal[child])
+                pool.visits[index] = self.visits[child]
+                pool.value[index] = self.value[child]
+                queue.append((child, index))
+        return pool
+
+
+class MCTSAgent(BaseAgent):
+    """
+    Monte Carlo Tree Search agent for Connect 4.
+
+    Each iteration walks down the tree by UCT, expands the leaf it reaches, plays
+    one fast rollout from there on bit masks, and backs the result up the path.
+    The search runs until ``time_limit`` passes or ``iterations`` are done, then
+    plays the most visited move.
+
+    The tree is kept between moves: when the game reaches a position the tree
+    already holds (told through ``notify_move``, or found among the root's
+    grandchildren on the next ``get_move``), that subtree becomes the new root.
+    With ``workers`` above 1 the search is root-parallel: every worker process
+    grows its own tree from the same root for the same time, and the root visit
+    counts are summed.
+
+    Attributes:
+        player_id (int): The ID representing this agent (1 or 2).
+        name (str): Agent's display name.
+        time_limit (float or None): Seconds per move.
+        iterations (int or None): Iterations per move, if set.
+        exploration (float): UCT exploration constant.
+        rollout (str): Rollout policy, "random" or "smart".
+        max_nodes (int): Node count above which the tree stops growing.
+        workers (int): Processes for root-parallel search, 1 for a serial search.
+        pool (NodePool): The search tree; node ``root`` is the current position.
+        last_visits (Dict[int, int]): Root visit count of each column after the last ``get_move``.
+        last_iterations (int): Iterations run for the last ``get_move``.
+    """
+
+    def __init__(
+        self,
+        player_id: int,
+        time_limit: Optional[float] = 1.0,
+        iterations: Optional[int] = None,
+        exploration: float = 1.4,
+        rollout: str = "random",
+        max_nodes: int = 1_000_000,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        name: str = "MCTSAgent",
+        rows: int = 6,
+        cols: int = 7,
+        k: int = 4
+    ) -> None:
+        """
+        Initializes the MCTSAgent instance.
+
+        Args:
+            player_id (int): The agent's ID (1 or 2).
+            time_limit (float or None): Seconds per move. None means stop after
+                ``iterations`` only.
+            iterations (int or None): Iterations per move. The search stops at
+                whichever of the two limits comes first.
+            exploration (float): UCT exploration constant.
+            rollout (str): Rollout policy, "random" or "smart".
+            max_nodes (int): Node count above which leaves are no longer expanded.
+            workers (int): If above 1, search in this many processes and merge
+                their root visit counts.
+            seed (int or None): Seed of the rollout generator.
+            name (str): Optional name of the agent.
+            rows (int): Number of rows on the board.
+            cols (int): Number of columns on the board.
+            k (int): Pieces in a row needed to win. The board geometry follows the
+                game's if a game of another geometry is searched.
+        """
+        if rollout not in ROLLOUT_POLICIES:
+            raise ValueError(f"Unknown rollout policy {rollout!r}; expected one of {ROLLOUT_POLICIES}.")
+        if time_limit is None and iterations is None:
+            raise ValueError("MCTSAgent needs a time_limit or an iterations budget.")
+        super().__init__(player_id, name)
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.exploration = exploration
+        self.rollout = rollout
+        self.max_nodes = max_nodes
+        self.workers = workers
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Only the solver's bit-mask move helpers are used, so its table is tiny.
+        self.rules = Solver(rows, cols, tt_size_mb=0, k=k)
+        self.pool = NodePool()
+        self.root = -1
+        self._root_state = None
+        self.last_visits = {}
+        self.last_iterations = 0
+        self._executors = []
+
+    def reset(self) -> None:
+        """
+        Drops the search tree before a new game.
+        """
+        self.pool = NodePool()
+        self.root = -1
+        self._root_state = None
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes, if any were started.
+        """
+        for executor in self._executors:
+            executor.shutdown()
+        self._executors = []
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_executors"] = []
+        return state
+
+    def get_move(self, game) -> int:
+        """
+        Searches the current position and returns the most visited move.
+
+        Args:
+            game: The shared GameState, or an ndarray board with this agent to move.
+
+        Returns:
+            int: The selected column index.
+        """
+        game = as_game_state(game, self.player_id)
+        self._match_geometry(game.position)
+        state = _state_of(game)
+        if not self.rules.possible(state[1]):
+            raise ValueError(f"[{self.name}] No valid moves available.")
+
+        if self.workers > 1:
+            visits = self._parallel_visits(state)
+        else:
+            self._set_root(state)
+            deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+            self.last_iterations = self._search(deadline, self.iterations)
+            visits = self.root_visits()
+        self.last_visits = visits
+        return max(visits, key=lambda col: (visits[col], -abs(2 * col - (self.rules.cols - 1))))
+
+    def notify_move(self, game, col: int, player: int) -> None:
+        """
+        Moves the root down to the child for ``col`` so its subtree is reused.
+        """
+        if self.root < 0:
+            return
+        for child in self.pool.children(self.root):
+            if self.pool.move[child] == col and _play(self.rules, self._root_state, col) == _state_of(game):
+                self.root = child
+                self._root_state = _state_of(game)
+                return
+        self.root = -1
+
+    def ponder(self, game, seconds: float) -> None:
+        """
+        Grows the tree of ``game`` for up to ``seconds``.
+        """
+        if self.workers > 1 or game.is_terminal_node():
+            return
+        self._match_geometry(game.position)
+        self._set_root(_state_of(game))
+        self._search(time.perf_counter() + seconds, None)
+
+    def root_visits(self) -> Dict[int, int]:
+        """
+        Returns the visit count of each root move.
+        """
+        pool = self.pool
+        return {pool.move[child]: pool.visits[child] for child in pool.children(self.root)}
+
+    def _match_geometry(self, position) -> None:
+        """
+        Switches the move rules to the geometry of ``position`` if it differs,
+        dropping the tree of the old one.
+        """
+        rules = self.rules
+        if (position.rows, position.cols, position.k) != (rules.rows, rules.cols, rules.k):
+            self.rules = Solver(position.rows, position.cols, tt_size_mb=0, k=position.k)
+            self.reset()
+            self.close()
+
+    def _set_root(self, state: Tuple[int, int, int]) -> None:
+        """
+        Makes ``state`` the root, reusing a matching child or grandchild subtree.
+        """
+        if self.root >= 0 and self._root_state != state:
+            self.root = self._find_descendant(state)
+        if self.root < 0:
+            self.pool = NodePool()
+            self.root = self.pool.add(-1)
+        elif len(self.pool) > self.max_nodes // 2:
+            # Drop the nodes left behind by earlier moves before the pool fills up.
+            self.pool = self.pool.compact(self.root)
+            self.root = 0
+        self._root_state = state
+        if self.pool.first_child[self.root] < 0 and not self.pool.terminal[self.root]:
+            self._expand(self.root, *state)
+
+    def _find_descendant(self, state: Tuple[int, int, int]) -> int:
+        """
+        Returns the node of ``state`` among the root's children and grandchildren, or -1.
+        """
+        pool, rules = self.pool, self.rules
+        for child in pool.children(self.root):
+            child_state = _play(rules, self._root_state, pool.move[child])
+            if child_state == state:
+                return child
+            for grandchild in pool.children(child):
+                if _play(rules, child_state, pool.move[grandchild]) == state:
+                    return grandchild
+        return -1
+
+    def _search(self, deadline: Optional[float], iterations: Optional[int]) -> int:
+        """
+        Runs iterations from the root until the deadline or the iteration budget.
+
+        Returns:
+            int: Number of iterations run.
+        """
+        done = 0
+        while iterations is None or done < iterations:
+            if deadline is not None and done % _CLOCK_CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                break
+            self._iterate()
+            done += 1
+        return done
+
+    def _iterate(self) -> None:
+        """
+        Runs one select, expand, rollout and backup pass.
+        """
+        pool, rules = self.pool, self.rules
+        visits, value, terminal = pool.visits, pool.value, pool.terminal
+        first_child, child_count, moves = pool.first_child, pool.child_count, pool.move
+        exploration = self.exploration
+        current, mask, ply = self._root_state
+        node = self.root
+        path = [node]
+
+        # Selection: descend by UCT through expanded nodes.
+        while first_child[node] >= 0 and not terminal[node]:
+            first = first_child[node]
+            log_parent = math.log(visits[node] + 1)
+            best, best_score = first, -1.0
+            for child in range(first, first + child_count[node]):
+                n = visits[child]
+                if n == 0:
+                    best = child
+                    break
+                score = value[child] / n + exploration * math.sqrt(log_parent / n)
+                if score > best_score:
+                    best, best_score = child, score
+            node = best
+            move = rules.column_masks[moves[node]] & (mask + rules.bottom)
+            current, mask, ply = current ^ mask, mask | move, ply + 1
+            path.append(node)
+
+        # Expansion, then a rollout from the new position for the player to move there.
+        outcome = terminal[node]
+        if outcome == WIN:
+            result = 0.0
+        elif outcome == DRAW:
+            result = 0.5
+        else:
+            if visits[node] > 0 and len(pool) < self.max_nodes:
+                self._expand(node, current, mask, ply)
+            result = self._rollout(current, mask, ply)
+
+        # Backup: ``result`` is for the player to move at the leaf, who did not move into it.
+        for node in reversed(path):
+            result = 1.0 - result
+            visits[node] += 1
+            value[node] += result
+
+    def _expand(self, node: int, current: int, mask: int, ply: int) -> None:
+        """
+        Adds one child per playable column of ``node``, centre columns first.
+        """
+        rules, pool = self.rules, self.pool
+        possible = rules.possible(mask)
+        wins = rules.winning_cells(current, mask) & possible
+        full = ply + 1 == rules.cells
+        first = len(pool)
+        for col in rules.order:
+            move = possible & rules.column_masks[col]
+            if move:
+                pool.add(col, WIN if move & wins else (DRAW if full else ONGOING))
+        pool.first_child[node] = first
+        pool.child_count[node] = len(pool) - first
+
+    def _rollout(self, current: int, mask: int, ply: int) -> float:
+        """
+        Plays the position out and returns 1 if the player to move wins, 0.5 for a
+        draw and 0 for a loss.
+        """
+        rules = self.rules
+        column_masks, bottom, board_mask, cells = rules.column_masks, rules.bottom, rules.board_mask, rules.cells
+        winning_cells = rules.winning_cells
+        choice = self.rng.choice
+        smart = self.rollout == "smart"
+        cols = range(rules.cols)
+        result = 1.0  # For the player to move at the current ply.
+        while ply < cells:
+            possible = (mask + bottom) & board_mask
+            wins = winning_cells(current, mask) & possible
+            if wins:
+                if smart:
+                    return result
+                col = choice([c for c in cols if possible & column_masks[c]])
+                if possible & column_masks[col] & wins:
+                    return result
+            elif smart and (threats := winning_cells(current ^ mask, mask) & possible):
+                col = next(c for c in cols if threats & column_masks[c])
+            else:
+                col = choice([c for c in cols if possible & column_masks[c]])
+            current, mask, ply = current ^ mask, mask | (possible & column_masks[col]), ply + 1
+            result = 1.0 - result
+        return 0.5
+
+    def _parallel_visits(self, state: Tuple[int, int, int]) -> Dict[int, int]:
+        """
+        Searches ``state`` in every worker process and sums their root visit counts.
+
+        Each worker is a single-process executor of its own and gets exactly one
+        task, so every worker tree is counted once. If a worker process dies, the
+        workers are shut down and rebuilt on the next call, and this move is
+        searched here instead.
+        """
+        if not self._executors:
+            settings = self._worker_settings()
+            self._executors = [
+                ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(settings,))
+                for _ in range(self.workers)
+            ]
+        seed = self.rng.getrandbits(32)
+        try:
+            futures = [executor.submit(_search_task, state, self.time_limit, self.iterations, seed + i)
+                       for i, executor in enumerate(self._executors)]
+            results = [future.result() for future in futures]
+        except BrokenProcessPool as e:
+            print(f"[{self.name}] WARNING: A search worker died ({e}); searching this move in-process.")
+            self.close()
+            self._set_root(state)
+            deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+            self.last_iterations = self._search(deadline, self.iterations)
+            return self.root_visits()
+
+        visits = {}
+        self.last_iterations = 0
+        for worker_visits, iterations in results:
+            self.last_iterations += iterations
+            for col, count in worker_visits.items():
+                visits[col] = visits.get(col, 0) + count
+        return visits
+
+    def _worker_settings(self) -> dict:
+        return {
+            "exploration": self.exploration, "rollout": self.rollout, "max_nodes": self.max_nodes,
+            "rows": self.rules.rows, "cols": self.rules.cols, "k": self.rules.k,
+        }
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def _state_of(game) -> Tuple[int, int, int]:
+    """
+    Returns ``(current, mask, ply)`` of a GameState: the pieces of the player to
+    move, all pieces, and the number of pieces.
+    """
+    position = game.position
+    return position.masks[game.current_player], position.masks[1] | position.masks[2], position.move_count
+
+
+def _play(rules: Solver, state: Tuple[int, int, int], col: int) -> Tuple[int, int, int]:
+    """
+    Returns the state after the player to move in ``state`` plays ``col``.
+    """
+    current, mask, ply = state
+    return current ^ mask, mask | (rules.column_masks[col] & (mask + rules.bottom)), ply + 1
+
+
+def _init_worker(settings: dict) -> None:
+    global _WORKER_AGENT
+    _WORKER_AGENT = MCTSAgent(player_id=1, time_limit=None, iterations=1, **settings)
+
+
+def _search_task(state: Tuple[int, int, int], time_limit: Optional[float], iterations: Optional[int],
+                 seed: int) -> Tuple[Dict[int, int], int]:
+    """
+    Grows this worker's tree from ``state`` and returns its root visit counts.
+
+    The worker keeps its tree between tasks, so a later move reuses the subtree.
+    """
+    agent = _WORKER_AGENT
+    agent.rng.seed(seed)
+    agent._set_root(state)
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    iterations = agent._search(deadline, iterations)
+    return agent.root_visits(), iterations
@@ -1,20 +1,159 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional, Tuple
+from connect4.agents.base_agent import BaseAgent, as_game_state
+from connect4.utils.bitboard import Bitboard
+from connect4.utils.game_state import GameState
+from connect4.utils.move_ordering import KillerHistoryOrderer, MoveOrderer
+from connect4.utils.transposition_table import (
+    EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+)
 
+# Mixed into the hash when player 2 is to move so both sides get separate entries.
+_SIDE_KEY = 0x9E3779B97F4A7C15
 
-class MinimaxAgent:
+# Score that ends iterative deepening early because the result can't improve.
+WIN_SCORE = 1000
+
+# Bound larger than any evaluation, used instead of float infinities so that
+# null windows (alpha, alpha + 1) work on integer scores.
+INFINITY = 10 * WIN_SCORE
+
+# Half-width of the root aspiration window around the previous iteration's score.
+ASPIRATION_WINDOW = 25
+
+# Deeper than a standard Connect 4 game, for the principal variation table; it grows
+# for larger boards.
+_MAX_PLY = 64
+
+# How many nodes are searched between clock checks in time-budgeted mode.
+_CLOCK_CHECK_INTERVAL = 1024
+
+# Fewest remaining plies at which a principal variation node is split between
+# worker processes; shallower subtrees finish faster than tasks could be sent.
+SPLIT_MIN_DEPTH = 4
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget is used up."""
+
+
+class SearchStats:
+    """
+    Node counters for one ``get_move`` call.
+
+    Attributes:
+        nodes (int): Positions visited by ``negamax``.
+        cutoffs (int): Alpha-beta cutoffs.
+        first_move_cutoffs (int): Cutoffs caused by the first move tried.
+        tt_cutoffs (int): Nodes answered straight from the transposition table.
+        researches (int): Null-window searches that had to be repeated with a full window.
+        aspiration_fails (int): Root searches repeated because the aspiration window failed.
+        depth (int): Deepest fully searched depth.
+    """
+
+    def __init__(self) -> None:
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_cutoffs = 0
+        self.researches = 0
+        self.aspiration_fails = 0
+        self.depth = 0
+
+    @property
+    def effective_branching_factor(self) -> float:
+        """
+        Returns ``nodes ** (1 / depth)``; lower means better pruning and ordering.
+        """
+        if self.depth == 0 or self.nodes == 0:
+            return 0.0
+        return self.nodes ** (1.0 / self.depth)
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """
+        Returns the share of cutoffs produced by the first move searched.
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def __str__(self) -> str:
+        return (f"depth={self.depth} nodes={self.nodes} cutoffs={self.cutoffs} "
+                f"first-move={self.first_move_cutoff_rate:.0%} tt={self.tt_cutoffs} "
+                f"re-searches={self.researches} ebf={self.effective_branching_factor:.2f}")
+
+
+class SearchResult:
+    """
+    Outcome of one ``MinimaxAgent.search`` call.
+
+    Attributes:
+        move (int): Best column found.
+        score (int): Score of ``move`` for the player to move.
+        depth (int): Deepest fully searched depth.
+        pv (List[int]): Principal variation, starting with ``move``.
+        stats (SearchStats): Node and cutoff counters.
+    """
+
+    def __init__(self, move: int, score: int, depth: int, pv: List[int], stats: SearchStats) -> None:
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.pv = pv
+        self.stats = stats
+
+    @property
+    def nodes(self) -> int:
+        return self.stats.nodes
+
+    @property
+    def cutoffs(self) -> int:
+        return self.stats.cutoffs
+
+    def __str__(self) -> str:
+        pv = " ".join(str(col) for col in self.pv)
+        return f"move={self.move} score={self.score} pv=[{pv}] {self.stats}"
+
+
+class MinimaxAgent(BaseAgent):
     """
     MinimaxAgent for Connect 4.
 
-    This agent uses the Minimax algorithm with alpha-beta pruning to evaluate the best possible move
-    based on a specified search depth.
+    This agent searches the game tree with negamax, the single-function form of
+    Minimax with alpha-beta pruning, using principal variation search: the first
+    move at each node gets a full window and the rest are only proved worse with a
+    null window, re-searching the rare ones that turn out better. The root uses
+    iterative deepening with aspiration windows around the previous score.
+
+    With ``workers`` above 1, iterations from ``SPLIT_MIN_DEPTH`` on are split the
+    young-brothers-wait way along the principal variation: at each node of it the
+    first move is searched here, and its score is sent as the alpha bound to a
+    process pool that searches the other moves with a null window, re-searching
+    only those that fail high.
 
     Attributes:
         player_id (int): The ID representing this agent (1 or 2).
         name (str): Agent's display name.
         max_depth (int): Depth to which the game tree is evaluated.
+        time_limit (float or None): Seconds per move for iterative deepening, if set.
+        tt (TranspositionTable): Search results kept across moves of one game.
+        move_orderer (MoveOrderer): Decides which moves are searched first.
+        last_depth (int): Deepest fully searched depth of the last ``get_move`` call.
+        stats (SearchStats): Node counters of the last ``get_move`` call.
+        last_result (SearchResult or None): Full result of the last ``get_move`` call.
+        workers (int): Number of search processes, 1 for a serial search.
     """
 
-    def __init__(self, player_id: int, max_depth: int = 4, name: str = "MinimaxAgent") -> None:
+    def __init__(
+        self,
+        player_id: int,
+        max_depth: int = 4,
+        name: str = "MinimaxAgent",
+        tt_size_mb: float = 16,
+        time_limit: Optional[float] = None,
+        move_orderer: Optional[MoveOrderer] = None,
+        workers: int = 1
+    ) -> None:
         """
         Initializes the MinimaxAgent instance.
 
@@ -22,85 +161,481 @@ class MinimaxAgent:
             player_id (int): The agent's ID (1 or 2).
             max_depth (int): Search depth for Minimax.
             name (str): Optional name of the agent.
+            tt_size_mb (float): Memory cap of the transposition table in megabytes.
+            time_limit (float or None): If set, search deeper and deeper until this many
+                seconds have passed instead of stopping at ``max_depth``.
+            move_orderer (MoveOrderer or None): Move ordering strategy. Defaults to
+                centre-first ordering with killer and history heuristics.
+            workers (int): If above 1, the later moves of each principal variation
+                node are searched in a pool of this many processes. More workers
+                than moves per node minus one are left idle.
         """
-        self.player_id = player_id
+        super().__init__(player_id, name)
         self.max_depth = max_depth
-        self.name = name
+        self.time_limit = time_limit
+        self.tt = TranspositionTable(tt_size_mb)
+        self.move_orderer = move_orderer if move_orderer is not None else KillerHistoryOrderer()
+        self.last_depth = 0
+        self.stats = SearchStats()
+        self.last_result = None
+        self._deadline = None
+        self._pv = [[] for _ in range(_MAX_PLY + 1)]
+        self.tt_size_mb = tt_size_mb
+        self.workers = workers
+        self._pool = None
+
+    def reset(self) -> None:
+        """
+        Clears the transposition table and move ordering data before a new game.
+        """
+        self.tt.clear()
+        self.move_orderer.clear()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes, if any were started.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
 
     def get_move(self, game) -> int:
         """
-        Selects the best move using the Minimax algorithm with alpha-beta pruning.
+        Selects the best move for the player to move in ``game``.
 
         Args:
-            game: The current GameState instance.
+            game: The current GameState instance, or an ndarray board with this
+                agent to move.
 
         Returns:
             int: Best column index to play.
         """
-        best_score = float("-inf")
-        best_col = None
+        return self.search(as_game_state(game, self.player_id)).move
+
+    def ponder(self, game, seconds: float) -> None:
+        """
+        Searches ``game`` for up to ``seconds`` to fill the transposition table,
+        which the next ``get_move`` of this game reuses. ``last_result`` and the
+        counters of the last ``get_move`` are kept.
+        """
+        if self.workers > 1 or game.is_terminal_node():
+            return
+        kept = self.last_result, self.stats, self.last_depth
+        empty_cells = game.position.rows * game.position.cols - game.position.move_count
+        self.search(game, max_depth=empty_cells, deadline=time.perf_counter() + seconds)
+        self.last_result, self.stats, self.last_depth = kept
+
+    def search(self, game, max_depth: Optional[int] = None, deadline: Optional[float] = None) -> SearchResult:
+        """
+        Runs an iterative deepening search from the current position.
+
+        Depths 1, 2, 3, ... are searched in turn, each trying the previous
+        iteration's best moves first and starting from an aspiration window around
+        its score. Without a ``time_limit`` the search stops at ``max_depth``; with
+        one it stops when the deadline passes and returns the deepest completed
+        iteration.
+
+        Args:
+            game: The current GameState instance.
+            max_depth (int or None): Overrides ``max_depth`` and ``time_limit`` for this call.
+            deadline (float or None): ``time.perf_counter()`` value at which to stop.
+
+        Returns:
+            SearchResult: The best move, its score, the principal variation and counters.
+        """
+        self.tt.new_search()
+        if self.move_orderer.cols != game.position.cols:
+            self.move_orderer.resize(game.position.cols)
+        self.move_orderer.age()
+        self.stats = SearchStats()
+        player = game.current_player
+        moves = self._ordered_moves(game, *self._key(game), 0, player)
+        if not moves:
+            raise ValueError(f"[{self.name}] No valid move found.")
+
+        empty_cells = game.position.rows * game.position.cols - game.position.move_count
+        if max_depth is None:
+            if self.time_limit is None:
+                max_depth = self.max_depth
+            else:
+                max_depth = empty_cells
+                if deadline is None:
+                    deadline = time.perf_counter() + self.time_limit
+        max_depth = min(max_depth, empty_cells)
+        self._deadline = deadline
+        if len(self._pv) <= max_depth:
+            self._pv.extend([] for _ in range(max_depth + 1 - len(self._pv)))
+
+        result = SearchResult(moves[0], 0, 0, [moves[0]], self.stats)
+        root_len = len(game.move_stack)
+        score = None
+
+        for depth in range(1, max(max_depth, 1) + 1):
+            try:
+                if self.workers > 1 and depth >= SPLIT_MIN_DEPTH:
+                    score, scores = self._split_search(game, depth, -INFINITY, INFINITY, 0, moves)
+                else:
+                    score, scores = self._aspiration_search(game, depth, moves, score)
+            except _SearchTimeout:
+                # Unwind the moves the interrupted search left on the board.
+                while len(game.move_stack) > root_len:
+                    game.undo_move(game.move_stack[-1][0])
+                break
+            best_col = self._pv[0][0]
+            result = SearchResult(best_col, score, depth, self._extend_pv(game, depth), self.stats)
+            self.last_depth = self.stats.depth = depth
+            moves.sort(key=lambda c: (c != best_col, -scores[c]))
+            if abs(score) >= WIN_SCORE:
+                break
+
+        self._deadline = None
+        self.last_result = result
+        return result
+
+    def _split_search(self, game, depth: int, alpha: int, beta: int, ply: int,
+                      moves: Optional[List[int]] = None) -> Tuple[int, dict]:
+        """
+        Searches a principal variation node with its later moves spread over the pool.
+
+        This is young-brothers-wait splitting along the principal variation. The
+        first move is searched here, itself split the same way while at least
+        ``SPLIT_MIN_DEPTH`` plies remain, and its score becomes alpha. The other
+        moves then go to the pool together. Each task only proves its move no
+        better with a null window, and re-searches with ``(alpha, beta)`` when it
+        fails high. Only the two player masks and the move are sent to each task.
+        Every worker keeps one agent, so its transposition table carries over
+        between tasks, iterations and moves.
 
-        for col in game.get_valid_moves():
-            game.make_move(col, self.player_id)
-            score = self.minimax(game, self.max_depth - 1, False, float("-inf"), float("inf"))
+        Args:
+            game: The current GameState instance.
+            depth (int): Remaining depth to evaluate.
+            alpha (int): Lower bound of the search window.
+            beta (int): Upper bound of the search window.
+            ply (int): Distance from the root.
+            moves (List[int] or None): Moves in the order to try them; the root
+                passes its own, other nodes order theirs as ``negamax`` does.
+
+        Returns:
+            Tuple[int, dict]: Best score and the score (or bound) of each move searched.
+
+        Raises:
+            _SearchTimeout: If the deadline passes before every move is searched.
+        """
+        if depth < SPLIT_MIN_DEPTH or game.is_terminal_node():
+            return self.negamax(game, depth, alpha, beta, ply), {}
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(self.tt_size_mb,)
+            )
+        self.stats.nodes += 1
+        player = game.current_player
+        key, mirrored = self._key(game)
+        if moves is None:
+            moves = self._ordered_moves(game, key, mirrored, ply, player)
+        alpha_orig = alpha
+
+        first = moves[0]
+        game.make_move(first, player)
+        score, _ = self._split_search(game, depth - 1, -beta, -alpha, ply + 1)
+        game.undo_move(first)
+        best_score, best_col = -score, first
+        scores = {first: best_score}
+        self._pv[ply] = [first] + self._pv[ply + 1]
+        alpha = max(alpha, best_score)
+
+        if alpha < beta and len(moves) > 1:
+            position = game.position
+            deadline = None
+            if self._deadline is not None:
+                deadline = time.time() + (self._deadline - time.perf_counter())
+            futures = [
+                (col, self._pool.submit(_search_task, position.rows, position.cols, position.k,
+                                        position.masks[1], position.masks[2], player, col, depth - 1,
+                                        alpha, beta, ply, self.tt.generation, deadline))
+                for col in moves[1:]
+            ]
+            timed_out = False
+            for col, future in futures:
+                outcome = future.result()
+                if outcome is None:
+                    timed_out = True
+                    continue
+                score, line, nodes, cutoffs, researched = outcome
+                scores[col] = score
+                self.stats.nodes += nodes
+                self.stats.cutoffs += cutoffs
+                self.stats.researches += researched
+                if score > best_score:
+                    best_score, best_col = score, col
+                    if score > alpha:
+                        self._pv[ply] = line
+            if timed_out:
+                raise _SearchTimeout()
+
+        if best_score <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, flag, best_score, self._tt_col(best_col, mirrored, game))
+        return best_score, scores
+
+    def _aspiration_search(self, game, depth: int, moves: List[int], guess: Optional[int]) -> Tuple[int, dict]:
+        """
+        Searches the root inside a narrow window around ``guess``, widening on failure.
+        """
+        if guess is None or abs(guess) >= WIN_SCORE:
+            return self._search_root(game, depth, moves, -INFINITY, INFINITY)
+        alpha, beta = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+        score, scores = self._search_root(game, depth, moves, alpha, beta)
+        if alpha < score < beta:
+            return score, scores
+        self.stats.aspiration_fails += 1
+        return self._search_root(game, depth, moves, -INFINITY, INFINITY)
+
+    def _search_root(self, game, depth: int, moves: List[int], alpha: int, beta: int) -> Tuple[int, dict]:
+        """
+        Searches every root move to ``depth`` plies with principal variation search.
+
+        Args:
+            game: The current GameState instance.
+            depth (int): Search depth including the root move.
+            moves (List[int]): Root moves in the order to try them.
+            alpha (int): Lower bound of the root window.
+            beta (int): Upper bound of the root window.
+
+        Returns:
+            Tuple[int, dict]: Best score and the score (or bound) of each move.
+                The best move and its line are left in the principal variation table.
+        """
+        player = game.current_player
+        alpha_orig = alpha
+        best_score = -INFINITY
+        best_col = moves[0]
+        scores = {}
+        self._pv[0] = [best_col]
+
+        for i, col in enumerate(moves):
+            game.make_move(col, player)
+            score = self._pvs_child(game, depth - 1, alpha, beta, 1, i == 0)
             game.undo_move(col)
+            scores[col] = score
 
             if score > best_score:
                 best_score = score
                 best_col = col
+                self._pv[0] = [col] + self._pv[1]
+                if score > alpha:
+                    alpha = score
+            if alpha >= beta:
+                break
 
-        if best_col is None:
-            raise ValueError(f"[{self.name}] No valid move found.")
-        return best_col
+        # A failed aspiration window leaves only a bound, as in ``_negamax``.
+        if best_score <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        key, mirrored = self._key(game)
+        self.tt.store(key, depth, flag, best_score, self._tt_col(best_col, mirrored, game))
+        return best_score, scores
 
-    def minimax(
-        self,
-        game,
-        depth: int,
-        maximizing_player: bool,
-        alpha: float,
-        beta: float
-    ) -> int:
+    def _extend_pv(self, game, depth: int) -> List[int]:
+        """
+        Returns the root principal variation, completed from the transposition table
+        where a table cutoff cut the collected line short.
+        """
+        line = list(self._pv[0])
+        for col in line:
+            game.make_move(col, game.current_player)
+        while len(line) < depth and not game.is_terminal_node():
+            key, mirrored = self._key(game)
+            entry = self.tt.probe(key)
+            if entry is None or entry[3] is None:
+                break
+            col = self._tt_col(entry[3], mirrored, game)
+            if not game.position.can_play(col):
+                break
+            line.append(col)
+            game.make_move(col, game.current_player)
+        for col in reversed(line):
+            game.undo_move(col)
+        return line
+
+    def _pvs_child(self, game, depth: int, alpha: int, beta: int, ply: int, first: bool) -> int:
+        """
+        Scores a child position for the parent's player with principal variation search.
+        """
+        if first:
+            return -self.negamax(game, depth, -beta, -alpha, ply)
+        score = -self.negamax(game, depth, -alpha - 1, -alpha, ply)
+        if alpha < score < beta:
+            self.stats.researches += 1
+            score = -self.negamax(game, depth, -beta, -score, ply)
+        return score
+
+    def _key(self, game) -> Tuple[int, bool]:
         """
-        Recursive implementation of the Minimax algorithm with alpha-beta pruning.
+        Returns the transposition table key and whether it is the mirror image's.
+
+        The key is the smaller of the Zobrist hashes of the position and of its
+        left-right reflection, plus the side to move, so both orientations share one
+        entry. Columns stored under a mirrored key are reflected too.
+        """
+        side = _SIDE_KEY if game.current_player == 2 else 0
+        if game.mirror_hash < game.hash:
+            return game.mirror_hash ^ side, True
+        return game.hash ^ side, False
+
+    @staticmethod
+    def _tt_col(col: Optional[int], mirrored: bool, game) -> Optional[int]:
+        """
+        Converts a column between the position's orientation and the table's.
+        """
+        if col is None or not mirrored:
+            return col
+        return game.position.cols - 1 - col
+
+    def _ordered_moves(self, game, key: int, mirrored: bool, ply: int, player: int) -> List[int]:
+        """
+        Returns the valid moves in search order, transposition table move first.
+        """
+        entry = self.tt.probe(key)
+        tt_move = self._tt_col(entry[3], mirrored, game) if entry is not None else None
+        return self.move_orderer.order(game.get_valid_moves(), ply, player, tt_move)
+
+    def negamax(self, game, depth: int, alpha: int, beta: int, ply: int = 1) -> int:
+        """
+        Recursive negamax search with alpha-beta pruning and principal variation search.
 
         Args:
             game: The current GameState instance.
             depth (int): Remaining depth to evaluate.
-            maximizing_player (bool): Whether the current layer is maximizing.
-            alpha (float): Alpha value for pruning.
-            beta (float): Beta value for pruning.
+            alpha (int): Lower bound of the search window.
+            beta (int): Upper bound of the search window.
+            ply (int): Distance from the root, used by the move orderer and the PV table.
 
         Returns:
-            int: Evaluation score of the game state.
+            int: Score of the position for the player to move.
         """
+        stats = self.stats
+        stats.nodes += 1
+        if (self._deadline is not None and stats.nodes % _CLOCK_CHECK_INTERVAL == 0
+                and time.perf_counter() > self._deadline):
+            raise _SearchTimeout()
+
+        pv = self._pv
+        pv[ply] = []
+        player = game.current_player
         if depth == 0 or game.is_terminal_node():
-            return game.evaluate(self.player_id)
-
-        current_player = self.player_id if maximizing_player else (2 if self.player_id == 1 else 1)
-
-        if maximizing_player:
-            max_eval = float("-inf")
-            for col in game.get_valid_moves():
-                game.make_move(col, current_player)
-                score = self.minimax(game, depth - 1, False, alpha, beta)
-                game.undo_move(col)
-                max_eval = max(max_eval, score)
-                alpha = max(alpha, score)
-                if beta <= alpha:
-                    break
-            return max_eval
+            return game.evaluate(player)
+
+        side = _SIDE_KEY if player == 2 else 0
+        mirrored = game.mirror_hash < game.hash
+        key = (game.mirror_hash if mirrored else game.hash) ^ side
+        entry = self.tt.probe(key)
+        if entry is not None and entry[0] >= depth:
+            _, flag, value, _, _ = entry
+            if (flag == EXACT
+                    or (flag == LOWER_BOUND and value >= beta)
+                    or (flag == UPPER_BOUND and value <= alpha)):
+                stats.tt_cutoffs += 1
+                return value
+
+        alpha_orig = alpha
+        best_eval = -INFINITY
+        best_col = None
+
+        for i, col in enumerate(self._ordered_moves(game, key, mirrored, ply, player)):
+            game.make_move(col, player)
+            score = self._pvs_child(game, depth - 1, alpha, beta, ply + 1, i == 0)
+            game.undo_move(col)
+            if score > best_eval:
+                best_eval = score
+                best_col = col
+                if score > alpha:
+                    alpha = score
+                    pv[ply] = [col] + pv[ply + 1]
+            if alpha >= beta:
+                self._record_cutoff(col, i, ply, player, depth)
+                break
+
+        if best_eval <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best_eval >= beta:
+            flag = LOWER_BOUND
         else:
-            min_eval = float("inf")
-            for col in game.get_valid_moves():
-                game.make_move(col, current_player)
-                score = self.minimax(game, depth - 1, True, alpha, beta)
-                game.undo_move(col)
-                min_eval = min(min_eval, score)
-                beta = min(beta, score)
-                if beta <= alpha:
-                    break
-            return min_eval
+            flag = EXACT
+        self.tt.store(key, depth, flag, best_eval, self._tt_col(best_col, mirrored, game))
+        return best_eval
+
+    def _record_cutoff(self, col: int, index: int, ply: int, player: int, depth: int) -> None:
+        """
+        Updates the counters and the move orderer after a cutoff.
+        """
+        self.stats.cutoffs += 1
+        if index == 0:
+            self.stats.first_move_cutoffs += 1
+        self.move_orderer.record_cutoff(col, ply, player, depth)
 
     def __str__(self) -> str:
         return self.name
+
+
+# Search agent of a worker process, created once by the pool initializer.
+_WORKER_AGENT = None
+
+# Parent table generation the worker agent last searched for.
+_WORKER_GENERATION = None
+
+
+def _init_worker(tt_size_mb: float) -> None:
+    global _WORKER_AGENT
+    _WORKER_AGENT = MinimaxAgent(player_id=1, tt_size_mb=tt_size_mb)
+
+
+def _search_task(rows: int, cols: int, k: int, mask_1: int, mask_2: int, player: int, col: int,
+                 depth: int, alpha: int, beta: int, ply: int, generation: int, deadline: Optional[float]):
+    """
+    Worker entry point: scores move ``col`` for ``player`` in the ``(alpha, beta)`` window.
+
+    Args:
+        generation (int): The parent's table generation; a new one ages this
+            worker's table and move ordering data, as ``search`` does.
+        deadline (float or None): ``time.time()`` value at which to give up.
+
+    Returns:
+        tuple or None: ``(score, line, nodes, cutoffs, re-searches)``, where
+            ``score`` is only a bound unless it falls inside the window and ``line``
+            starts with ``col``; None if the deadline passed first.
+    """
+    global _WORKER_GENERATION
+    agent = _WORKER_AGENT
+    if generation != _WORKER_GENERATION:
+        _WORKER_GENERATION = generation
+        agent.tt.new_search()
+        agent.move_orderer.age()
+    if agent.move_orderer.cols != cols:
+        agent.move_orderer.resize(cols)
+    if len(agent._pv) <= ply + depth + 1:
+        agent._pv.extend([] for _ in range(ply + depth + 2 - len(agent._pv)))
+    agent.stats = SearchStats()
+    agent._deadline = time.perf_counter() + (deadline - time.time()) if deadline is not None else None
+
+    game = GameState.from_position(Bitboard.from_masks(mask_1, mask_2, rows, cols, k), player)
+    game.make_move(col, player)
+    try:
+        score = agent._pvs_child(game, depth, alpha, beta, ply + 1, False)
+    except _SearchTimeout:
+        return None
+    finally:
+        agent._deadline = None
+    stats = agent.stats
+    return score, [col] + agent._pv[ply + 1], stats.nodes, stats.cutoffs, stats.researches
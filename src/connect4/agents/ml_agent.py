@@ -1,69 +1,209 @@
 import os
+import threading
 import numpy as np
-import pandas as pd
 from typing import List
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
-import joblib
 import random
+from connect4.agents.base_agent import BaseAgent, as_board
 from connect4.agents.minimax_agent import MinimaxAgent
+from connect4.utils.board_utils import canonical_boards, deduplicate_boards
+from connect4.utils.compiled_forest import CompiledForest, file_digest
 from connect4.utils.game_state import GameState
-from connect4.utils.dataset_loader import DatasetLoader  # <-- Import properly
+from connect4.utils.dataset_loader import DatasetLoader, to_game_boards  # <-- Import properly
 
-class MLAgent:
+# Scores of this many canonical positions are remembered between moves.
+SCORE_CACHE_SIZE = 1 << 16
+
+# Board shape of the UCI dataset the model is trained on; it scores no other.
+MODEL_SHAPE = (6, 7)
+
+# Orders of the model's input features, saved with the pickle and the compiled
+# forest. The UCI file's goes up each column in turn (a1..a6, b1..b6, ...);
+# models now take game boards, row by row from the top. Pickles without a
+# layout predate it and use the UCI order.
+UCI_LAYOUT = 1
+FEATURE_LAYOUT = 2
+
+# Value of each outcome class for player 1 (x in the UCI data). Classes the
+# model doesn't know the meaning of count as even.
+OUTCOME_VALUES = {'win': 1.0, 'draw': 0.5, 'loss': 0.0}
+
+
+def model_fits(rows: int, cols: int) -> bool:
+    """
+    Returns True if the model can score boards of ``rows`` x ``cols``.
+    """
+    return (rows, cols) == MODEL_SHAPE
+
+class MLAgent(BaseAgent):
     def __init__(self, player_id: int, model_path: str = "models/ml_agent_model.pkl",
                  data_path: str = "connect4_dataset/connect-4.data.csv",
-                 names_path: str = "connect4_dataset/connect-4.names.txt") -> None:
-        self.player_id = player_id
+                 names_path: str = "connect4_dataset/connect-4.names.txt",
+                 compiled_path: str = None,
+                 background_load: bool = False) -> None:
+        """
+        Initializes the MLAgent and loads (or trains) its model.
+
+        sklearn and joblib are only imported when the pickled model has to
+        be read or a new one trained, so a compiled model loads without them.
+
+        Args:
+            player_id (int): The agent's ID (1 or 2).
+            model_path (str): Path of the joblib model file.
+            data_path (str): CSV used to train a model if none is saved.
+            names_path (str): Attribute names of the CSV.
+            compiled_path (str or None): Directory of the memory-mapped compiled
+                forest; defaults to ``model_path`` without its extension.
+            background_load (bool): Load the model on a daemon thread so the
+                constructor returns at once. The first ``get_move`` waits for it.
+        """
+        super().__init__(player_id, "MLAgent")
         self.model_path = model_path
+        self.compiled_path = compiled_path or os.path.splitext(model_path)[0]
         self.data_path = data_path
         self.names_path = names_path
-        self.label_encoder = LabelEncoder()
+        self.label_encoder = None
         self.feature_names = None
-        self.name = "MLAgent" 
-        self.model = self._load_or_train_model()
+        self._model = None
+        self._loader = None
+        self._score_cache = {}
+        if background_load:
+            self._loader = threading.Thread(target=self._load_in_background, daemon=True)
+            self._loader.start()
+        else:
+            self._model = self._load_or_train_model()
+
+    @property
+    def model(self):
+        """
+        The compiled forest, waiting for a background load to finish first.
+        """
+        if self._loader is not None:
+            self._loader.join()
+            self._loader = None
+        return self._model
+
+    @model.setter
+    def model(self, model) -> None:
+        self._model = model
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        True once the model is ready and ``get_move`` won't block.
+        """
+        return self._loader is None or not self._loader.is_alive()
+
+    def __getstate__(self) -> dict:
+        # Worker processes reopen the memory-mapped model instead of receiving a copy.
+        state = self.__dict__.copy()
+        state["_model"] = None
+        state["_loader"] = None
+        state["_score_cache"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._model = self._load_or_train_model()
+
+    def _load_in_background(self) -> None:
+        try:
+            self._model = self._load_or_train_model()
+        except Exception as e:
+            print(f"[MLAgent] ERROR: Could not load model: {e}")
 
     def _load_or_train_model(self):
+        if self._compiled_is_current():
+            print("✅ Loading compiled model from:", self.compiled_path)
+            return CompiledForest.load(self.compiled_path)
         if os.path.exists(self.model_path):
+            import joblib
+
             print("✅ Loading trained model from:", self.model_path)
             loaded_data = joblib.load(self.model_path)
+            layout = loaded_data.get("feature_layout", UCI_LAYOUT)
+            if layout not in (UCI_LAYOUT, FEATURE_LAYOUT):
+                print(f"[MLAgent] WARNING: {self.model_path} has unknown feature layout {layout}; retraining.")
+                model = self._train_model()
+                return self._compile(model) if model is not None else None
             self.label_encoder = loaded_data["label_encoder"]
             self.feature_names = loaded_data["feature_names"]
-            return loaded_data["model"]
+            return self._compile(loaded_data["model"], layout)
         else:
             print("✅ Training new model...")
-            return self._train_model()
+            model = self._train_model()
+            return self._compile(model) if model is not None else None
+
+    def _compiled_is_current(self) -> bool:
+        """
+        Returns True if the compiled forest exists, takes the current feature
+        layout, and was compiled from the pickle as it is now, going by the size
+        and hash recorded in its header.
+        """
+        header = CompiledForest.read_header(self.compiled_path)
+        if header is None or header.get("feature_layout") != FEATURE_LAYOUT:
+            return False
+        if not os.path.exists(self.model_path):
+            return True
+        source = header.get("source")
+        if source is None or source.get("size") != os.path.getsize(self.model_path):
+            return False
+        return source == file_digest(self.model_path)
+
+    def _compile(self, model, layout: int = FEATURE_LAYOUT) -> CompiledForest:
+        """
+        Flattens the sklearn forest into arrays and caches them next to the pickle.
+
+        A forest trained on the UCI feature order is renumbered to take game
+        boards, so the compiled forest always has ``FEATURE_LAYOUT``.
+        """
+        feature_names = self.feature_names[:-1] if self.feature_names else None
+        compiled = CompiledForest.from_estimator(model, self.label_encoder, feature_names)
+        if layout == UCI_LAYOUT:
+            print("✅ Renumbering the UCI-ordered model features to game-board order.")
+            uci_index = to_game_boards(np.arange(MODEL_SHAPE[0] * MODEL_SHAPE[1]), *MODEL_SHAPE).ravel()
+            compiled.reorder_features(np.argsort(uci_index))
+        compiled.source = file_digest(self.model_path)
+        compiled.feature_layout = FEATURE_LAYOUT
+        try:
+            compiled.save(self.compiled_path)
+            print("✅ Compiled model saved to:", self.compiled_path)
+        except OSError as e:
+            print(f"[MLAgent] WARNING: Could not save compiled model: {e}")
+        return compiled
+
+    def _train_model(self):
+        import joblib
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import LabelEncoder
 
-    def _train_model(self) -> RandomForestClassifier:
         print("Training MLAgent model...")
 
         loader = DatasetLoader(os.path.dirname(self.data_path))
 
-        csv_data = loader.load_csv('connect-4.data.csv')
-        if not csv_data:
+        boards, labels = loader.load_arrays(os.path.basename(self.data_path))
+        if not len(boards):
             print("[MLAgent] ERROR: Could not load CSV data.")
             return None
 
-        attributes = loader.load_attribute_names('connect-4.names.txt')
+        attributes = loader.load_attribute_names(os.path.basename(self.names_path))
         if not attributes:
             print("[MLAgent] ERROR: Could not load attributes.")
             return None
 
-        self.feature_names = attributes
-
-        df = pd.DataFrame(csv_data, columns=attributes)
+        # UCI rows run up each column in turn; train on game boards, the layout
+        # ``score_boards`` encodes, and name the features to match.
+        self.feature_names = to_game_boards(np.array(attributes[:-1]), *MODEL_SHAPE).ravel().tolist() + attributes[-1:]
+        boards = to_game_boards(boards, *MODEL_SHAPE)
 
-        mapping = {'x': 1, 'o': 2, 'b': 0}
+        # Mirror images carry the same outcome; keep each position once, in the
+        # canonical orientation the agent scores boards in.
+        canonical, labels = deduplicate_boards(boards, labels)
+        print(f"✅ {len(canonical)} distinct positions after removing {len(boards) - len(canonical)} mirror duplicates.")
 
-        for col in df.columns[:-1]:  
-            df[col] = df[col].map(mapping).fillna(0).astype(int)
-
-
-        df["Class"] = self.label_encoder.fit_transform(df["Class"])
-
-        X = df.drop("Class", axis=1).astype(float) / 2.0
-        y = df["Class"]
+        self.label_encoder = LabelEncoder()
+        y = self.label_encoder.fit_transform(labels)
+        X = canonical.reshape(len(canonical), -1).astype(float) / 2.0
 
         try:
             X_train, X_test, y_train, y_test = train_test_split(X, y, stratify=y, test_size=0.2, random_state=42)
@@ -89,57 +229,128 @@ class MLAgent:
         joblib.dump({
             "model": model,
             "label_encoder": self.label_encoder,
-            "feature_names": self.feature_names
+            "feature_names": self.feature_names,
+            "feature_layout": FEATURE_LAYOUT
         }, self.model_path)
         print("✅ Model trained and saved successfully.")
         return model
 
     def _outcome_score(self, outcome_label: str) -> float:
-        mapping = {'win': 1.0, 'draw': 0.5, 'loss': 0.0}
-        return mapping.get(outcome_label, 0.25)
+        return OUTCOME_VALUES.get(outcome_label, 0.25)
 
     def _encode_board(self, board: np.ndarray) -> List[float]:
         flat = board.flatten()
         return (flat.astype(float) / 2.0).tolist()
 
+    def _encode_boards(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Encodes a stack of boards as one (N, 42) feature matrix, like ``_encode_board``.
+        """
+        return boards.reshape(len(boards), -1).astype(float) / 2.0
+
+    def score_boards(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Scores a batch of boards with a single pass through the compiled forest.
+
+        Each board's score is the outcome value of its most likely class times that
+        class's probability. Boards are scored in canonical orientation, so a board
+        and its mirror image always get the same score: each distinct position is
+        scored once per batch, and scores are cached by canonical key across calls.
+
+        Args:
+            boards (np.ndarray): Boards of shape (N, 6, 7).
+
+        Returns:
+            np.ndarray: One score per board.
+
+        Raises:
+            ValueError: If the boards are not of the model's ``MODEL_SHAPE``.
+        """
+        self._check_shape(boards)
+        canonical, keys, _ = canonical_boards(boards)
+        keys = keys.tolist()
+        cache = self._score_cache
+        scores = {}
+        missing = {}
+        for i, key in enumerate(keys):
+            if key in scores or key in missing:
+                continue
+            cached = cache.get(key)
+            if cached is None:
+                missing[key] = i
+            else:
+                scores[key] = cached
+
+        if missing:
+            proba = self.model.predict_proba(self._encode_boards(canonical[list(missing.values())]))
+            best = proba.argmax(axis=1)
+            labels = self.model.classes_[best]
+            outcome = np.array([self._outcome_score(label) for label in labels])
+            new_scores = dict(zip(missing, (outcome * proba[np.arange(len(proba)), best]).tolist()))
+            scores.update(new_scores)
+            if len(cache) + len(new_scores) > SCORE_CACHE_SIZE:
+                cache.clear()
+            cache.update(new_scores)
+        return np.array([scores[key] for key in keys])
+
+    def win_probabilities(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Returns each board's expected outcome for player 1, from the class probabilities.
+
+        The value is P(win) + P(draw) / 2, so 1 is a sure win for player 1 and 0 a
+        sure win for player 2. Boards are scored in canonical orientation, each
+        distinct position once.
+
+        Args:
+            boards (np.ndarray): Boards of shape (N, 6, 7).
+
+        Returns:
+            np.ndarray: One value between 0 and 1 per board.
+
+        Raises:
+            ValueError: If the boards are not of the model's ``MODEL_SHAPE``.
+        """
+        self._check_shape(boards)
+        canonical, keys, _ = canonical_boards(boards)
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        proba = self.model.predict_proba(self._encode_boards(canonical[first]))
+        values = np.array([OUTCOME_VALUES.get(str(label), 0.5) for label in self.model.classes_])
+        return (proba @ values)[inverse]
+
+    def _check_shape(self, boards: np.ndarray) -> None:
+        if boards.shape[1:] != MODEL_SHAPE:
+            rows, cols = boards.shape[1:]
+            raise ValueError(f"[{self.name}] The model scores {MODEL_SHAPE[0]}x{MODEL_SHAPE[1]} boards, "
+                             f"not {rows}x{cols}.")
+
+    def _child_boards(self, board: np.ndarray, valid_moves: List[int]) -> np.ndarray:
+        """
+        Returns the boards after this agent plays each of ``valid_moves``.
+        """
+        cols = np.array(valid_moves)
+        open_rows = board.shape[0] - 1 - np.count_nonzero(board[:, cols], axis=0)
+        children = np.repeat(board[np.newaxis], len(cols), axis=0)
+        children[np.arange(len(cols)), open_rows, cols] = self.player_id
+        return children
+
     def get_move(self, board_or_game) -> int:
         if hasattr(board_or_game, 'get_board_copy'):
             board = board_or_game.get_board_copy()
         else:
-            board = board_or_game
+            board = as_board(board_or_game)
 
         valid_moves = [c for c in range(board.shape[1]) if board[0][c] == 0]
 
         if self.model is None:
             print("[MLAgent] No model loaded. Falling back to MinimaxAgent.")
             fallback = MinimaxAgent(player_id=self.player_id)
-            return fallback.get_move(GameState(board.copy(), self.player_id))
-
-        best_move = None
-        best_score = -np.inf
-
-        for col in valid_moves:
-            temp_board = board.copy()
-            for row in reversed(range(temp_board.shape[0])):
-                if temp_board[row][col] == 0:
-                    temp_board[row][col] = self.player_id
-                    break
-
-            encoded_board = self._encode_board(temp_board)
-            input_df = pd.DataFrame([encoded_board], columns=self.feature_names[:-1])
-
-
-            proba = self.model.predict_proba(input_df)[0]
-            predicted_label = self.model.predict(input_df)[0]
-            predicted_outcome = self.label_encoder.inverse_transform([predicted_label])[0]
-            confidence = max(proba)
-            score = self._outcome_score(predicted_outcome) * confidence
+            return fallback.get_move(GameState(board, self.player_id))
 
-            if score > best_score:
-                best_score = score
-                best_move = col
+        if not valid_moves:
+            raise ValueError(f"[{self.name}] No valid moves available.")
 
-        return best_move if best_move is not None else random.choice(valid_moves)
+        scores = self.score_boards(self._child_boards(board, valid_moves))
+        return valid_moves[int(np.argmax(scores))]
 
     def __str__(self):
         return f"MLAgent (Player {self.player_id})"
@@ -2,24 +2,26 @@ import random
 from typing import List
 import numpy as np  # <- optional if type hinting
 
-class RandomAgent:
+from connect4.agents.base_agent import BaseAgent, as_board
+
+class RandomAgent(BaseAgent):
     def __init__(self, player_id: int = 2, name: str = "RandomAgent") -> None:
         """
         Initializes the RandomAgent with a player ID and an optional name.
         """
-        self.player_id = player_id
-        self.name = name
+        super().__init__(player_id, name)
 
-    def get_move(self, board: np.ndarray) -> int:
+    def get_move(self, game) -> int:
         """
-        Selects a random valid column from the board (numpy array).
+        Selects a random valid column.
 
         Args:
-            board (np.ndarray): The current board state.
+            game: The shared GameState, or the board as a numpy array.
 
         Returns:
            int: The selected column index.
         """
+        board = as_board(game)
         valid_moves: List[int] = [c for c in range(board.shape[1]) if board[0][c] == 0]
         if not valid_moves:
             raise ValueError(f"[{self.name}] No valid moves available.")
@@ -27,5 +29,17 @@ class RandomAgent:
         selected_move: int = random.choice(valid_moves)
         return selected_move
 
-    def __str__(self) -> str:
-        return self.name
+    def get_moves(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Selects a random valid column for each board in a (N, rows, cols) stack.
+
+        Args:
+            boards (np.ndarray): The boards, e.g. from ``BatchSimulator``.
+
+        Returns:
+            np.ndarray: One column index per board.
+        """
+        valid = boards[:, 0, :] == 0
+        if not valid.any(axis=1).all():
+            raise ValueError(f"[{self.name}] No valid moves available.")
+        return np.where(valid, np.random.random(valid.shape), -1.0).argmax(axis=1)
@@ -0,0 +1,101 @@
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict
+
+from connect4.agents.minimax_agent import MinimaxAgent
+from connect4.agents.ml_agent import MLAgent, model_fits
+from connect4.agents.random_agent import RandomAgent
+from connect4.agents.smart_agent import SmartAgent
+from connect4.constants import AI_TIME_LIMIT, COLUMN_COUNT, CONNECT, ROW_COUNT
+
+
+class AgentRegistry(Mapping):
+    """
+    Agents by menu name, each built the first time it is looked up.
+
+    The menus only need the names, so nothing is constructed (and no model is
+    loaded) until a game mode actually uses an agent. ``preload`` can warm agents
+    up on a background thread while the player is still in the menus.
+    Membership checks and ``keys()`` only look at the names; ``values()`` and
+    ``items()`` build every agent, so use them only when all are needed.
+
+    Attributes:
+        factories (Dict[str, Callable]): Zero-argument callables that build each agent.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]]) -> None:
+        """
+        Initializes the registry.
+
+        Args:
+            factories (Dict[str, Callable]): Agent name to a callable returning the agent.
+        """
+        self.factories = dict(factories)
+        self._agents = {}
+        self._locks = {name: threading.Lock() for name in self.factories}
+
+    def __getitem__(self, name: str) -> Any:
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        with self._locks[name]:
+            if name not in self._agents:
+                self._agents[name] = self.factories[name]()
+            return self._agents[name]
+
+    def __contains__(self, name: object) -> bool:
+        # Mapping's version looks the agent up, which would build it.
+        return name in self.factories
+
+    def __iter__(self):
+        return iter(self.factories)
+
+    def __len__(self) -> int:
+        return len(self.factories)
+
+    def is_created(self, name: str) -> bool:
+        """
+        Returns True if the agent called ``name`` has already been built.
+        """
+        return name in self._agents
+
+    def preload(self, *names: str) -> threading.Thread:
+        """
+        Builds the named agents on a daemon thread.
+
+        Args:
+            *names (str): Agents to build; all of them if none are given.
+
+        Returns:
+            threading.Thread: The started thread.
+        """
+        names = names or tuple(self.factories)
+        thread = threading.Thread(target=lambda: [self[name] for name in names], daemon=True)
+        thread.start()
+        return thread
+
+
+def game_agents(rows: int = ROW_COUNT, cols: int = COLUMN_COUNT, k: int = CONNECT,
+                time_limit: float = AI_TIME_LIMIT) -> AgentRegistry:
+    """
+    Returns the registry of the agents the game offers, all playing as player 2.
+
+    The ML agent is only listed when its model can score ``rows`` x ``cols`` boards.
+
+    Args:
+        rows (int): Number of rows on the board.
+        cols (int): Number of columns on the board.
+        k (int): Pieces in a row needed to win.
+        time_limit (float): MinimaxAgent seconds per move.
+
+    Returns:
+        AgentRegistry: Agents by menu name.
+    """
+    factories = {
+        "Random": lambda: RandomAgent(player_id=2),
+        "Smart": lambda: SmartAgent(player_id=2, k=k),
+        "Minimax": lambda: MinimaxAgent(player_id=2, time_limit=time_limit),
+    }
+    if model_fits(rows, cols):
+        factories["ML"] = lambda: MLAgent(player_id=2, background_load=True)
+    return AgentRegistry(factories)
@@ -2,73 +2,61 @@ import random
 from typing import List
 import numpy as np  # <- optional if you want better type hints
 
-class SmartAgent:
-    def __init__(self, player_id: int = 2, name: str = "SmartAgent") -> None:
+from connect4.agents.base_agent import BaseAgent, as_board
+from connect4.constants import CONNECT
+from connect4.utils.board_utils import winning_columns
+from connect4.utils.lines import line_table
+
+class SmartAgent(BaseAgent):
+    def __init__(self, player_id: int = 2, name: str = "SmartAgent", k: int = CONNECT) -> None:
         """
         Initializes the SmartAgent with a player ID and an optional name.
+
+        ``k`` is the win length assumed for bare ndarray boards; a GameState brings its own.
         """
-        self.player_id = player_id
-        self.name = name
+        super().__init__(player_id, name)
+        self.k = k
 
-    def get_move(self, board: np.ndarray) -> int:
+    def get_move(self, game) -> int:
         """
         Chooses a move for the SmartAgent.
         Tries to win, block the opponent, or picks randomly.
         """
+        board = as_board(game)
         valid_moves: List[int] = [c for c in range(board.shape[1]) if board[0][c] == 0]
         opponent_id = 1 if self.player_id == 2 else 2
+        wins = winning_columns(board, game.position.k if hasattr(game, "position") else self.k)
 
-        # Try to win
-        for col in valid_moves:
-            temp_board = board.copy()
-            for row in reversed(range(temp_board.shape[0])):
-                if temp_board[row][col] == 0:
-                    temp_board[row][col] = self.player_id
-                    break
-            if self.is_winning_move(temp_board, self.player_id):
-                return col
-
-        # Try to block opponent
-        for col in valid_moves:
-            temp_board = board.copy()
-            for row in reversed(range(temp_board.shape[0])):
-                if temp_board[row][col] == 0:
-                    temp_board[row][col] = opponent_id
-                    break
-            if self.is_winning_move(temp_board, opponent_id):
-                return col
+        # Try to win, else block the opponent (leftmost column first)
+        for player in (self.player_id, opponent_id):
+            if wins[player].any():
+                return int(wins[player].argmax())
 
         # Otherwise random
         return random.choice(valid_moves)
 
-    def is_winning_move(self, board: np.ndarray, player_id: int) -> bool:
-        rows, cols = board.shape
-
-        # Horizontal
-        for r in range(rows):
-            for c in range(cols - 3):
-                if all(board[r, c+i] == player_id for i in range(4)):
-                    return True
-
-        # Vertical
-        for r in range(rows - 3):
-            for c in range(cols):
-                if all(board[r+i, c] == player_id for i in range(4)):
-                    return True
-
-        # Positive Diagonal
-        for r in range(rows - 3):
-            for c in range(cols - 3):
-                if all(board[r+i, c+i] == player_id for i in range(4)):
-                    return True
+    def get_moves(self, boards: np.ndarray) -> np.ndarray:
+        """
+        Chooses a move for each board in a (N, rows, cols) stack, as ``get_move`` does.
 
-        # Negative Diagonal
-        for r in range(3, rows):
-            for c in range(cols - 3):
-                if all(board[r-i, c+i] == player_id for i in range(4)):
-                    return True
+        Args:
+            boards (np.ndarray): The boards, e.g. from ``BatchSimulator``.
 
-        return False
+        Returns:
+            np.ndarray: One column index per board.
+        """
+        valid = boards[:, 0, :] == 0
+        if not valid.any(axis=1).all():
+            raise ValueError(f"[{self.name}] No valid moves available.")
+        moves = np.where(valid, np.random.random(valid.shape), -1.0).argmax(axis=1)
+        wins = winning_columns(boards, self.k)
+        for player in (3 - self.player_id, self.player_id):
+            found = wins[:, player].any(axis=1)
+            moves[found] = wins[found, player].argmax(axis=1)
+        return moves
 
-    def __str__(self) -> str:
-        return self.name
+    def is_winning_move(self, board: np.ndarray, player_id: int) -> bool:
+        """
+        Returns True if ``player_id`` has ``k`` in a row on ``board``.
+        """
+        return line_table(*board.shape, self.k).has_line(board, player_id)
@@ -0,0 +1,157 @@
+import os
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from connect4.agents.base_agent import BaseAgent, as_game_state
+from connect4.agents.minimax_agent import MinimaxAgent
+from connect4.utils.opening_book import OpeningBook
+from connect4.utils.solver import Solver, SolverTimeout
+
+# Share of ``time_limit`` the exact solve may use; the fallback search gets the rest.
+SOLVE_SHARE = 0.5
+
+
+class SolverAgent(BaseAgent):
+    """
+    SolverAgent for Connect 4.
+
+    This agent plays perfectly: it reads exact scores of early positions from a
+    precomputed opening book and solves later positions with the bitboard
+    ``Solver``. If a solve doesn't finish within ``SOLVE_SHARE`` of ``time_limit``,
+    it falls back to a ``MinimaxAgent`` search for the rest of the budget. Without
+    a book, early positions are too deep to solve in time and always fall back.
+
+    Attributes:
+        player_id (int): The ID representing this agent (1 or 2).
+        name (str): Agent's display name.
+        time_limit (float or None): Seconds per move, shared by the solve and the fallback search.
+        solver (Solver): Exact solver, with a table kept across moves of one game.
+        book (OpeningBook or None): Opening book, if the book file exists.
+        last_scores (dict): Exact score of each column from the last ``get_move``,
+            empty if the fallback search was used.
+    """
+
+    def __init__(
+        self,
+        player_id: int,
+        book_path: str = "models/opening_book.bin",
+        time_limit: Optional[float] = 1.0,
+        tt_size_mb: float = 64,
+        name: str = "SolverAgent"
+    ) -> None:
+        """
+        Initializes the SolverAgent instance.
+
+        Args:
+            player_id (int): The agent's ID (1 or 2).
+            book_path (str): Path of the opening book written by ``opening_book.py``.
+            time_limit (float or None): Seconds per move. None means always solve to
+                the end, which takes far too long for early positions without a book.
+            tt_size_mb (float): Memory cap of the solver's transposition table.
+            name (str): Optional name of the agent.
+        """
+        super().__init__(player_id, name)
+        self.time_limit = time_limit
+        self.tt_size_mb = tt_size_mb
+        self.solver = Solver(tt_size_mb=tt_size_mb)
+        self.book = None
+        if os.path.exists(book_path):
+            print("✅ Loading opening book from:", book_path)
+            self.book = OpeningBook.load(book_path)
+        else:
+            print(f"[SolverAgent] WARNING: No opening book at {book_path}; early moves will fall back to "
+                  "MinimaxAgent. Build one with opening_book.py.")
+        self.last_scores = {}
+
+    def reset(self) -> None:
+        """
+        Clears the solver's transposition table before a new game.
+        """
+        self.solver.tt.clear()
+
+    def get_move(self, game) -> int:
+        """
+        Selects the move with the best exact score.
+
+        Args:
+            game: The shared GameState, or the board as an ndarray with this agent to move.
+
+        Returns:
+            int: Best column index to play.
+        """
+        game = as_game_state(game, self.player_id)
+        board = game.board
+        player = game.current_player
+        position = game.position
+        if (position.rows, position.cols, position.k) != (self.solver.rows, self.solver.cols, self.solver.k):
+            self.solver = Solver(position.rows, position.cols, self.tt_size_mb, position.k)
+
+        start = time.perf_counter()
+        try:
+            scores = self.analyze(board, player)
+        except SolverTimeout:
+            self.last_scores = {}
+            remaining = max(self.time_limit - (time.perf_counter() - start), 0.05)
+            fallback = MinimaxAgent(player_id=player, time_limit=remaining)
+            return fallback.get_move(game)
+
+        self.last_scores = scores
+        if not scores:
+            raise ValueError(f"[{self.name}] No valid move found.")
+        return max(scores, key=scores.get)
+
+    def analyze(self, board: np.ndarray, player: int) -> Dict[int, int]:
+        """
+        Returns the exact score of every playable column for ``player``.
+
+        Children found in the opening book are read from it; the rest are solved.
+
+        Raises:
+            SolverTimeout: If solving takes longer than its share of ``time_limit``.
+        """
+        solver = self.solver
+        current, mask, moves = solver.position_from_board(board, player)
+        scores = {}
+        possible = solver.possible(mask)
+        wins = solver.winning_cells(current, mask)
+        unsolved = []
+
+        for col in solver.order:
+            move = possible & solver.column_masks[col]
+            if not move:
+                continue
+            if wins & move:
+                scores[col] = (solver.cells + 1 - moves) // 2
+                continue
+            child = (current ^ mask, mask | move, moves + 1)
+            book_score = self._book_score(*child)
+            if book_score is None:
+                unsolved.append((col, child))
+            else:
+                scores[col] = -book_score
+
+        if unsolved:
+            solver.deadline = (time.perf_counter() + self.time_limit * SOLVE_SHARE
+                               if self.time_limit is not None else None)
+            try:
+                for col, child in unsolved:
+                    scores[col] = -solver.solve(*child)
+            finally:
+                solver.deadline = None
+        return scores
+
+    def _book_score(self, current: int, mask: int, moves: int) -> Optional[int]:
+        """
+        Looks a position up in the opening book, which also finds its mirror image.
+        """
+        book, solver = self.book, self.solver
+        if book is None or moves > book.max_ply:
+            return None
+        if (book.rows, book.cols, book.k) != (solver.rows, solver.cols, solver.k):
+            return None
+        return book.get(current + mask)
+
+    def __str__(self) -> str:
+        return self.name
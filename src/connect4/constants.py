@@ -1,9 +1,12 @@
-import pygame
-
 # Constants for the Connect 4 game
+import os
+
 SQUARE_SIZE = 100
-ROW_COUNT = 6
-COLUMN_COUNT = 7
+# Board geometry. Variants such as 8x7, 9x7 or connect-5 are played by setting
+# CONNECT4_ROWS, CONNECT4_COLS and CONNECT4_CONNECT in the environment.
+ROW_COUNT = int(os.environ.get("CONNECT4_ROWS", 6))
+COLUMN_COUNT = int(os.environ.get("CONNECT4_COLS", 7))
+CONNECT = int(os.environ.get("CONNECT4_CONNECT", 4))  # pieces in a row needed to win
 WIDTH = SQUARE_SIZE * COLUMN_COUNT
 HEIGHT = SQUARE_SIZE * (ROW_COUNT + 1)
 
@@ -14,10 +17,20 @@ YELLOW = (255, 255, 0)
 BLACK = (0, 0, 0)
 BLUE = (70, 130, 200)
 
+# Font sizes. The fonts themselves are created on first access (see __getattr__),
+# so importing the constants doesn't start pygame.
+_FONT_SIZES = {"FONT": 32, "BIG_FONT": 48}
+
+TURN_TIME_LIMIT = 10  # seconds
+AI_TIME_LIMIT = 2  # seconds the Minimax agent may search per move, well inside the turn clock
+
 
-# Initialize fonts
-pygame.font.init()
-FONT = pygame.font.SysFont("arial", 32)
-BIG_FONT = pygame.font.SysFont("arial", 48)
+def __getattr__(name):
+    if name in _FONT_SIZES:
+        import pygame
 
-TURN_TIME_LIMIT = 10  # seconds
\ No newline at end of file
+        pygame.font.init()
+        font = pygame.font.SysFont("arial", _FONT_SIZES[name])
+        globals()[name] = font
+        return font
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
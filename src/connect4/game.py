@@ -1,17 +1,27 @@
 import numpy as np
+from connect4.constants import ROW_COUNT, COLUMN_COUNT, CONNECT
+from connect4.utils.bitboard import Bitboard
+from connect4.utils.lines import line_table
 
 class Connect4Game:
-    ROWS = 6
-    COLS = 7
+    ROWS = ROW_COUNT
+    COLS = COLUMN_COUNT
+    CONNECT = CONNECT
     EMPTY = 0
 
-    def __init__(self):
+    def __init__(self, rows=ROW_COUNT, cols=COLUMN_COUNT, k=CONNECT):
+        """Creates an empty ``rows`` x ``cols`` game won by ``k`` pieces in a row."""
+        self.ROWS = rows
+        self.COLS = cols
+        self.CONNECT = k
         self.board = np.zeros((self.ROWS, self.COLS), dtype=int)
+        self.position = Bitboard(self.ROWS, self.COLS, self.CONNECT)
         self.current_player = 1
         self.game_over = False
 
     def reset(self):
         self.board = np.zeros((self.ROWS, self.COLS), dtype=int)
+        self.position = Bitboard(self.ROWS, self.COLS, self.CONNECT)
         self.current_player = 1
         self.game_over = False
 
@@ -22,50 +32,38 @@ class Connect4Game:
         if not self.is_valid_move(col):
             return -1  # Some safe error value
 
-        row = self.get_next_open_row(col)
+        row = self.position.play(col, self.current_player)
         self.board[row][col] = self.current_player
-        if self.check_winner(row, col):
+        if self.position.is_win(self.current_player):
             self.game_over = True
         self.current_player = 3 - self.current_player  # Switch player
         return row  # return the row
 
 
     def is_valid_move(self, col):
-        return self.board[0][col] == self.EMPTY
+        return self.position.can_play(col)
 
     def get_next_open_row(self, col):
-        for row in range(self.ROWS-1, -1, -1):
-            if self.board[row][col] == self.EMPTY:
-                return row
-        return -1
+        return self.position.next_open_row(col)
 
     def get_valid_moves(self):
-        return [col for col in range(self.COLS) if self.is_valid_move(col)]
+        return self.position.get_valid_moves()
 
     def check_winner(self, row, col):
-        piece = self.board[row][col]
-
-        def count_direction(dx, dy):
-            count = 0
-            r, c = row + dy, col + dx
-            while 0 <= r < self.ROWS and 0 <= c < self.COLS and self.board[r][c] == piece:
-                count += 1
-                r += dy
-                c += dx
-            return count
-
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]  # Horizontal, Vertical, Diagonals
-        for dx, dy in directions:
-            count = 1 + count_direction(dx, dy) + count_direction(-dx, -dy)
-            if count >= 4:
-                return True
-        return False
+        """Returns True if the piece at (row, col) completes ``CONNECT`` in a row."""
+        return line_table(self.ROWS, self.COLS, self.CONNECT).wins_through(self.board, row, col)
 
     def is_draw(self):
-        return not self.game_over and all(self.board[0][col] != self.EMPTY for col in range(self.COLS))
+        return not self.game_over and self.position.is_full()
 
     def get_board_copy(self):
         return np.copy(self.board)
 
+    def get_board_view(self):
+        """Returns a read-only view of the board, for agents that only read it."""
+        view = self.board.view()
+        view.flags.writeable = False
+        return view
+
     def get_current_player(self):
         return self.current_player
@@ -6,10 +6,7 @@ import pygame
 import sys
 import time
 from constants import *
-from agents.random_agent import RandomAgent
-from agents.smart_agent import SmartAgent
-from agents.minimax_agent import MinimaxAgent
-from agents.ml_agent import MLAgent
+from agents.registry import game_agents
 from utils.board_utils import create_board, drop_piece, valid_move, switch_turn, check_win, board_is_full, block_player_move
 from graphics import draw_board
 from utils.player_data import save_player_score
@@ -27,6 +24,7 @@ FONT = pygame.font.SysFont("Cambria", 32, bold=True)
 BIG_FONT = pygame.font.SysFont("Cambria", 48, bold=True)
 CLICK_COOLDOWN = 300  # milliseconds
 TURN_TIME_LIMIT = 10   # seconds for each turn
+PONDER_TIME = 0.05     # seconds the AI may think per frame while the player moves
 
 # Render text on the screen
 def render_text(text, x, y, color=WHITE, center=True):
@@ -104,6 +102,8 @@ def ask_play_again():
 def play_game(mode, player_name=None):
     board = create_board()
     turn = 1
+    # Position shared by every agent in this game, kept in step with the board
+    game_state = GameState(board, turn, CONNECT)
     draw_board(board, turn, screen)
     last_click_time = 0
 
@@ -112,15 +112,21 @@ def play_game(mode, player_name=None):
         player1_name = "Player 1"
         player2_name = "Player 2"
         ai_agent = None
+        agents = []
     elif "AI" in mode and mode.startswith("AI"):
         agent1 = AGENTS["Random"] if "Random" in mode else AGENTS["Minimax"]
         agent2 = AGENTS["Smart"] if "Smart" in mode else AGENTS["ML"]
         player1_name = "Agent 1"
         player2_name = "Agent 2"
+        agents = [agent1, agent2]
     else:
         ai_agent = AGENTS[mode]
         player1_name = player_name or "Player 1"
         player2_name = "AI"
+        agents = [ai_agent]
+
+    for agent in agents:
+        agent.reset()
 
     running = True
     while running:
@@ -172,18 +178,16 @@ def play_game(mode, player_name=None):
             elif mode.startswith("AI") and "AI" in mode:
                 pygame.time.delay(800)
                 agent = agent1 if turn == 1 else agent2
-
-                if isinstance(agent, MinimaxAgent):
-                    game_state = GameState(board.copy(), turn)           
-                    col = agent.get_move(game_state)
-                else:
-                    col = agent.get_move(board)
+                col = agent.get_move(game_state)
 
             # Human vs AI input
             elif turn == 1:
                 if pygame.mouse.get_pressed()[0] and current_time - last_click_time > CLICK_COOLDOWN:
                     col = pygame.mouse.get_pos()[0] // SQUARE_SIZE
                     last_click_time = current_time
+                else:
+                    # Let the AI think on the player's time
+                    ai_agent.ponder(game_state, PONDER_TIME)
             else:
                 pygame.time.delay(800)
                 opponent = 1 if turn == 2 else 2
@@ -191,17 +195,15 @@ def play_game(mode, player_name=None):
                 if block_col != -1 and valid_move(board, block_col):
                     col = block_col
                 else:
-                    if isinstance(ai_agent, MinimaxAgent):
-                        
-                        game_state = GameState(board.copy(), turn)
-                        col = ai_agent.get_move(game_state)
-                    else:
-                         col = ai_agent.get_move(board)
+                    col = ai_agent.get_move(game_state)
 
             # Drop piece and check result
             if col is not None and valid_move(board, col):
                 row = drop_piece(board, col, turn)
                 if row != -1:
+                    game_state.make_move(col, turn)
+                    for agent in agents:
+                        agent.notify_move(game_state, col, turn)
                     draw_board(board, turn, screen)
                     if check_win(board, turn):
                         winner = player1_name if turn == 1 else player2_name
@@ -223,6 +225,8 @@ def play_game(mode, player_name=None):
             if remaining_time <= 0:
                 print("⏰ Turn timed out! Switching turn...")
                 turn = switch_turn(turn)
+                # The skipped turn breaks move alternation, so start a fresh position
+                game_state = GameState(board, turn, CONNECT)
                 running_turn = False
 
             pygame.display.update()
@@ -267,21 +271,12 @@ def main_menu(player_name=None):
 
 # ======= MAIN ENTRY POINT =======
 if __name__ == "__main__":
-    from utils.dataset_loader import DatasetLoader
-
-    loader = DatasetLoader(data_path="connect4_dataset")
-    csv_data = loader.load_csv('connect-4.data.csv')
-    attributes = loader.load_names('connect-4.names.txt')
-
-    if not csv_data or not attributes:
-        print("❌ Error loading dataset. ML Agent may not work properly.")
-
-    AGENTS = {
-        "Random": RandomAgent(player_id=2),
-        "Smart": SmartAgent(player_id=2),
-        "Minimax": MinimaxAgent(player_id=2),
-        "ML": MLAgent(player_id=2, data_path="connect4_dataset/connect-4.data.csv", names_path="connect4_dataset/connect-4.names.txt")
-    }
+    # Agents are built on first use; the ML model starts loading in the background
+    # while the player is still answering the registration prompt. It only knows
+    # the 6x7 board, so other sizes leave it and its modes out.
+    AGENTS = game_agents(ROW_COUNT, COLUMN_COUNT, CONNECT)
+    if "ML" in AGENTS:
+        AGENTS.preload("ML")
 
     MODES = [
         ("Human vs Human", "Human-Human"),
@@ -293,6 +288,8 @@ if __name__ == "__main__":
         ("AI vs AI (Minimax vs Smart)", "AI-Minimax-Smart"),
         ("AI vs AI (Minimax vs ML)", "AI-Minimax-ML")
     ]
+    if "ML" not in AGENTS:
+        MODES = [(label, mode) for label, mode in MODES if "ML" not in mode]
 
     main()
 
@@ -5,26 +5,22 @@ import random
 from constants import *
 from utils.board_utils import create_board, drop_piece, valid_move, switch_turn, check_win, board_is_full
 from graphics import draw_board
-from agents.random_agent import RandomAgent
-from agents.smart_agent import SmartAgent
-from agents.minimax_agent import MinimaxAgent
-from agents.ml_agent import MLAgent
+from agents.registry import game_agents
 from utils.player_data import save_player_score
 from utils.game_help import display_message
+from utils.game_state import GameState
 
-# Reusable agents dictionary
-AGENTS = {
-    "Random": RandomAgent(player_id=2),
-    "Smart": SmartAgent(player_id=2),
-    "Minimax": MinimaxAgent(player_id=2),
-    "ML": MLAgent(player_id=2)
-}
+# Reusable agents, each built the first time a game mode needs it; there is no
+# "ML" entry unless the board is the 6x7 one its model knows
+AGENTS = game_agents(ROW_COUNT, COLUMN_COUNT, CONNECT)
 
 TURN_TIME_LIMIT = 10  
 
 def play_game(mode, player_name=None, screen=None):
     board = create_board()
     turn = 1
+    # Position shared by the agents, kept in step with the board
+    game_state = GameState(board, turn, CONNECT)
     draw_board(board, turn, screen)
 
     if "AI" in mode and mode.startswith("AI"):
@@ -33,11 +29,16 @@ def play_game(mode, player_name=None, screen=None):
         player1_name = "Agent 1"
         player2_name = "Agent 2"
         ai_mode = True
+        agents = [agent1, agent2]
     else:
         ai_agent = AGENTS[mode]
         player1_name = player_name or "Player 1"
         player2_name = "AI"
         ai_mode = False
+        agents = [ai_agent]
+
+    for agent in agents:
+        agent.reset()
 
     running = True
     last_mouse_pressed = False
@@ -75,12 +76,17 @@ def play_game(mode, player_name=None, screen=None):
                         col = pygame.mouse.get_pos()[0] // SQUARE_SIZE
                         if valid_move(board, col):
                             drop_piece(board, col, turn)
+                            game_state.make_move(col, turn)
+                            for agent in agents:
+                                agent.notify_move(game_state, col, turn)
                             move_made = True
                             break
 
                 if remaining_time <= 0:
                     print("⏰ Turn timed out! Skipping move...")
                     turn = switch_turn(turn)
+                    # The skipped turn breaks move alternation, so start a fresh position
+                    game_state = GameState(board, turn, CONNECT)
                     move_made = True
                     break
 
@@ -91,12 +97,15 @@ def play_game(mode, player_name=None, screen=None):
             pygame.time.delay(800)  # AI move
             if mode.startswith("AI") and "AI" in mode:
                 agent = agent1 if turn == 1 else agent2
-                move = agent.get_move(board)
+                move = agent.get_move(game_state)
             else:
-                move = ai_agent.get_move(board)
+                move = ai_agent.get_move(game_state)
 
             if valid_move(board, move):
                 drop_piece(board, move, turn)
+                game_state.make_move(move, turn)
+                for agent in agents:
+                    agent.notify_move(game_state, move, turn)
 
         draw_board(board, turn, screen)
 
@@ -2,33 +2,46 @@ from agents.random_agent import RandomAgent
 from agents.smart_agent import SmartAgent
 from agents.minimax_agent import MinimaxAgent
 from agents.ml_agent import MLAgent
+from agents.registry import game_agents
+from constants import ROW_COUNT, COLUMN_COUNT, CONNECT
 from utils.board_utils import create_board, drop_piece, valid_move, board_is_full, check_win, switch_turn
 from utils.game_state import GameState
+from utils.tournament import Tournament
+import os
 import time
+import numpy as np
 
-def run_ai_vs_ai_test(agent1, agent2, num_games=500):
+def run_ai_vs_ai_test(agent1, agent2, num_games=500, workers=1):
     agent1_wins = 0
     agent2_wins = 0
     draws = 0
 
+    if workers > 1:
+        # Spread the games over a process pool, one copy of each agent per worker.
+        tournament = Tournament({"agent1": agent1, "agent2": agent2}, workers=workers,
+                                rows=ROW_COUNT, cols=COLUMN_COUNT, k=CONNECT)
+        match = tournament.play_match("agent1", "agent2", num_games)
+        agent1_wins, agent2_wins, draws = match.wins["agent1"], match.wins["agent2"], match.draws
+        num_games = 0
+
     for game in range(num_games):
         board = create_board()
         turn = 1  # Player 1 starts
+        # One GameState shared by both agents, kept in step with the board
+        state = GameState(board, turn, CONNECT)
+        agent1.reset()
+        agent2.reset()
 
         running = True
         while running:
             agent = agent1 if turn == 1 else agent2
-
-            # Object passed to each agent
-            if isinstance(agent, MinimaxAgent):
-                move = agent.get_move(GameState(board.copy(), turn))
-            elif isinstance(agent, MLAgent):
-                move = agent.get_move(board)
-            else:
-                move = agent.get_move(board)
+            move = agent.get_move(state)
 
             if move is not None and valid_move(board, move):
                 row = drop_piece(board, move, turn)
+                state.make_move(move, turn)
+                agent1.notify_move(state, move, turn)
+                agent2.notify_move(state, move, turn)
                 if row != -1:
                     if check_win(board, turn):
                         if turn == 1:
@@ -65,7 +78,31 @@ def run_ai_vs_ai_test(agent1, agent2, num_games=500):
     print(f"Agent2 Win Rate: {agent2_wins/total*100:.2f}%")
     print(f"Draw Rate: {draws/total*100:.2f}%")
 
+def run_geometry_test(rows, cols, k, num_games=2):
+    """
+    Plays every agent the game registers for a rows x cols board against RandomAgent.
+    """
+    agents = game_agents(rows, cols, k, time_limit=0.2)
+    opponent = RandomAgent(player_id=1)
+    for name in agents:
+        agent = agents[name]
+        for game in range(num_games):
+            state = GameState(np.zeros((rows, cols), dtype=int), 1, k)
+            agent.reset()
+            while not state.is_terminal_node():
+                turn = state.current_player
+                move = (opponent if turn == 1 else agent).get_move(state)
+                assert move in state.get_valid_moves(), f"{name} played invalid column {move}"
+                state.make_move(move, turn)
+                agent.notify_move(state, move, turn)
+        print(f"✅ {name} finished {num_games} games on a {rows}x{cols} board (connect {k}).")
+
 if __name__ == "__main__":
+    # Test 0: every registered agent on boards other than the standard one
+    print("Testing agents on other board sizes...")
+    run_geometry_test(8, 7, 4)
+    run_geometry_test(7, 9, 5)
+
     # Agents for different tests
     random_agent = RandomAgent(player_id=1)
     smart_agent = SmartAgent(player_id=2)
@@ -78,12 +115,12 @@ if __name__ == "__main__":
 
     # Test 1: Random vs Smart
     print("Testing Random vs Smart...")
-    run_ai_vs_ai_test(random_agent, smart_agent, num_games=500) # Tested with 50 and 100
+    run_ai_vs_ai_test(random_agent, smart_agent, num_games=500, workers=os.cpu_count()) # Tested with 50 and 100
 
     # Test 2: Smart vs Minimax
     print("\nTesting Smart vs Minimax...")
-    run_ai_vs_ai_test(smart_agent2, minimax_agent, num_games=500) # Tested with 50 and 100
+    run_ai_vs_ai_test(smart_agent2, minimax_agent, num_games=500, workers=os.cpu_count()) # Tested with 50 and 100
 
     # Test 3: Minimax vs ML
     print("\nTesting Minimax vs ML...")
-    run_ai_vs_ai_test(minimax_agent2, ml_agent, num_games=500) # Tested with 50 and 100
+    run_ai_vs_ai_test(minimax_agent2, ml_agent, num_games=500, workers=os.cpu_count()) # Tested with 50 and 100
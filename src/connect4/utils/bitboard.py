@@ -0,0 +1,337 @@
+import numpy as np
+
+
+class Bitboard:
+    """
+    Connect 4 position stored as one bit mask per player plus a height per column.
+
+    Each column uses ``rows + 1`` bits: ``rows`` playable cells (bottom cell first)
+    and one empty sentinel bit on top, so shifting a mask never wraps a line from one
+    column into the next. With the standard 6x7 board that is 49 bits per mask.
+    Masks are Python ints, so any board size works; see ``fits_uint64`` for the
+    NumPy helpers, which pack keys into uint64 when they fit.
+
+    Attributes:
+        rows (int): Number of rows on the board.
+        cols (int): Number of columns on the board.
+        k (int): Pieces in a row needed to win.
+        masks (list): Bit masks indexed by player id (index 0 is unused).
+        heights (list): Bit index of the next free cell in each column.
+        move_count (int): Number of pieces on the board.
+    """
+
+    __slots__ = ("rows", "cols", "k", "masks", "heights", "move_count", "_bottom", "_top")
+
+    def __init__(self, rows: int = 6, cols: int = 7, k: int = 4) -> None:
+        """
+        Creates an empty position.
+
+        Args:
+            rows (int): Number of rows on the board.
+            cols (int): Number of columns on the board.
+            k (int): Pieces in a row needed to win.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.masks = [0, 0, 0]
+        self._bottom = [c * (rows + 1) for c in range(cols)]
+        self._top = [base + rows for base in self._bottom]
+        self.heights = list(self._bottom)
+        self.move_count = 0
+
+    @classmethod
+    def from_array(cls, board: np.ndarray, k: int = 4) -> "Bitboard":
+        """
+        Builds a position from the (rows, cols) ndarray used by the GUI and agents.
+
+        Args:
+            board (np.ndarray): Board with 0 for empty cells and 1 or 2 for pieces,
+                row 0 being the top row.
+            k (int): Pieces in a row needed to win.
+
+        Returns:
+            Bitboard: The equivalent position.
+        """
+        board = np.asarray(board)
+        rows, cols = board.shape
+        position = cls(rows, cols, k)
+        weights = _cell_weights(rows, cols)
+        position.masks[1] = int(weights[board == 1].sum())
+        position.masks[2] = int(weights[board == 2].sum())
+        counts = np.count_nonzero(board, axis=0)
+        position.heights = [base + int(n) for base, n in zip(position._bottom, counts)]
+        position.move_count = int(counts.sum())
+        return position
+
+    @classmethod
+    def from_masks(cls, mask_1: int, mask_2: int, rows: int = 6, cols: int = 7, k: int = 4) -> "Bitboard":
+        """
+        Rebuilds a position from the two player masks, e.g. after sending them to
+        another process.
+
+        Args:
+            mask_1 (int): Player 1's mask.
+            mask_2 (int): Player 2's mask.
+            rows (int): Number of rows on the board.
+            cols (int): Number of columns on the board.
+            k (int): Pieces in a row needed to win.
+
+        Returns:
+            Bitboard: The position.
+        """
+        position = cls(rows, cols, k)
+        position.masks[1] = mask_1
+        position.masks[2] = mask_2
+        occupied = mask_1 | mask_2
+        column = (1 << rows) - 1
+        counts = [bin((occupied >> base) & column).count("1") for base in position._bottom]
+        position.heights = [base + n for base, n in zip(position._bottom, counts)]
+        position.move_count = sum(counts)
+        return position
+
+    def to_array(self, dtype=int) -> np.ndarray:
+        """
+        Converts the position back to a (rows, cols) ndarray.
+
+        Args:
+            dtype: The dtype of the returned array.
+
+        Returns:
+            np.ndarray: Board with 0 for empty cells and 1 or 2 for pieces.
+        """
+        weights = _cell_weights(self.rows, self.cols)
+        board = np.zeros((self.rows, self.cols), dtype=dtype)
+        if weights.dtype == object:
+            board[(weights & self.masks[1]) != 0] = 1
+            board[(weights & self.masks[2]) != 0] = 2
+        else:
+            board[(weights & np.uint64(self.masks[1])) != 0] = 1
+            board[(weights & np.uint64(self.masks[2])) != 0] = 2
+        return board
+
+    def copy(self) -> "Bitboard":
+        """Returns an independent copy of the position."""
+        other = Bitboard.__new__(Bitboard)
+        other.rows = self.rows
+        other.cols = self.cols
+        other.k = self.k
+        other.masks = list(self.masks)
+        other.heights = list(self.heights)
+        other.move_count = self.move_count
+        other._bottom = self._bottom
+        other._top = self._top
+        return other
+
+    def can_play(self, col: int) -> bool:
+        """Returns True if the column is not full."""
+        return self.heights[col] != self._top[col]
+
+    def get_valid_moves(self) -> list:
+        """Returns the columns that are not full, left to right."""
+        return [c for c in range(self.cols) if self.heights[c] != self._top[c]]
+
+    def play(self, col: int, player: int) -> int:
+        """
+        Drops a piece for ``player`` into ``col``. The column must not be full.
+
+        Args:
+            col (int): The column to play.
+            player (int): The player making the move (1 or 2).
+
+        Returns:
+            int: The ndarray row index (0 is the top row) the piece landed in.
+        """
+        height = self.heights[col]
+        self.masks[player] |= 1 << height
+        self.heights[col] = height + 1
+        self.move_count += 1
+        return self.rows - 1 - (height - self._bottom[col])
+
+    def undo(self, col: int) -> None:
+        """
+        Removes the top piece from ``col``.
+
+        Args:
+            col (int): The column to undo the move from.
+        """
+        height = self.heights[col] - 1
+        bit = ~(1 << height)
+        self.masks[1] &= bit
+        self.masks[2] &= bit
+        self.heights[col] = height
+        self.move_count -= 1
+
+    def column_height(self, col: int) -> int:
+        """Returns the number of pieces in ``col``."""
+        return self.heights[col] - self._bottom[col]
+
+    def next_open_row(self, col: int) -> int:
+        """Returns the ndarray row index the next piece in ``col`` would land in, or -1."""
+        if self.heights[col] == self._top[col]:
+            return -1
+        return self.rows - 1 - (self.heights[col] - self._bottom[col])
+
+    def is_win(self, player: int) -> bool:
+        """Returns True if ``player`` has ``k`` in a row anywhere on the board."""
+        if self.k == 4:
+            return has_four(self.masks[player], self.rows)
+        return has_line(self.masks[player], self.rows, self.k)
+
+    def is_full(self) -> bool:
+        """Returns True if every cell is occupied."""
+        return self.move_count == self.rows * self.cols
+
+    def key(self) -> int:
+        """
+        Returns an integer that uniquely identifies the position.
+
+        The occupied mask plus the bottom row marks the first empty cell of each
+        column, which makes player 1's mask below it unambiguous.
+        """
+        occupied = self.masks[1] | self.masks[2]
+        return self.masks[1] + occupied + _bottom_mask(self.rows, self.cols)
+
+    def mirror(self) -> "Bitboard":
+        """Returns the position reflected left to right."""
+        return Bitboard.from_masks(
+            mirror_key(self.masks[1], self.rows, self.cols),
+            mirror_key(self.masks[2], self.rows, self.cols),
+            self.rows, self.cols, self.k
+        )
+
+    def canonical_key(self):
+        """
+        Returns the smaller of the position's key and its mirror image's key.
+
+        A position and its reflection have the same value, so caches keyed on the
+        canonical key store them once.
+
+        Returns:
+            tuple: The canonical key and True if it belongs to the mirrored position.
+        """
+        key = self.key()
+        mirrored = mirror_key(key, self.rows, self.cols)
+        if mirrored < key:
+            return mirrored, True
+        return key, False
+
+
+def mirror_key(key, rows: int = 6, cols: int = 7):
+    """
+    Reflects a mask or position key left to right by reversing its column blocks.
+
+    Works on Python ints and on ndarrays of keys from ``board_keys`` alike, as long
+    as each column's bits stay inside its ``rows + 1``-bit block (true of player
+    masks, ``Bitboard.key()`` and the solver's ``current + mask``).
+    """
+    h1 = rows + 1
+    if isinstance(key, np.ndarray) and key.dtype != object:
+        column = np.uint64((1 << h1) - 1)
+        result = np.zeros_like(key)
+        for c in range(cols):
+            result |= ((key >> np.uint64(c * h1)) & column) << np.uint64((cols - 1 - c) * h1)
+        return result
+    column = (1 << h1) - 1
+    result = 0
+    for c in range(cols):
+        result |= ((key >> (c * h1)) & column) << ((cols - 1 - c) * h1)
+    return result
+
+
+def board_keys(boards: np.ndarray) -> np.ndarray:
+    """
+    Returns ``Bitboard.key()`` of every board in a (N, rows, cols) stack.
+
+    The keys are uint64 if the board ``fits_uint64``, else an object array of ints.
+    """
+    boards = np.asarray(boards)
+    rows, cols = boards.shape[1:]
+    weights = _cell_weights(rows, cols)
+    if weights.dtype == object:
+        mask_1 = np.where(boards == 1, weights, 0).sum(axis=(1, 2))
+        occupied = np.where(boards != 0, weights, 0).sum(axis=(1, 2))
+        return mask_1 + occupied + _bottom_mask(rows, cols)
+    mask_1 = np.where(boards == 1, weights, np.uint64(0)).sum(axis=(1, 2), dtype=np.uint64)
+    occupied = np.where(boards != 0, weights, np.uint64(0)).sum(axis=(1, 2), dtype=np.uint64)
+    return mask_1 + occupied + np.uint64(_bottom_mask(rows, cols))
+
+
+def fits_uint64(rows: int, cols: int) -> bool:
+    """
+    Returns True if a position's masks and keys fit in 64 bits, sentinels included.
+    """
+    return (rows + 1) * cols <= 64
+
+
+def has_four(mask: int, rows: int = 6) -> bool:
+    """
+    Checks a single player's mask for four in a row using shifts.
+
+    Args:
+        mask (int): The player's bit mask.
+        rows (int): Number of rows on the board the mask belongs to.
+
+    Returns:
+        bool: True if the mask contains four aligned pieces.
+    """
+    # Vertical, horizontal, and the two diagonals.
+    for shift in (1, rows + 1, rows, rows + 2):
+        pairs = mask & (mask >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def has_line(mask: int, rows: int = 6, k: int = 4) -> bool:
+    """
+    Checks a single player's mask for ``k`` in a row.
+
+    Each pass ANDs the mask with itself shifted along a direction, doubling the
+    length of the runs it marks until they reach ``k``.
+
+    Args:
+        mask (int): The player's bit mask.
+        rows (int): Number of rows on the board the mask belongs to.
+        k (int): Pieces in a row needed to win.
+
+    Returns:
+        bool: True if the mask contains ``k`` aligned pieces.
+    """
+    for shift in (1, rows + 1, rows, rows + 2):
+        runs, length = mask, 1
+        while runs and length < k:
+            step = min(length, k - length)
+            runs &= runs >> (step * shift)
+            length += step
+        if runs:
+            return True
+    return False
+
+
+_WEIGHTS_CACHE = {}
+_BOTTOM_CACHE = {}
+
+
+def _cell_weights(rows: int, cols: int) -> np.ndarray:
+    """
+    Returns a (rows, cols) array with the bit of each cell: uint64 if the board
+    ``fits_uint64``, else Python ints in an object array.
+    """
+    weights = _WEIGHTS_CACHE.get((rows, cols))
+    if weights is None:
+        weights = np.zeros((rows, cols), dtype=np.uint64 if fits_uint64(rows, cols) else object)
+        for c in range(cols):
+            for r in range(rows):
+                weights[r, c] = 1 << (c * (rows + 1) + rows - 1 - r)
+        _WEIGHTS_CACHE[(rows, cols)] = weights
+    return weights
+
+
+def _bottom_mask(rows: int, cols: int) -> int:
+    """Returns a mask with the bottom cell of every column set."""
+    mask = _BOTTOM_CACHE.get((rows, cols))
+    if mask is None:
+        mask = sum(1 << (c * (rows + 1)) for c in range(cols))
+        _BOTTOM_CACHE[(rows, cols)] = mask
+    return mask
@@ -1,5 +1,60 @@
 import numpy as np
-from connect4.constants import ROW_COUNT, COLUMN_COUNT
+from connect4.constants import ROW_COUNT, COLUMN_COUNT, CONNECT
+from connect4.utils.bitboard import Bitboard, board_keys, mirror_key
+from connect4.utils.lines import line_table
+
+def to_bitboard(board):
+    """Converts an ndarray board to a Bitboard position."""
+    return Bitboard.from_array(board)
+
+def from_bitboard(position):
+    """Converts a Bitboard position back to an ndarray board."""
+    return position.to_array()
+
+def canonical_board(board):
+    """
+    Returns the canonical orientation of a board and whether it was mirrored.
+
+    A board and its left-right reflection are equivalent; the canonical one is the
+    orientation with the smaller ``Bitboard`` key, so every module picks the same one.
+    A move ``col`` on the original board is ``cols - 1 - col`` on a mirrored one.
+    """
+    _, mirrored = Bitboard.from_array(board).canonical_key()
+    return (board[:, ::-1].copy() if mirrored else board), mirrored
+
+def canonical_boards(boards):
+    """
+    Vectorized ``canonical_board`` for a (N, rows, cols) stack.
+
+    Returns:
+        tuple: The canonical boards, their canonical keys and a bool array marking
+        the mirrored ones. The keys are uint64 if the board ``fits_uint64``, else
+        an object array of ints, as from ``board_keys``.
+    """
+    boards = np.asarray(boards)
+    rows, cols = boards.shape[1:]
+    keys = board_keys(boards)
+    mirrored_keys = mirror_key(keys, rows, cols)
+    mirrored = mirrored_keys < keys
+    canonical = np.where(mirrored[:, None, None], boards[:, :, ::-1], boards)
+    return canonical, np.minimum(keys, mirrored_keys), mirrored
+
+def deduplicate_boards(boards, labels=None):
+    """
+    Drops boards that repeat an earlier board or its mirror image.
+
+    Args:
+        boards (np.ndarray): Boards of shape (N, rows, cols).
+        labels (np.ndarray or None): Labels kept alongside the boards.
+
+    Returns:
+        tuple: The first occurrence of each position in canonical orientation, in
+        input order, and the matching labels (None if none were given).
+    """
+    canonical, keys, _ = canonical_boards(boards)
+    _, first = np.unique(keys, return_index=True)
+    first.sort()
+    return canonical[first], (labels[first] if labels is not None else None)
 
 def create_board():
     """Creates and returns an empty Connect 4 board."""
@@ -7,7 +62,7 @@ def create_board():
 
 def drop_piece(board, col, player):
     """Drops a player's piece into a column."""
-    for row in reversed(range(ROW_COUNT)):
+    for row in reversed(range(board.shape[0])):
         if board[row][col] == 0:
             board[row][col] = player
             return row
@@ -19,41 +74,46 @@ def valid_move(board, col):
 def switch_turn(turn):
     return 2 if turn == 1 else 1
 
-def check_win(board, player):
-    # Horizontal check
-    for r in range(ROW_COUNT):
-        for c in range(COLUMN_COUNT - 3):
-            if all(board[r][c + i] == player for i in range(4)):
-                return True
-
-    # Vertical check
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT):
-            if all(board[r + i][c] == player for i in range(4)):
-                return True
-
-    # Positive diagonal check
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT - 3):
-            if all(board[r + i][c + i] == player for i in range(4)):
-                return True
-
-    # Negative diagonal check
-    for r in range(3, ROW_COUNT):
-        for c in range(COLUMN_COUNT - 3):
-            if all(board[r - i][c + i] == player for i in range(4)):
-                return True
-
-    return False
+def check_win(board, player, k=CONNECT):
+    return line_table(*board.shape, k).has_line(board, player)
 
 def board_is_full(board):
-    return not any(board[0][c] == 0 for c in range(COLUMN_COUNT))
-
-def block_player_move(board, player):
-    for col in range(len(board[0])):
-        if valid_move(board, col):
-            temp_board = [row.copy() for row in board]
-            row = drop_piece(temp_board, col, player)
-            if check_win(temp_board, player):
-                return col
-    return -1
+    return not any(board[0][c] == 0 for c in range(board.shape[1]))
+
+def block_player_move(board, player, k=CONNECT):
+    """Returns the leftmost column where ``player`` would win next move, or -1."""
+    wins = winning_columns(board, k)[player]
+    return int(wins.argmax()) if wins.any() else -1
+
+def winning_columns(boards, k=CONNECT):
+    """
+    Finds, for both players, the columns whose next piece completes ``k`` in a row.
+
+    One vectorized pass with no board copies: count each player's pieces in every
+    line of ``lines.line_table``, then look up the lines through each column's
+    landing cell in its incidence table. A line through the (empty) landing cell
+    that already holds ``k - 1`` of a player's pieces is a win for that player there.
+
+    Args:
+        boards (np.ndarray): One (rows, cols) board or a (N, rows, cols) stack.
+        k (int): Pieces in a row needed to win.
+
+    Returns:
+        np.ndarray: Bool array of shape (3, cols), or (N, 3, cols) for a stack;
+        row ``p`` marks the winning columns of player ``p`` (row 0 is unused).
+    """
+    boards = np.asarray(boards)
+    single = boards.ndim == 2
+    if single:
+        boards = boards[np.newaxis]
+    n, rows, cols = boards.shape
+    table = line_table(rows, cols, k)
+    cells = boards.reshape(n, -1)[:, table.lines]
+    three = np.stack([(cells == player).sum(axis=2) == table.k - 1 for player in (1, 2)], axis=1)
+    heights = np.count_nonzero(boards, axis=1)
+    open_cols = heights < rows
+    landing = np.where(open_cols, (rows - 1 - heights) * cols + np.arange(cols), 0)
+    through = table.incidence[landing]
+    wins = np.zeros((n, 3, cols), dtype=bool)
+    wins[:, 1:] = (through[:, np.newaxis] & three[:, :, np.newaxis]).any(axis=3) & open_cols[:, np.newaxis]
+    return wins[0] if single else wins
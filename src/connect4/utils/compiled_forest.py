@@ -0,0 +1,312 @@
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+# On-disk layout: a directory holding ``header.json`` plus one ``.npy`` file per
+# array. Arrays are memory-mapped on load, so every process using the same model
+# directory shares one page-cached copy.
+FOREST_FORMAT = "connect4-compiled-forest"
+FOREST_VERSION = 1
+_ARRAYS = ("feature", "threshold", "left", "right", "leaf", "values", "roots")
+
+
+class CompiledForest:
+    """
+    A fitted random forest flattened into contiguous NumPy arrays.
+
+    All trees share one node array. Internal nodes send a sample to ``left`` when
+    ``x[feature] <= threshold`` and to ``right`` otherwise. Leaves point back at
+    themselves with an infinite threshold, so a batch of samples can be pushed
+    through every tree for ``max_depth`` steps without checking which of them have
+    already reached a leaf.
+
+    Attributes:
+        feature (np.ndarray): int16 feature index tested at each node.
+        threshold (np.ndarray): float64 split threshold of each node.
+        left (np.ndarray): int32 index of each node's left child.
+        right (np.ndarray): int32 index of each node's right child.
+        leaf (np.ndarray): int32 row of ``values`` for each node, -1 for internal nodes.
+        values (np.ndarray): float32 class probabilities of each leaf.
+        roots (np.ndarray): int32 index of the root node of each tree.
+        max_depth (int): Depth of the deepest tree.
+        classes_ (np.ndarray): Class label of each column of ``values``.
+        feature_names (List[str] or None): Names of the input features, if known.
+        source (dict or None): ``file_digest`` of the model file the forest was
+            compiled from, if known.
+        feature_layout (int or None): Version of the feature order the forest
+            expects, as defined by its user; None if unknown.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        leaf: np.ndarray,
+        values: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        classes: np.ndarray,
+        feature_names: Optional[List[str]] = None,
+        source: Optional[dict] = None,
+        feature_layout: Optional[int] = None
+    ) -> None:
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf = leaf
+        self.values = values
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.feature_names = feature_names
+        self.source = source
+        self.feature_layout = feature_layout
+
+    @classmethod
+    def from_estimator(cls, forest, label_encoder=None, feature_names=None) -> "CompiledForest":
+        """
+        Flattens a fitted ``RandomForestClassifier``.
+
+        Args:
+            forest: The fitted forest.
+            label_encoder: If given, ``classes_`` holds the decoded labels instead of
+                the encoded ones the forest was trained on.
+            feature_names (List[str] or None): Names of the input features.
+
+        Returns:
+            CompiledForest: Arrays giving the same ``predict_proba`` as ``forest``.
+        """
+        features, thresholds, lefts, rights, leaves, values, roots = [], [], [], [], [], [], []
+        offset = leaf_offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left < 0
+            nodes = np.arange(tree.node_count)
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+
+            leaf = np.full(tree.node_count, -1)
+            leaf[is_leaf] = np.arange(is_leaf.sum()) + leaf_offset
+            leaves.append(leaf)
+
+            # Older sklearn versions store class counts rather than fractions.
+            value = tree.value[is_leaf, 0, :]
+            values.append(value / value.sum(axis=1, keepdims=True))
+
+            roots.append(offset)
+            offset += tree.node_count
+            leaf_offset += int(is_leaf.sum())
+            max_depth = max(max_depth, tree.max_depth)
+
+        classes = forest.classes_
+        if label_encoder is not None:
+            classes = label_encoder.inverse_transform(classes.astype(int))
+        classes = np.asarray(classes)
+        if classes.dtype == object:
+            classes = classes.astype(str)
+        return cls(
+            np.concatenate(features).astype(np.int16),
+            np.concatenate(thresholds).astype(np.float64),
+            np.concatenate(lefts).astype(np.int32),
+            np.concatenate(rights).astype(np.int32),
+            np.concatenate(leaves).astype(np.int32),
+            np.concatenate(values).astype(np.float32),
+            np.array(roots, dtype=np.int32),
+            max_depth,
+            classes,
+            list(feature_names) if feature_names is not None else None
+        )
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by the node and leaf arrays.
+        """
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right,
+                                      self.leaf, self.values, self.roots))
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Returns the leaf each sample reaches in each tree.
+
+        Args:
+            X (np.ndarray): Samples of shape (N, n_features).
+
+        Returns:
+            np.ndarray: Node indices of shape (N, n_estimators).
+        """
+        X = np.asarray(X, dtype=np.float32)
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        rows = np.arange(len(X))[:, np.newaxis]
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Returns the mean class probabilities over all trees, like the forest's own
+        ``predict_proba``.
+        """
+        leaves = self.leaf[self.apply(X)]
+        return self.values[leaves].mean(axis=1)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Returns the most likely class of each sample.
+        """
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    def save(self, path: str) -> None:
+        """
+        Writes the forest to the directory ``path`` in the format read by ``load``.
+
+        The header is written last, so a directory without one is never loaded.
+        """
+        os.makedirs(path, exist_ok=True)
+        header_path = os.path.join(path, "header.json")
+        if os.path.exists(header_path):
+            os.remove(header_path)
+        arrays = {}
+        for name in _ARRAYS:
+            array = np.ascontiguousarray(getattr(self, name))
+            np.save(os.path.join(path, name + ".npy"), array)
+            arrays[name] = {"dtype": array.dtype.str, "shape": list(array.shape)}
+        header = {
+            "format": FOREST_FORMAT,
+            "version": FOREST_VERSION,
+            "n_estimators": self.n_estimators,
+            "max_depth": self.max_depth,
+            "classes": [c.item() for c in np.asarray(self.classes_)],
+            "feature_names": self.feature_names,
+            "source": self.source,
+            "feature_layout": self.feature_layout,
+            "arrays": arrays,
+        }
+        with open(header_path, "w") as file:
+            json.dump(header, file, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CompiledForest":
+        """
+        Reads a forest written by ``save``.
+
+        Args:
+            path (str): The model directory.
+            mmap (bool): Memory-map the arrays read-only instead of reading them.
+
+        Returns:
+            CompiledForest: The loaded forest.
+
+        Raises:
+            ValueError: If the directory holds another format or version, or an
+                array doesn't match the header.
+        """
+        with open(os.path.join(path, "header.json")) as file:
+            header = json.load(file)
+        if header.get("format") != FOREST_FORMAT or header.get("version") != FOREST_VERSION:
+            raise ValueError(f"{path} is not a version {FOREST_VERSION} compiled forest.")
+
+        arrays = {}
+        for name in _ARRAYS:
+            array = np.load(os.path.join(path, name + ".npy"), mmap_mode="r" if mmap else None,
+                            allow_pickle=False)
+            expected = header["arrays"][name]
+            if array.dtype.str != expected["dtype"] or list(array.shape) != expected["shape"]:
+                raise ValueError(f"{path}: {name}.npy does not match header.json.")
+            arrays[name] = array
+        return cls(
+            arrays["feature"], arrays["threshold"], arrays["left"], arrays["right"], arrays["leaf"],
+            arrays["values"], arrays["roots"], header["max_depth"], np.array(header["classes"]),
+            header.get("feature_names"), header.get("source"), header.get("feature_layout")
+        )
+
+    def reorder_features(self, new_index: np.ndarray) -> None:
+        """
+        Renumbers the input features: feature ``i`` becomes feature ``new_index[i]``.
+
+        Lets a forest trained on one feature order score samples in another.
+        """
+        new_index = np.asarray(new_index)
+        self.feature = np.where(self.leaf < 0, new_index[self.feature], 0).astype(np.int16)
+        if self.feature_names is not None:
+            names = [None] * len(self.feature_names)
+            for i, name in enumerate(self.feature_names):
+                names[new_index[i]] = name
+            self.feature_names = names
+
+    @staticmethod
+    def read_header(path: str) -> Optional[dict]:
+        """
+        Returns the header of the forest at ``path`` without loading its arrays.
+        None if there is no readable header.
+        """
+        try:
+            with open(os.path.join(path, "header.json")) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+
+def file_digest(path: str) -> dict:
+    """
+    Returns the size and SHA-256 of a file, to tell whether a compiled forest is
+    out of date. Unlike modification times, these survive a git checkout.
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            sha.update(chunk)
+    return {"size": os.path.getsize(path), "sha256": sha.hexdigest()}
+
+
+def compile_model(model_path: str, out_path: Optional[str] = None) -> CompiledForest:
+    """
+    Compiles the forest of a joblib model file saved by ``MLAgent``.
+
+    Args:
+        model_path (str): Path of the ``.pkl`` file with ``model`` and ``label_encoder``.
+        out_path (str or None): Where to save the compiled forest, if anywhere.
+
+    Returns:
+        CompiledForest: The compiled forest, with decoded class labels.
+    """
+    import joblib
+
+    loaded_data = joblib.load(model_path)
+    feature_names = loaded_data.get("feature_names")
+    compiled = CompiledForest.from_estimator(
+        loaded_data["model"], loaded_data["label_encoder"],
+        feature_names[:-1] if feature_names is not None else None
+    )
+    compiled.source = file_digest(model_path)
+    compiled.feature_layout = loaded_data.get("feature_layout")
+    if out_path is not None:
+        compiled.save(out_path)
+    return compiled
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the MLAgent forest into NumPy arrays.")
+    parser.add_argument("--model", default="models/ml_agent_model.pkl", help="joblib model file")
+    parser.add_argument("--out", default="models/ml_agent_model", help="output directory")
+    args = parser.parse_args()
+
+    forest = compile_model(args.model, args.out)
+    print(f"✅ Saved {forest.n_estimators} trees ({forest.nbytes / 1024:.0f} KiB) to {args.out}")
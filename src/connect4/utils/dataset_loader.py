@@ -1,5 +1,37 @@
 import os
 import csv
+from typing import Iterator, Tuple
+
+import numpy as np
+
+# Cell symbols of the UCI file. Anything else (e.g. a header row) is read as empty,
+# as the old DataFrame mapping did with ``fillna(0)``.
+CELL_VALUES = {'x': 1, 'o': 2, 'b': 0}
+
+# Byte value -> cell value, for parsing rows of single-character cells in bulk.
+_CELL_LOOKUP = np.zeros(256, dtype=np.int8)
+for _symbol, _value in CELL_VALUES.items():
+    _CELL_LOOKUP[ord(_symbol)] = _value
+
+# Bump when the cache layout changes so old caches are re-parsed.
+CACHE_VERSION = 1
+
+def to_game_boards(cells: np.ndarray, rows: int = 6, cols: int = 7) -> np.ndarray:
+    """
+    Reshapes UCI rows into game boards.
+
+    The UCI file lists each column bottom-up (a1..a6, b1..b6, ...), while game
+    boards are row-major with row 0 at the top.
+
+    Args:
+        cells (np.ndarray): (N, rows * cols) cells in UCI order.
+        rows (int): Number of rows on the board.
+        cols (int): Number of columns on the board.
+
+    Returns:
+        np.ndarray: The (N, rows, cols) boards.
+    """
+    return np.ascontiguousarray(np.asarray(cells).reshape(-1, cols, rows)[:, :, ::-1].transpose(0, 2, 1))
 
 class DatasetLoader:
     def __init__(self, data_path):
@@ -32,6 +64,100 @@ class DatasetLoader:
             print(f"❌ Error loading {file_name}: {e}")
         return data
 
+    def iter_chunks(self, file_name: str, chunk_size: int = 8192) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Parses a CSV of board cells plus a class column, ``chunk_size`` rows at a time.
+
+        Args:
+            file_name (str): The name of the CSV file to parse.
+            chunk_size (int): Rows per chunk.
+
+        Yields:
+            tuple: An int8 (n, cells) array with 0 = empty, 1 = x, 2 = o, and the
+            (n,) array of class labels.
+        """
+        file_path = os.path.join(self.data_path, file_name)
+        with open(file_path, mode='r') as file:
+            lines = []
+            for line in file:
+                line = line.strip()
+                if line:
+                    lines.append(line)
+                if len(lines) == chunk_size:
+                    yield self._parse_lines(lines)
+                    lines = []
+            if lines:
+                yield self._parse_lines(lines)
+
+    @staticmethod
+    def _parse_lines(lines) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parses CSV lines into an int8 cell array and a label array.
+        """
+        rows = [line.rsplit(',', 1) for line in lines]
+        cells = [row[0] for row in rows]
+        labels = np.array([row[-1] for row in rows])
+        width = len(cells[0])
+        if width % 2 and all(len(c) == width for c in cells) and all(c[1::2] == ',' * (width // 2) for c in cells):
+            # Every cell is one character: look the bytes up directly.
+            raw = np.frombuffer(''.join(c[::2] for c in cells).encode('latin-1', 'replace'), dtype=np.uint8)
+            return _CELL_LOOKUP[raw].reshape(len(cells), -1), labels
+        table = np.array([c.split(',') for c in cells])
+        values = np.zeros(table.shape, dtype=np.int8)
+        for symbol, value in CELL_VALUES.items():
+            if value:
+                values[table == symbol] = value
+        return values, labels
+
+    def load_arrays(self, file_name: str, chunk_size: int = 8192, use_cache: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Loads a CSV as compact arrays, using a binary cache next to the source.
+
+        The first call parses the CSV in chunks and writes ``<name>.npz`` beside it;
+        later calls load that file directly, as long as the CSV's size and
+        modification time haven't changed.
+
+        Args:
+            file_name (str): The name of the CSV file to load.
+            chunk_size (int): Rows parsed at a time.
+            use_cache (bool): Read and write the ``.npz`` cache.
+
+        Returns:
+            tuple: The int8 (N, cells) board array and the (N,) label array. Both are
+            empty if the file could not be read.
+        """
+        file_path = os.path.join(self.data_path, file_name)
+        cache_path = os.path.splitext(file_path)[0] + ".npz"
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            print(f"❌ Error: The file {file_name} was not found.")
+            return np.zeros((0, 0), dtype=np.int8), np.zeros(0, dtype=str)
+        source = np.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+        if use_cache and os.path.exists(cache_path):
+            try:
+                with np.load(cache_path, allow_pickle=False) as cached:
+                    if np.array_equal(cached["source"], source):
+                        print(f"✅ Loaded {file_name} from cache {os.path.basename(cache_path)}.")
+                        return cached["boards"], cached["labels"]
+            except (OSError, KeyError, ValueError) as e:
+                print(f"❌ Ignoring unreadable cache {cache_path}: {e}")
+
+        chunks = list(self.iter_chunks(file_name, chunk_size))
+        if not chunks:
+            return np.zeros((0, 0), dtype=np.int8), np.zeros(0, dtype=str)
+        boards = np.concatenate([c[0] for c in chunks])
+        labels = np.concatenate([c[1] for c in chunks])
+        print(f"✅ Parsed {len(boards)} rows from {file_name}.")
+
+        if use_cache:
+            try:
+                np.savez(cache_path, boards=boards, labels=labels, source=source)
+            except OSError as e:
+                print(f"❌ Could not write cache {cache_path}: {e}")
+        return boards, labels
+
     def load_attribute_names(self, file_name):
         """
         Loads attribute names from a .names file.
@@ -11,9 +11,11 @@ from collections import defaultdict
 from connect4.agents.minimax_agent import MinimaxAgent
 from connect4.agents.random_agent import RandomAgent
 from connect4.agents.smart_agent import SmartAgent
-from connect4.agents.ml_agent import MLAgent
+from connect4.agents.ml_agent import MLAgent, model_fits
 from connect4.game import Connect4Game
 from connect4.utils.game_state import GameState
+from connect4.utils.simulator import BatchSimulator
+from connect4.utils.tournament import Tournament
 
 
 class Evaluation:
@@ -26,49 +28,57 @@ class Evaluation:
         self.memory_usages = []
 
     def play_game(self, player1, player2):
+        # Both agents share one GameState for the whole game.
         self.game.reset()
-        current_player = 1
-        last_row = -1
-        last_col = -1
+        state = GameState(np.zeros((self.game.ROWS, self.game.COLS), dtype=int), 1, self.game.CONNECT)
+        for agent in (player1, player2):
+            agent.reset()
         move_count = 0
 
-        while not self.game.is_game_over():
-            board_copy = self.game.get_board_copy()
-            valid_moves = self.game.get_valid_moves()
-
-            if not valid_moves:
-                break  # No valid moves left, considered draw
-
-            if current_player == 1:
-                if isinstance(player1, MinimaxAgent):
-                    move = player1.get_move(GameState(board_copy, current_player))
-                else:
-                    move = player1.get_move(board_copy)
-            else:
-                if isinstance(player2, MinimaxAgent):
-                    move = player2.get_move(GameState(board_copy, current_player))
-                else:
-                    move = player2.get_move(board_copy)
-            
+        while not state.is_terminal_node():
+            current_player = state.current_player
+            valid_moves = state.get_valid_moves()
+            agent = player1 if current_player == 1 else player2
+            move = agent.get_move(state)
+
             if move not in valid_moves:
                 move = random.choice(valid_moves)
 
-            row = self.game.make_move(move)
-            last_row = row
-            last_col = move
-            current_player = 3 - current_player
+            self.game.make_move(move)
+            state.make_move(move, current_player)
+            player1.notify_move(state, move, current_player)
+            player2.notify_move(state, move, current_player)
             move_count += 1
 
         self.move_counts.append(move_count)
 
-        if self.game.check_winner(last_row, last_col):
-            winner_player = 3 - current_player
-            return 'player1' if winner_player == 1 else 'player2'
+        if state.winner:
+            return 'player1' if state.winner == 1 else 'player2'
         else:
             return 'draw'
 
 
-    def evaluate_agents(self, agent1, agent2):
+    def evaluate_agents(self, agent1, agent2, workers=1, seed=0, batch_size=None):
+        """
+        Plays ``num_games`` games with ``agent1`` moving first.
+
+        Args:
+            agent1: The agent playing as player 1.
+            agent2: The agent playing as player 2.
+            workers (int): With more than one, games are spread over a process pool
+                by ``Tournament``, each worker using its own copy of the agents.
+            seed (int): Tournament seed, used when ``workers`` > 1.
+            batch_size (int or None): If set, games are played headless by a
+                ``BatchSimulator``, ``batch_size`` at a time in lockstep.
+
+        Returns:
+            defaultdict: Counts of 'player1', 'player2' and 'draw'.
+        """
+        if batch_size:
+            return self._evaluate_batch(agent1, agent2, batch_size, seed)
+        if workers > 1:
+            return self._evaluate_parallel(agent1, agent2, workers, seed)
+
         start_time = time.time()
         bar_length = 30
         tracemalloc.start()
@@ -92,6 +102,33 @@ class Evaluation:
         print(f"\n✅ Evaluation Complete in {end_time - start_time:.2f} seconds!\n")
         return self.results
 
+    def _evaluate_parallel(self, agent1, agent2, workers, seed):
+        tournament = Tournament({"player1": agent1, "player2": agent2}, workers=workers, seed=seed,
+                                rows=self.game.ROWS, cols=self.game.COLS, k=self.game.CONNECT)
+        match = tournament.play_match("player1", "player2", self.num_games)
+        self.results['player1'] += match.wins['player1']
+        self.results['player2'] += match.wins['player2']
+        self.results['draw'] += match.draws
+        # Memory isn't traced in the worker processes, so none is reported.
+        self.move_counts.extend(match.move_counts)
+        return self.results
+
+    def _evaluate_batch(self, agent1, agent2, batch_size, seed):
+        start_time = time.time()
+        played = 0
+        while played < self.num_games:
+            count = min(batch_size, self.num_games - played)
+            simulator = BatchSimulator(count, self.game.ROWS, self.game.COLS, self.game.CONNECT)
+            winners, moves = simulator.run(agent1, agent2, seed=seed + played)
+            self.results['player1'] += int((winners == 1).sum())
+            self.results['player2'] += int((winners == 2).sum())
+            self.results['draw'] += int((winners == 0).sum())
+            self.move_counts.extend(moves.tolist())
+            played += count
+        elapsed = time.time() - start_time
+        print(f"✅ Evaluation Complete in {elapsed:.2f} seconds ({self.num_games / max(elapsed, 1e-9):.1f} games/s)!\n")
+        return self.results
+
     def print_evaluation_results(self):
         print("Evaluation Complete!")
         print(f"Total Games Played: {self.num_games}")
@@ -105,6 +142,8 @@ class Evaluation:
         if self.memory_usages:
             avg_memory = sum(self.memory_usages) / len(self.memory_usages)
             print(f"🖥️ Peak Memory Usage: {avg_memory:.2f} MB")
+        else:
+            print("🖥️ Peak Memory Usage: not measured")
 
     def save_results_graph(self, agent1_name, agent2_name, save_path):
         labels = ['Agent 1 Wins', 'Agent 2 Wins', 'Draws']
@@ -135,7 +174,7 @@ if __name__ == "__main__":
     agent2 = SmartAgent(player_id=2)
     print("Testing: RandomAgent vs SmartAgent")
     evaluation.results.clear()
-    evaluation.evaluate_agents(agent1, agent2)
+    evaluation.evaluate_agents(agent1, agent2, workers=os.cpu_count())
     evaluation.print_evaluation_results()
     evaluation.save_results_graph("RandomAgent", "SmartAgent", save_path="reports/Random_vs_Smart.png")
 
@@ -144,15 +183,16 @@ if __name__ == "__main__":
     agent2 = MinimaxAgent(player_id=2)
     print("\nTesting: SmartAgent vs MinimaxAgent")
     evaluation.results.clear()
-    evaluation.evaluate_agents(agent1, agent2)
+    evaluation.evaluate_agents(agent1, agent2, workers=os.cpu_count())
     evaluation.print_evaluation_results()
     evaluation.save_results_graph("SmartAgent", "MinimaxAgent", save_path="reports/Smart_vs_Minimax.png")
 
-    # Minimax vs ML
-    agent1 = MinimaxAgent(player_id=1)
-    agent2 = MLAgent(player_id=2, data_path="connect4_dataset/connect-4.data.csv", names_path="connect4_dataset/connect-4.names.txt")
-    print("\nTesting: MinimaxAgent vs MLAgent")
-    evaluation.results.clear()
-    evaluation.evaluate_agents(agent1, agent2)
-    evaluation.print_evaluation_results()
-    evaluation.save_results_graph("MinimaxAgent", "MLAgent", save_path="reports/Minimax_vs_ML.png")
+    # Minimax vs ML; the model only scores 6x7 boards
+    if model_fits(game.ROWS, game.COLS):
+        agent1 = MinimaxAgent(player_id=1)
+        agent2 = MLAgent(player_id=2, data_path="connect4_dataset/connect-4.data.csv", names_path="connect4_dataset/connect-4.names.txt")
+        print("\nTesting: MinimaxAgent vs MLAgent")
+        evaluation.results.clear()
+        evaluation.evaluate_agents(agent1, agent2, workers=os.cpu_count())
+        evaluation.print_evaluation_results()
+        evaluation.save_results_graph("MinimaxAgent", "MLAgent", save_path="reports/Minimax_vs_ML.png")
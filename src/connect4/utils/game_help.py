@@ -1,10 +1,11 @@
 import pygame
-from constants import WIDTH, HEIGHT, WHITE, BLACK, FONT
+import constants
+from constants import WIDTH, HEIGHT, WHITE, BLACK
 
 def display_message(message):
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     screen.fill(BLACK)
-    label = FONT.render(message, True, WHITE)
+    label = constants.FONT.render(message, True, WHITE)
     rect = label.get_rect(center=(WIDTH // 2, HEIGHT // 2))
     screen.blit(label, rect)
     pygame.display.update()
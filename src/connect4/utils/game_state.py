@@ -1,22 +1,62 @@
 import numpy as np
+from connect4.utils.bitboard import Bitboard
+from connect4.utils.heuristics import WindowEvaluator
+from connect4.utils.transposition_table import zobrist_table
 
 class GameState:
-    def __init__(self, board: np.ndarray, player_id: int): 
+    def __init__(self, board: np.ndarray, player_id: int, k: int = 4): 
         """
         Initializes the GameState with the current board state and the active player.
         
         Args:
             board (np.ndarray): The game board.
             player_id (int): The current player (1 or 2).
+            k (int): Pieces in a row needed to win.
         """
-        self.board = board.copy()
+        self.position = Bitboard.from_array(board, k)
         self.player_id = player_id
+        # One (col, player, winner) entry per move made since construction, so the
+        # game result after the last move is known without rescanning the board.
+        self.move_stack = []
+        self._initial_winner = self._find_winner()
+        self._zobrist = zobrist_table(self.position.rows, self.position.cols)
+        self._mirror_bits = _mirror_bits(self.position.rows, self.position.cols)
+        # Zobrist hashes of the position and of its mirror image; search caches key
+        # on the smaller one so both orientations share an entry.
+        self.hash = self._compute_hash()
+        self.mirror_hash = self._compute_hash(mirrored=True)
+        self.evaluator = WindowEvaluator(np.asarray(board), k)
+        self._board = None
+
+    @classmethod
+    def from_position(cls, position: Bitboard, player_id: int) -> "GameState":
+        """
+        Creates a GameState from a Bitboard position.
+
+        Args:
+            position (Bitboard): The position; it is not modified.
+            player_id (int): The player to move (1 or 2).
+        """
+        return cls(position.to_array(), player_id, position.k)
+
+    @property
+    def board(self) -> np.ndarray:
+        """
+        Returns the position as a read-only (rows, cols) ndarray for the GUI and
+        array-based agents. The array is built once per position, so agents sharing
+        this GameState don't each pay for a conversion.
+        """
+        if self._board is None:
+            board = self.position.to_array()
+            board.flags.writeable = False
+            self._board = board
+        return self._board
 
     def get_valid_moves(self):
         """
         Returns a list of columns where a move can still be made (i.e., not full).
         """
-        return [c for c in range(self.board.shape[1]) if self.board[0][c] == 0]
+        return self.position.get_valid_moves()
 
     def make_move(self, col, player): 
         """
@@ -26,10 +66,18 @@ class GameState:
             col (int): The column to drop the piece into.
             player (int): The ID of the player making the move.
         """
-        for row in reversed(range(self.board.shape[0])):
-            if self.board[row][col] == 0:
-                self.board[row][col] = player
-                break
+        if self.position.can_play(col):
+            self._board = None
+            bit = self.position.heights[col]
+            keys = self._zobrist[player]
+            self.hash ^= keys[bit]
+            self.mirror_hash ^= keys[self._mirror_bits[bit]]
+            self.evaluator.play(bit, player)
+            self.position.play(col, player)
+            winner = self.winner
+            if not winner and self.position.is_win(player):
+                winner = player
+            self.move_stack.append((col, player, winner))
 
     def undo_move(self, col): 
         """
@@ -38,10 +86,42 @@ class GameState:
         Args:
             col (int): The column to undo the move from.
         """
-        for row in range(self.board.shape[0]):
-            if self.board[row][col] != 0:
-                self.board[row][col] = 0
-                break
+        if self.position.column_height(col) > 0:
+            self._board = None
+            self.position.undo(col)
+            if self.move_stack and self.move_stack[-1][0] == col:
+                player = self.move_stack.pop()[1]
+                bit = self.position.heights[col]
+                keys = self._zobrist[player]
+                self.hash ^= keys[bit]
+                self.mirror_hash ^= keys[self._mirror_bits[bit]]
+                self.evaluator.undo(bit, player)
+            else:
+                # Undoing a piece that was not the last move invalidates the cache.
+                self.move_stack.clear()
+                self._initial_winner = self._find_winner()
+                self.hash = self._compute_hash()
+                self.mirror_hash = self._compute_hash(mirrored=True)
+                self.evaluator = WindowEvaluator(self.position.to_array(), self.position.k)
+
+    @property
+    def winner(self):
+        """
+        Returns the player who has k in a row after the last move, or 0 if nobody has.
+        """
+        if self.move_stack:
+            return self.move_stack[-1][2]
+        return self._initial_winner
+
+    @property
+    def current_player(self):
+        """
+        Returns the player to move: the opponent of the last mover, or ``player_id``
+        if no move has been made on this GameState.
+        """
+        if self.move_stack:
+            return 3 - self.move_stack[-1][1]
+        return self.player_id
 
     def is_terminal_node(self):
         """
@@ -50,28 +130,33 @@ class GameState:
         Returns:
             bool: True if game is over, False otherwise.
         """
-        return self.check_win(self.player_id) or self.check_win(3 - self.player_id) or all(self.board[0] != 0)
+        return self.winner != 0 or self.position.is_full()
 
     def evaluate(self, player_id): 
         """
         Evaluates the board from the perspective of a specific player.
+
+        Positions without a winner are scored by the incrementally updated
+        window heuristic (see ``heuristics.evaluate_board``), which stays far
+        below the win score.
         
         Args:
            player_id (int): The player to evaluate the board for.
 
         Returns:
-           int: +1000 for a win, -1000 for a loss, 0 otherwise.
+           int: +1000 for a win, -1000 for a loss, the heuristic score otherwise.
         """
-        if self.check_win(player_id):
+        winner = self.winner
+        if winner == player_id:
             return 1000
-        elif self.check_win(3 - player_id):
+        elif winner:
             return -1000
         else:
-            return 0
+            return self.evaluator.score(player_id)
 
     def check_win(self, player): 
         """
-        This checks if a player has four pieces in a row somewhere.
+        This checks if a player has k pieces in a row somewhere.
 
         Args:
             player (int): The player we are checking for (1 or 2).
@@ -79,27 +164,44 @@ class GameState:
         Returns:
             bool: True if the player won, False if not.
         """
-        # Check horizontal wins
-        for c in range(self.board.shape[1] - 3):
-            for r in range(self.board.shape[0]):
-                if all(self.board[r][c+i] == player for i in range(4)):
-                    return True
-                
-        # Check vertical wins
-        for c in range(self.board.shape[1]):
-            for r in range(self.board.shape[0] - 3):
-                if all(self.board[r+i][c] == player for i in range(4)):
-                    return True
-                
-         # Check positive diagonal wins (\ direction)
-        for c in range(self.board.shape[1] - 3):
-            for r in range(self.board.shape[0] - 3):
-                if all(self.board[r+i][c+i] == player for i in range(4)):
-                    return True
-                
-        # Check negative diagonal wins (/ direction)       
-        for c in range(self.board.shape[1] - 3):
-            for r in range(3, self.board.shape[0]):
-                if all(self.board[r-i][c+i] == player for i in range(4)):
-                    return True
-        return False
+        return self.position.is_win(player)
+
+    def _find_winner(self):
+        """
+        Scans the whole position for a winner. Only needed when the move stack is empty.
+        """
+        if self.position.is_win(1):
+            return 1
+        if self.position.is_win(2):
+            return 2
+        return 0
+
+    def _compute_hash(self, mirrored=False):
+        """
+        Computes the Zobrist hash of the position, or of its mirror image, from scratch.
+        """
+        value = 0
+        for player in (1, 2):
+            mask = self.position.masks[player]
+            keys = self._zobrist[player]
+            while mask:
+                low = mask & -mask
+                bit = low.bit_length() - 1
+                value ^= keys[self._mirror_bits[bit] if mirrored else bit]
+                mask ^= low
+        return value
+
+
+_MIRROR_BITS_CACHE = {}
+
+
+def _mirror_bits(rows, cols):
+    """
+    Maps each Bitboard bit index to the index of the same cell reflected left to right.
+    """
+    table = _MIRROR_BITS_CACHE.get((rows, cols))
+    if table is None:
+        h1 = rows + 1
+        table = [(cols - 1 - bit // h1) * h1 + bit % h1 for bit in range(h1 * cols)]
+        _MIRROR_BITS_CACHE[(rows, cols)] = table
+    return table
@@ -0,0 +1,173 @@
+import numpy as np
+
+from connect4.constants import CONNECT
+from connect4.utils.lines import line_table
+
+# Score of a four-cell window holding this many of a player's pieces and none of
+# the opponent's. Windows containing pieces of both players can never be won.
+# Other win lengths follow the same pattern (see ``window_weights``).
+WINDOW_WEIGHTS = (0, 1, 3, 9, 0)
+
+# Extra score for each piece in the centre column.
+CENTER_WEIGHT = 3
+
+_SCORE_TABLES = {}
+
+
+def window_weights(k: int = CONNECT) -> tuple:
+    """
+    Returns the score of a k-cell window by the number of one player's pieces in it.
+    """
+    if k == 4:
+        return WINDOW_WEIGHTS
+    return (0,) + tuple(3 ** (n - 1) for n in range(1, k)) + (0,)
+
+
+class _ScoreTable:
+    """
+    Window lookups of one board geometry, shared by every evaluator of that geometry.
+
+    Window codes pack both piece counts as ``count_1 * (k + 1) + count_2``.
+    """
+
+    def __init__(self, rows: int, cols: int, k: int) -> None:
+        table = line_table(rows, cols, k)
+        weights = window_weights(k)
+        size = (k + 1) * (k + 1)
+        self.windows = table.lines
+        self.bit_windows = table.bit_lines
+        self.base = k + 1
+        self.step = (0, k + 1, 1)
+        self.scores = ([0] * size, [0] * size, [0] * size)
+        for ones in range(k + 1):
+            for twos in range(k + 1 - ones):
+                code = ones * (k + 1) + twos
+                self.scores[1][code] = weights[ones] if twos == 0 else 0
+                self.scores[2][code] = weights[twos] if ones == 0 else 0
+        self.scores_np = np.array(self.scores, dtype=np.int64)
+
+    def codes(self, board: np.ndarray) -> np.ndarray:
+        """Returns the code of every window of ``board``."""
+        cells = board.ravel()[self.windows]
+        return (cells == 1).sum(axis=1) * self.base + (cells == 2).sum(axis=1)
+
+    def totals(self, board: np.ndarray, codes: np.ndarray) -> list:
+        """Returns each player's score, indexed by player id, from the window codes."""
+        center = board[:, board.shape[1] // 2]
+        return [
+            0,
+            int(self.scores_np[1][codes].sum()) + CENTER_WEIGHT * int((center == 1).sum()),
+            int(self.scores_np[2][codes].sum()) + CENTER_WEIGHT * int((center == 2).sum()),
+        ]
+
+
+def _score_table(rows: int, cols: int, k: int) -> _ScoreTable:
+    """Returns the cached ``_ScoreTable`` of a board geometry."""
+    table = _SCORE_TABLES.get((rows, cols, k))
+    if table is None:
+        table = _SCORE_TABLES[(rows, cols, k)] = _ScoreTable(rows, cols, k)
+    return table
+
+
+def evaluate_board(board: np.ndarray, player_id: int, k: int = CONNECT) -> int:
+    """
+    Scores a non-terminal board for ``player_id`` in one vectorized pass.
+
+    Every k-cell window that only one player occupies is worth
+    ``window_weights(k)[pieces]`` to that player, and each centre piece adds
+    ``CENTER_WEIGHT``. The result is the player's total minus the opponent's.
+
+    Args:
+        board (np.ndarray): A (rows, cols) board with 0, 1 and 2.
+        player_id (int): The player to score for.
+        k (int): Pieces in a row needed to win.
+
+    Returns:
+        int: Positive if ``player_id`` stands better.
+    """
+    table = _score_table(*board.shape, k)
+    totals = table.totals(board, table.codes(board))
+    score = totals[1] - totals[2]
+    return score if player_id == 1 else -score
+
+
+class WindowEvaluator:
+    """
+    Keeps the ``evaluate_board`` score up to date as pieces are added and removed.
+
+    Each window's piece counts are stored as one code, and a move only touches the
+    windows through the played cell (at most 16 on a 6x7 board), so scoring a leaf
+    is O(1).
+
+    Attributes:
+        codes (list): Packed piece counts of each window.
+        totals (list): Score of each player, indexed by player id.
+    """
+
+    def __init__(self, board: np.ndarray, k: int = CONNECT) -> None:
+        """
+        Builds the window codes for a board.
+
+        Args:
+            board (np.ndarray): A (rows, cols) board with 0, 1 and 2.
+            k (int): Pieces in a row needed to win.
+        """
+        rows, cols = board.shape
+        table = _score_table(rows, cols, k)
+        codes = table.codes(board)
+        self.codes = codes.tolist()
+        self.totals = table.totals(board, codes)
+        self._bit_windows = table.bit_windows
+        self._scores = table.scores
+        self._step = table.step
+        self._center_bits = range((cols // 2) * (rows + 1), (cols // 2) * (rows + 1) + rows)
+
+    def play(self, bit: int, player: int) -> None:
+        """
+        Adds a piece for ``player`` on the cell with Bitboard index ``bit``.
+        """
+        step = self._step[player]
+        codes = self.codes
+        scores_1, scores_2 = self._scores[1], self._scores[2]
+        total_1, total_2 = self.totals[1], self.totals[2]
+        for w in self._bit_windows[bit]:
+            old = codes[w]
+            new = old + step
+            codes[w] = new
+            total_1 += scores_1[new] - scores_1[old]
+            total_2 += scores_2[new] - scores_2[old]
+        if bit in self._center_bits:
+            if player == 1:
+                total_1 += CENTER_WEIGHT
+            else:
+                total_2 += CENTER_WEIGHT
+        self.totals[1] = total_1
+        self.totals[2] = total_2
+
+    def undo(self, bit: int, player: int) -> None:
+        """
+        Removes ``player``'s piece from the cell with Bitboard index ``bit``.
+        """
+        step = self._step[player]
+        codes = self.codes
+        scores_1, scores_2 = self._scores[1], self._scores[2]
+        total_1, total_2 = self.totals[1], self.totals[2]
+        for w in self._bit_windows[bit]:
+            old = codes[w]
+            new = old - step
+            codes[w] = new
+            total_1 += scores_1[new] - scores_1[old]
+            total_2 += scores_2[new] - scores_2[old]
+        if bit in self._center_bits:
+            if player == 1:
+                total_1 -= CENTER_WEIGHT
+            else:
+                total_2 -= CENTER_WEIGHT
+        self.totals[1] = total_1
+        self.totals[2] = total_2
+
+    def score(self, player_id: int) -> int:
+        """
+        Returns the current score for ``player_id``, as ``evaluate_board`` would.
+        """
+        return self.totals[player_id] - self.totals[3 - player_id]
@@ -0,0 +1,101 @@
+import numpy as np
+
+from connect4.constants import ROW_COUNT, COLUMN_COUNT, CONNECT
+
+# Horizontal, vertical, and the two diagonals, as (row step, column step).
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (-1, 1))
+
+_TABLES = {}
+
+
+class LineTable:
+    """
+    Every winning line of a board, with the lookups the win checks need.
+
+    A line is ``k`` cells in a row horizontally, vertically or diagonally. Cells
+    are numbered two ways. The ndarray flat index is ``row * cols + col``, with
+    row 0 at the top. The Bitboard bit index is ``col * (rows + 1) + rows - 1 - row``.
+    Build tables with ``line_table``, which caches one per geometry.
+
+    Attributes:
+        rows (int): Number of rows on the board.
+        cols (int): Number of columns on the board.
+        k (int): Pieces in a row needed to win.
+        lines (np.ndarray): (lines, k) flat indices of each line's cells.
+        line_bits (list): Bitboard bit indices of each line's cells.
+        cell_lines (list): Indices of the lines through each flat cell.
+        bit_lines (list): Indices of the lines through each Bitboard bit; sentinel
+            bits have none.
+        cell_windows (np.ndarray): (rows * cols, most lines through a cell, k) flat
+            indices of the lines through each cell, padded by repeating its first line.
+        incidence (np.ndarray): (rows * cols, lines) bool table of which cells each
+            line covers.
+    """
+
+    def __init__(self, rows: int, cols: int, k: int = CONNECT) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        flat, bits = [], []
+        for r in range(rows):
+            for c in range(cols):
+                for dr, dc in _DIRECTIONS:
+                    end_r, end_c = r + (k - 1) * dr, c + (k - 1) * dc
+                    if 0 <= end_r < rows and 0 <= end_c < cols:
+                        cells = [(r + i * dr, c + i * dc) for i in range(k)]
+                        flat.append([cr * cols + cc for cr, cc in cells])
+                        bits.append([cc * (rows + 1) + rows - 1 - cr for cr, cc in cells])
+        if not flat:
+            raise ValueError(f"A {rows}x{cols} board has no line of {k}.")
+        self.lines = np.array(flat, dtype=np.intp).reshape(-1, k)
+        self.line_bits = bits
+
+        self.cell_lines = [[] for _ in range(rows * cols)]
+        self.bit_lines = [[] for _ in range((rows + 1) * cols)]
+        for index, (cells, cell_bits) in enumerate(zip(flat, bits)):
+            for cell, bit in zip(cells, cell_bits):
+                self.cell_lines[cell].append(index)
+                self.bit_lines[bit].append(index)
+        self.cell_lines = [tuple(ls) for ls in self.cell_lines]
+        self.bit_lines = [tuple(ls) for ls in self.bit_lines]
+
+        # With a line of k somewhere, every cell lies on at least one line.
+        width = max(len(ls) for ls in self.cell_lines)
+        self.cell_windows = np.zeros((rows * cols, width, k), dtype=np.intp)
+        for cell, ls in enumerate(self.cell_lines):
+            self.cell_windows[cell] = self.lines[list(ls) + [ls[0]] * (width - len(ls))]
+        self.incidence = np.zeros((rows * cols, len(flat)), dtype=bool)
+        self.incidence[self.lines, np.arange(len(flat))[:, None]] = True
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def has_line(self, board: np.ndarray, player: int) -> bool:
+        """
+        Returns True if ``player`` fills any line of ``board``.
+        """
+        return bool((np.asarray(board).ravel()[self.lines] == player).all(axis=1).any())
+
+    def wins_through(self, board: np.ndarray, row: int, col: int) -> bool:
+        """
+        Returns True if the piece at (row, col) is part of a filled line.
+        """
+        board = np.asarray(board)
+        piece = board[row, col]
+        if not piece:
+            return False
+        return bool((board.ravel()[self.cell_windows[row * self.cols + col]] == piece).all(axis=1).any())
+
+
+def line_table(rows: int = ROW_COUNT, cols: int = COLUMN_COUNT, k: int = CONNECT) -> LineTable:
+    """
+    Returns the cached ``LineTable`` of a board geometry.
+    """
+    table = _TABLES.get((rows, cols, k))
+    if table is None:
+        table = _TABLES[(rows, cols, k)] = LineTable(rows, cols, k)
+    return table
+
+
+# Table of the standard board, built once at import.
+LINES = line_table()
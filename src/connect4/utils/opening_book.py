@@ -0,0 +1,171 @@
+import os
+import struct
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+from connect4.utils.bitboard import fits_uint64, mirror_key
+from connect4.utils.solver import Solver
+
+# File layout: a 16-byte header, then ``count`` sorted uint64 position keys, then
+# ``count`` int8 scores for the player to move in each position. A position and its
+# mirror image have the same score, so only the smaller of their two keys is stored.
+# Version 2 adds the win length to the header; version 1 books are connect-4 books.
+BOOK_MAGIC = b"C4BK"
+BOOK_VERSION = 2
+_HEADER = struct.Struct("<4sHBBBBxxI")
+
+
+class OpeningBook:
+    """
+    Exact scores of early positions, stored as sorted arrays for binary search.
+
+    Keys are the solver's position keys (``current + mask``), so a lookup costs one
+    ``np.searchsorted`` over the memory-mapped key array. Only canonical keys are
+    stored; ``get`` reflects the key it is given when needed.
+
+    Attributes:
+        rows (int): Number of rows of the board the book was built for.
+        cols (int): Number of columns of the board the book was built for.
+        max_ply (int): Deepest ply stored in the book.
+        k (int): Pieces in a row needed to win in the book's game.
+        keys (np.ndarray): Sorted uint64 position keys.
+        scores (np.ndarray): int8 score of each key for the player to move.
+    """
+
+    def __init__(self, rows: int, cols: int, max_ply: int, keys: np.ndarray, scores: np.ndarray,
+                 k: int = 4) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.max_ply = max_ply
+        self.k = k
+        self.keys = keys
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def get(self, key: int) -> Optional[int]:
+        """
+        Returns the stored score of a position, or None if it is not in the book.
+        """
+        if not len(self.keys):
+            return None
+        key = min(key, mirror_key(key, self.rows, self.cols))
+        index = int(np.searchsorted(self.keys, np.uint64(key)))
+        if index < len(self.keys) and int(self.keys[index]) == key:
+            return int(self.scores[index])
+        return None
+
+    @classmethod
+    def load(cls, path: str) -> "OpeningBook":
+        """
+        Memory-maps a book file written by ``save``.
+
+        Args:
+            path (str): Path of the book file.
+
+        Returns:
+            OpeningBook: The loaded book.
+        """
+        with open(path, "rb") as file:
+            magic, version, rows, cols, max_ply, k, count = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != BOOK_MAGIC or version not in (1, BOOK_VERSION):
+            raise ValueError(f"{path} is not a version {BOOK_VERSION} opening book.")
+        k = k or 4  # Version 1 left the byte as padding.
+        if count == 0:
+            return cls(rows, cols, max_ply, np.zeros(0, dtype="<u8"), np.zeros(0, dtype=np.int8), k)
+        keys = np.memmap(path, dtype="<u8", mode="r", offset=_HEADER.size, shape=(count,))
+        scores = np.memmap(path, dtype=np.int8, mode="r", offset=_HEADER.size + 8 * count, shape=(count,))
+        return cls(rows, cols, max_ply, keys, scores, k)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the book in the binary format read by ``load``.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        order = np.argsort(self.keys)
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, self.rows, self.cols, self.max_ply, self.k,
+                                    len(self.keys)))
+            file.write(np.asarray(self.keys, dtype="<u8")[order].tobytes())
+            file.write(np.asarray(self.scores, dtype=np.int8)[order].tobytes())
+
+    @classmethod
+    def build(cls, max_ply: int, solver: Optional[Solver] = None, verbose: bool = True) -> "OpeningBook":
+        """
+        Solves every reachable, undecided position with up to ``max_ply`` pieces.
+
+        This runs for hours at 8+ plies and is meant for build hosts.
+
+        Args:
+            max_ply (int): Deepest ply to include.
+            solver (Solver or None): Solver to use, which sets the board geometry;
+                a 6x7 connect-4 one is created if omitted.
+            verbose (bool): Print progress while solving.
+
+        Returns:
+            OpeningBook: The new book.
+
+        Raises:
+            ValueError: If the solver's position keys don't fit in the uint64 key array.
+        """
+        solver = solver or Solver()
+        if not fits_uint64(solver.rows, solver.cols):
+            raise ValueError(f"Opening books need (rows + 1) * cols <= 64, not a {solver.rows}x{solver.cols} board.")
+        def canonical(current, mask):
+            key = current + mask
+            return min(key, mirror_key(key, solver.rows, solver.cols))
+
+        positions = {}
+        frontier = {0: (0, 0)}
+        for ply in range(max_ply + 1):
+            for key, (current, mask) in frontier.items():
+                positions[key] = (current, mask, ply)
+            if ply == max_ply:
+                break
+            # Children are keyed canonically, so mirror images are expanded once.
+            children = {}
+            for current, mask in frontier.values():
+                if solver.can_win_next(current, mask):
+                    continue
+                possible = solver.possible(mask)
+                for col in range(solver.cols):
+                    move = possible & solver.column_masks[col]
+                    if move:
+                        child = (current ^ mask, mask | move)
+                        children.setdefault(canonical(*child), child)
+            frontier = children
+
+        keys = np.zeros(len(positions), dtype=np.uint64)
+        scores = np.zeros(len(positions), dtype=np.int8)
+        start = time.time()
+        for i, (key, (current, mask, moves)) in enumerate(positions.items()):
+            keys[i] = key
+            scores[i] = solver.solve(current, mask, moves)
+            if verbose and ((i + 1) % 100 == 0 or i + 1 == len(positions)):
+                sys.stdout.write(f"\rSolved {i + 1}/{len(positions)} positions in {time.time() - start:.0f}s")
+                sys.stdout.flush()
+        if verbose:
+            print()
+        return cls(solver.rows, solver.cols, max_ply, keys, scores, solver.k)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the SolverAgent opening book.")
+    parser.add_argument("--plies", type=int, default=8, help="deepest ply to store")
+    parser.add_argument("--out", default="models/opening_book.bin", help="output file")
+    parser.add_argument("--rows", type=int, default=6, help="rows of the board")
+    parser.add_argument("--cols", type=int, default=7, help="columns of the board")
+    parser.add_argument("--connect", type=int, default=4, help="pieces in a row needed to win")
+    args = parser.parse_args()
+
+    book = OpeningBook.build(args.plies, Solver(args.rows, args.cols, k=args.connect))
+    book.save(args.out)
+    print(f"✅ Saved {len(book)} positions to {args.out}")
@@ -0,0 +1,335 @@
+import os
+import random
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, List, Optional, Set
+
+import numpy as np
+
+from connect4.utils.game_state import GameState
+
+# Shard layout: a 16-byte header, then fixed-size records appended one after another.
+# Version 2 stores positions in canonical (mirror-reduced) orientation; version 3
+# adds the win length to the header (version 2 shards are connect-4 shards).
+SHARD_MAGIC = b"C4SP"
+SHARD_VERSION = 3
+_HEADER = struct.Struct("<4sHBBBB6x")
+
+# How a record's label was produced.
+LABEL_OUTCOME = 0  # Result of the self-play game for the player to move: 1, 0 or -1.
+LABEL_SOLVER = 1   # Exact solver score for the player to move.
+LABELERS = {"outcome": LABEL_OUTCOME, "solver": LABEL_SOLVER}
+
+
+def record_dtype(rows: int = 6, cols: int = 7) -> np.dtype:
+    """
+    Returns the dtype of one shard record.
+
+    ``key`` is the position's ``Bitboard.canonical_key()``, ``cells`` the board in
+    that canonical orientation flattened row by row (0 = empty, 1 and 2 = players),
+    ``ply`` the number of pieces and ``to_move`` the player to move. Keys of boards
+    that don't fit in 64 bits are stored as little-endian uint64 limbs.
+    """
+    limbs = _key_limbs(rows, cols)
+    return np.dtype([
+        ("key", "<u8") if limbs == 1 else ("key", "<u8", (limbs,)),
+        ("cells", "i1", (rows * cols,)),
+        ("ply", "u1"),
+        ("to_move", "u1"),
+        ("label", "i1"),
+    ])
+
+
+def play_games(seeds: List[int], depth: int = 4, random_plies: int = 6, epsilon: float = 0.05,
+               labeler: str = "outcome", solver_time: float = 1.0,
+               rows: int = 6, cols: int = 7, k: int = 4) -> np.ndarray:
+    """
+    Plays one self-play game per seed and returns every non-terminal position.
+
+    Each game opens with up to ``random_plies`` random moves, then both sides play
+    ``MinimaxAgent`` moves, with an ``epsilon`` chance of a random move instead, so
+    different seeds give different games.
+
+    Args:
+        seeds (List[int]): One random seed per game.
+        depth (int): Search depth of the self-play agent.
+        random_plies (int): Most random opening moves per game.
+        epsilon (float): Chance of a random move after the opening.
+        labeler (str): "outcome" labels positions with the game result for the
+            player to move; "solver" with the exact solver score, dropping positions
+            that can't be solved within ``solver_time`` seconds.
+        solver_time (float): Seconds allowed per solved position.
+        rows (int): Number of rows on the board.
+        cols (int): Number of columns on the board.
+        k (int): Pieces in a row needed to win.
+
+    Returns:
+        np.ndarray: Records with ``record_dtype(rows, cols)``; positions repeated
+        within the batch, or mirror images of earlier ones, are kept once.
+    """
+    from connect4.agents.minimax_agent import MinimaxAgent
+    from connect4.utils.solver import Solver, SolverTimeout
+
+    dtype = record_dtype(rows, cols)
+    limbs = _key_limbs(rows, cols)
+    agents = {player: MinimaxAgent(player_id=player, max_depth=depth) for player in (1, 2)}
+    solver = Solver(rows, cols, k=k) if labeler == "solver" else None
+    records = []
+    seen = set()
+
+    for seed in seeds:
+        rng = random.Random(seed)
+        for agent in agents.values():
+            agent.reset()
+        game = GameState(np.zeros((rows, cols), dtype=int), 1, k)
+        opening = rng.randint(0, random_plies)
+        positions = []
+
+        while not game.is_terminal_node():
+            player = game.current_player
+            position = game.position
+            key, mirrored = position.canonical_key()
+            if key not in seen:
+                seen.add(key)
+                cells = position.to_array(np.int8)
+                if mirrored:
+                    cells = cells[:, ::-1]
+                positions.append((key, cells.ravel(), position.move_count, player))
+            if position.move_count < opening or rng.random() < epsilon:
+                col = rng.choice(game.get_valid_moves())
+            else:
+                col = agents[player].get_move(game)
+            game.make_move(col, player)
+
+        winner = game.winner
+        for key, cells, ply, player in positions:
+            if solver is None:
+                label = 0 if winner == 0 else (1 if winner == player else -1)
+            else:
+                try:
+                    label = solver.solve_board(cells.reshape(rows, cols), player, solver_time)
+                except SolverTimeout:
+                    continue
+            records.append((key if limbs == 1 else _split_key(key, limbs), cells, ply, player, label))
+
+    return np.array(records, dtype=dtype)
+
+
+class ShardWriter:
+    """
+    Appends deduplicated records to a directory of binary shards.
+
+    Each record goes to shard ``key % shards``, so a position always lands in the
+    same file. Shards are only ever appended to; keys already present in the
+    directory are read back on open and never written again.
+
+    Attributes:
+        directory (str): Directory holding ``shard-XXX.bin`` files.
+        shards (int): Number of shard files.
+        labeler (str): Labeler name stored in every shard header.
+        seen (Set[int]): Position keys already written.
+        written (int): Records written since the writer was created.
+    """
+
+    def __init__(self, directory: str, shards: int = 16, labeler: str = "outcome",
+                 rows: int = 6, cols: int = 7, k: int = 4) -> None:
+        self.directory = directory
+        self.shards = shards
+        self.labeler = labeler
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.dtype = record_dtype(rows, cols)
+        os.makedirs(directory, exist_ok=True)
+        self.seen: Set[int] = set()
+        for path in shard_paths(directory):
+            if _read_header(path)[4] != LABELERS[labeler]:
+                raise ValueError(f"{path} holds labels from another labeler than {labeler!r}.")
+            # Drop a record cut short by an interrupted run before appending after it.
+            tail = (os.path.getsize(path) - _HEADER.size) % self.dtype.itemsize
+            if tail:
+                os.truncate(path, os.path.getsize(path) - tail)
+            self.seen.update(_keys_of(read_shard(path, rows, cols, k)))
+        self.written = 0
+
+    def shard_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"shard-{index:03d}.bin")
+
+    def write(self, records: np.ndarray) -> int:
+        """
+        Appends the records whose keys haven't been seen yet.
+
+        Returns:
+            int: Number of records written.
+        """
+        keys = _keys_of(records)
+        fresh = []
+        for i, key in enumerate(keys):
+            if key not in self.seen:
+                self.seen.add(key)
+                fresh.append(i)
+        if not fresh:
+            return 0
+        records = records[fresh]
+        shard = np.array([keys[i] % self.shards for i in fresh], dtype=np.intp)
+        for index in np.unique(shard).tolist():
+            path = self.shard_path(index)
+            is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+            with open(path, "ab") as file:
+                if is_new:
+                    file.write(_HEADER.pack(SHARD_MAGIC, SHARD_VERSION, self.rows, self.cols,
+                                            LABELERS[self.labeler], self.k))
+                file.write(records[shard == index].tobytes())
+        self.written += len(records)
+        return len(records)
+
+
+def _read_header(path: str):
+    with open(path, "rb") as file:
+        magic, version, rows, cols, labeler, k = _HEADER.unpack(file.read(_HEADER.size))
+    # Version 2 left the win length byte as padding.
+    return magic, version, rows, cols, labeler, k or 4
+
+
+def _key_limbs(rows: int, cols: int) -> int:
+    """Returns the number of uint64 limbs a position key needs."""
+    return max(1, -(-(rows + 1) * cols // 64))
+
+
+def _split_key(key: int, limbs: int) -> List[int]:
+    """Splits a position key into little-endian uint64 limbs."""
+    return [(key >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(limbs)]
+
+
+def _keys_of(records: np.ndarray) -> List[int]:
+    """Returns the position keys of ``records`` as Python ints."""
+    keys = records["key"]
+    if keys.ndim == 1:
+        return keys.tolist()
+    return [sum(limb << (64 * i) for i, limb in enumerate(row)) for row in keys.tolist()]
+
+
+def shard_paths(directory: str) -> List[str]:
+    """
+    Returns the shard files in ``directory``, sorted by name.
+    """
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.startswith("shard-") and name.endswith(".bin")]
+
+
+def read_shard(path: str, rows: int = 6, cols: int = 7, k: int = 4) -> np.ndarray:
+    """
+    Memory-maps the records of one shard file.
+
+    Raises:
+        ValueError: If the file is not a shard for a ``rows`` x ``cols`` connect-``k`` board.
+    """
+    magic, version, shard_rows, shard_cols, _, shard_k = _read_header(path)
+    if (magic != SHARD_MAGIC or version not in (2, SHARD_VERSION)
+            or (shard_rows, shard_cols, shard_k) != (rows, cols, k)):
+        raise ValueError(f"{path} is not a version {SHARD_VERSION} shard for a {rows}x{cols} "
+                         f"connect-{k} board.")
+    dtype = record_dtype(rows, cols)
+    # A record cut short by an interrupted write is ignored.
+    count = (os.path.getsize(path) - _HEADER.size) // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=_HEADER.size, shape=(count,))
+
+
+def iter_shards(directory: str, rows: int = 6, cols: int = 7, k: int = 4) -> Iterable[np.ndarray]:
+    """
+    Yields the records of every shard in ``directory``.
+    """
+    for path in shard_paths(directory):
+        yield read_shard(path, rows, cols, k)
+
+
+def load_dataset(directory: str, rows: int = 6, cols: int = 7, k: int = 4):
+    """
+    Loads all shards as training arrays.
+
+    Returns:
+        tuple: The int8 (N, rows * cols) cells, each a row-major game board with
+        row 0 at the top, and the int8 (N,) labels.
+    """
+    parts = list(iter_shards(directory, rows, cols, k))
+    if not parts:
+        return np.zeros((0, rows * cols), dtype=np.int8), np.zeros(0, dtype=np.int8)
+    records = np.concatenate(parts)
+    return np.ascontiguousarray(records["cells"]), np.ascontiguousarray(records["label"])
+
+
+def generate(out_dir: str, games: int, workers: int = 1, batch: int = 8, seed: Optional[int] = None,
+             shards: int = 16, verbose: bool = True, **play_kwargs) -> int:
+    """
+    Runs self-play games across a process pool and appends the positions to shards.
+
+    Workers only play and label games; the parent process deduplicates and writes,
+    so the shards have a single writer.
+
+    Args:
+        out_dir (str): Shard directory.
+        games (int): Number of games to play.
+        workers (int): Worker processes.
+        batch (int): Games per task.
+        seed (int or None): Seed of the first game; random if omitted.
+        shards (int): Number of shard files.
+        verbose (bool): Print progress.
+        **play_kwargs: Passed on to ``play_games``.
+
+    Returns:
+        int: Number of new positions written.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(1 << 32)
+    writer = ShardWriter(out_dir, shards, play_kwargs.get("labeler", "outcome"),
+                         play_kwargs.get("rows", 6), play_kwargs.get("cols", 7), play_kwargs.get("k", 4))
+    tasks = [list(range(seed + i, seed + min(i + batch, games))) for i in range(0, games, batch)]
+    start = time.time()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_games, seeds, **play_kwargs) for seeds in tasks]
+        for future in as_completed(futures):
+            writer.write(future.result())
+            done += 1
+            if verbose:
+                elapsed = time.time() - start
+                sys.stdout.write(f"\r{done}/{len(tasks)} batches, {writer.written} new positions, "
+                                 f"{writer.written / max(elapsed, 1e-9):.0f} positions/s")
+                sys.stdout.flush()
+    if verbose:
+        print()
+    return writer.written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate MLAgent training positions by self-play.")
+    parser.add_argument("--games", type=int, default=1000, help="games to play")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--batch", type=int, default=8, help="games per worker task")
+    parser.add_argument("--depth", type=int, default=4, help="MinimaxAgent search depth")
+    parser.add_argument("--random-plies", type=int, default=6, help="most random opening moves")
+    parser.add_argument("--epsilon", type=float, default=0.05, help="chance of a random move")
+    parser.add_argument("--labeler", choices=sorted(LABELERS), default="outcome", help="how to label positions")
+    parser.add_argument("--solver-time", type=float, default=1.0, help="seconds per solved position")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first game")
+    parser.add_argument("--shards", type=int, default=16, help="number of shard files")
+    parser.add_argument("--out", default="selfplay_dataset", help="shard directory")
+    parser.add_argument("--rows", type=int, default=6, help="rows of the board")
+    parser.add_argument("--cols", type=int, default=7, help="columns of the board")
+    parser.add_argument("--connect", type=int, default=4, help="pieces in a row needed to win")
+    args = parser.parse_args()
+
+    written = generate(
+        args.out, args.games, workers=args.workers, batch=args.batch, seed=args.seed, shards=args.shards,
+        depth=args.depth, random_plies=args.random_plies, epsilon=args.epsilon,
+        labeler=args.labeler, solver_time=args.solver_time, rows=args.rows, cols=args.cols, k=args.connect
+    )
+    print(f"✅ Wrote {written} new positions to {args.out}")
@@ -0,0 +1,110 @@
+import random
+from typing import Optional, Tuple
+
+import numpy as np
+
+from connect4.utils.lines import line_table
+
+
+class BatchSimulator:
+    """
+    Plays many headless games in lockstep on one shared board array.
+
+    All games start together, so at every step the same player is to move in each
+    unfinished game. Agents get read-only views of the shared ``(num_games, rows,
+    cols)`` int8 array instead of copies; an agent with a ``get_moves(boards)``
+    method is asked once per step for all unfinished games together. Pieces are
+    dropped using a per-game column height array, and each move's k-in-a-row
+    check only looks at the windows through the new piece, for all games at once.
+
+    Attributes:
+        num_games (int): Games played per ``run``.
+        rows (int): Number of rows on the board.
+        cols (int): Number of columns on the board.
+        k (int): Pieces in a row needed to win.
+        boards (np.ndarray): The shared int8 boards of the current run.
+        winners (np.ndarray): Winner of each game (0 for a draw or unfinished game).
+        move_counts (np.ndarray): Moves played in each game.
+    """
+
+    def __init__(self, num_games: int, rows: int = 6, cols: int = 7, k: int = 4) -> None:
+        self.num_games = num_games
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.boards = np.zeros((num_games, rows, cols), dtype=np.int8)
+        self._heights = np.zeros((num_games, cols), dtype=np.intp)
+        self.winners = np.zeros(num_games, dtype=np.int8)
+        self.move_counts = np.zeros(num_games, dtype=np.intp)
+        self._cell_windows = line_table(rows, cols, k).cell_windows
+        readonly = self.boards.view()
+        readonly.flags.writeable = False
+        self._readonly = readonly
+        self._views = list(readonly)
+
+    def reset(self) -> None:
+        """Empties every board."""
+        self.boards[:] = 0
+        self._heights[:] = 0
+        self.winners[:] = 0
+        self.move_counts[:] = 0
+
+    def run(self, agent1, agent2, seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Plays ``num_games`` games with ``agent1`` moving first in all of them.
+
+        Invalid moves are replaced with a random valid column, as ``Evaluation`` does.
+
+        Args:
+            agent1: Agent playing as player 1.
+            agent2: Agent playing as player 2.
+            seed (int or None): Seeds ``random`` and NumPy's global generator first.
+
+        Returns:
+            tuple: The winner of each game (0 for a draw) and the number of moves.
+        """
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed % (1 << 32))
+        self.reset()
+        agent1.player_id = 1
+        agent2.player_id = 2
+        flat = self.boards.reshape(self.num_games, -1)
+        active = np.arange(self.num_games)
+        player = 1
+
+        while len(active):
+            agent = agent1 if player == 1 else agent2
+            moves = self._ask(agent, active)
+
+            # Replace invalid moves, then drop the pieces.
+            invalid = (moves < 0) | (moves >= self.cols)
+            invalid |= self._heights[active, np.where(invalid, 0, moves)] >= self.rows
+            for i in np.flatnonzero(invalid):
+                open_cols = np.flatnonzero(self._heights[active[i]] < self.rows)
+                moves[i] = random.choice(open_cols.tolist())
+            heights = self._heights[active, moves]
+            rows = self.rows - 1 - heights
+            self.boards[active, rows, moves] = player
+            self._heights[active, moves] += 1
+            self.move_counts[active] += 1
+
+            # k in a row through the new piece, in every active game at once.
+            windows = self._cell_windows[rows * self.cols + moves]
+            won = (flat[active[:, None, None], windows] == player).all(axis=2).any(axis=1)
+            self.winners[active[won]] = player
+            full = self.move_counts[active] == self.rows * self.cols
+            active = active[~(won | full)]
+            player = 3 - player
+
+        return self.winners.copy(), self.move_counts.copy()
+
+    def _ask(self, agent, active: np.ndarray) -> np.ndarray:
+        """
+        Returns the moves of ``agent`` for the unfinished games.
+        """
+        if hasattr(agent, "get_moves"):
+            boards = self._readonly if len(active) == self.num_games else self._readonly[active]
+            return np.array(agent.get_moves(boards), dtype=np.intp)
+        views = self._views
+        return np.array([agent.get_move(views[k]) for k in active.tolist()], dtype=np.intp)
@@ -0,0 +1,278 @@
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from connect4.utils.bitboard import Bitboard
+from connect4.utils.transposition_table import UPPER_BOUND, TranspositionTable
+
+# How many nodes are searched between clock checks when a deadline is set.
+_CLOCK_CHECK_INTERVAL = 4096
+
+
+class SolverTimeout(Exception):
+    """Raised when a solve runs past its deadline."""
+
+
+class Solver:
+    """
+    Exact Connect 4 solver working directly on bit masks.
+
+    Masks are Python ints in the ``Bitboard`` layout, so any board size and win
+    length ``k`` work; the usual 4-in-a-row threat detection is unrolled.
+
+    Positions are ``(current, mask, moves)``: the pieces of the player to move, all
+    pieces, and the number of pieces. Scores follow the usual convention: a win with
+    the player's ``n``-th piece (counting from the start of the game) scores
+    ``(rows * cols + 1) // 2 + 1 - n``, a draw scores 0 and losses are negative.
+
+    The search is a null-window negamax that only plays moves which don't hand the
+    opponent an immediate win, sorts them by the number of winning cells they
+    create, and stores upper bounds in a transposition table keyed by the unique
+    position key ``current + mask``.
+
+    Attributes:
+        rows (int): Number of rows on the board.
+        cols (int): Number of columns on the board.
+        k (int): Pieces in a row needed to win.
+        tt (TranspositionTable): Upper bounds of solved positions.
+        nodes (int): Positions visited since the last ``reset_stats``.
+    """
+
+    def __init__(self, rows: int = 6, cols: int = 7, tt_size_mb: float = 64, k: int = 4) -> None:
+        """
+        Initializes the solver.
+
+        Args:
+            rows (int): Number of rows on the board.
+            cols (int): Number of columns on the board.
+            tt_size_mb (float): Memory cap of the transposition table in megabytes.
+            k (int): Pieces in a row needed to win.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        if k != 4:
+            # Shadow the unrolled method so the hot paths still make a single call.
+            self.winning_cells = self._winning_cells_k
+        self.cells = rows * cols
+        self.h1 = rows + 1
+        self.bottom = sum(1 << (c * self.h1) for c in range(cols))
+        self.board_mask = self.bottom * ((1 << rows) - 1)
+        self.column_masks = [((1 << rows) - 1) << (c * self.h1) for c in range(cols)]
+        self.top_masks = [1 << (rows - 1 + c * self.h1) for c in range(cols)]
+        self.order = sorted(range(cols), key=lambda c: (abs(2 * c - (cols - 1)), c))
+        self.tt = TranspositionTable(tt_size_mb)
+        self.nodes = 0
+        self.deadline = None
+
+    def position_from_board(self, board: np.ndarray, player: int):
+        """
+        Converts an ndarray board into ``(current, mask, moves)`` for ``player`` to move.
+        """
+        position = Bitboard.from_array(board, self.k)
+        mask = position.masks[1] | position.masks[2]
+        return position.masks[player], mask, position.move_count
+
+    def winning_cells(self, position: int, mask: int) -> int:
+        """
+        Returns the empty cells that would complete four in a row for ``position``.
+        """
+        h, h1, h2 = self.rows, self.h1, self.h1 + 1
+        # Vertical
+        r = (position << 1) & (position << 2) & (position << 3)
+        # Horizontal and the two diagonals: three pieces in line on either side of the gap.
+        for s in (h1, h, h2):
+            p = (position << s) & (position << 2 * s)
+            r |= p & (position << 3 * s)
+            r |= p & (position >> s)
+            p = (position >> s) & (position >> 2 * s)
+            r |= p & (position << s)
+            r |= p & (position >> 3 * s)
+        return r & (self.board_mask ^ mask)
+
+    def _winning_cells_k(self, position: int, mask: int) -> int:
+        """
+        ``winning_cells`` for any ``k``: a gap completes a line when ``left`` pieces
+        lie on one side of it and ``k - 1 - left`` on the other.
+        """
+        k = self.k
+        # Vertical: the k - 1 pieces below the gap.
+        below = position << 1
+        for i in range(2, k):
+            below &= position << i
+        r = below
+        for s in (self.h1, self.rows, self.h1 + 1):
+            # before[n] / after[n]: the n cells on either side of the gap are filled.
+            before, after = [-1], [-1]
+            for n in range(1, k):
+                before.append(before[-1] & (position << n * s))
+                after.append(after[-1] & (position >> n * s))
+            for left in range(k):
+                r |= before[left] & after[k - 1 - left]
+        return r & (self.board_mask ^ mask)
+
+    def possible(self, mask: int) -> int:
+        """Returns the cell each non-full column would be played into."""
+        return (mask + self.bottom) & self.board_mask
+
+    def can_win_next(self, current: int, mask: int) -> bool:
+        """Returns True if the player to move can win immediately."""
+        return bool(self.winning_cells(current, mask) & self.possible(mask))
+
+    def non_losing_moves(self, current: int, mask: int) -> int:
+        """
+        Returns the playable cells that don't let the opponent win on the next move.
+        """
+        possible = self.possible(mask)
+        opponent_win = self.winning_cells(current ^ mask, mask)
+        forced = possible & opponent_win
+        if forced:
+            if forced & (forced - 1):
+                return 0
+            possible = forced
+        return possible & ~(opponent_win >> 1)
+
+    def negamax(self, current: int, mask: int, moves: int, alpha: int, beta: int) -> int:
+        """
+        Scores a position in which the player to move cannot win immediately.
+
+        Args:
+            current (int): Pieces of the player to move.
+            mask (int): All pieces.
+            moves (int): Number of pieces on the board.
+            alpha (int): Lower bound of the search window.
+            beta (int): Upper bound of the search window.
+
+        Returns:
+            int: The exact score if it lies inside the window, otherwise a bound.
+        """
+        self.nodes += 1
+        if (self.deadline is not None and self.nodes % _CLOCK_CHECK_INTERVAL == 0
+                and time.perf_counter() > self.deadline):
+            raise SolverTimeout()
+
+        nxt = self.non_losing_moves(current, mask)
+        if not nxt:
+            return -((self.cells - moves) // 2)
+        if moves >= self.cells - 2:
+            return 0
+
+        low = -((self.cells - 2 - moves) // 2)
+        if alpha < low:
+            alpha = low
+            if alpha >= beta:
+                return alpha
+
+        high = (self.cells - 1 - moves) // 2
+        key = current + mask
+        entry = self.tt.probe(key)
+        if entry is not None:
+            high = entry[2]
+        if beta > high:
+            beta = high
+            if alpha >= beta:
+                return beta
+
+        candidates = []
+        for col in self.order:
+            move = nxt & self.column_masks[col]
+            if move:
+                score = bin(self.winning_cells(current | move, mask)).count("1")
+                candidates.append((-score, len(candidates), move))
+        candidates.sort()
+
+        opponent = current ^ mask
+        for _, _, move in candidates:
+            child_mask = mask | move
+            score = -self.negamax(opponent, child_mask, moves + 1, -beta, -alpha)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        self.tt.store(key, 0, UPPER_BOUND, alpha, None)
+        return alpha
+
+    def solve(self, current: int, mask: int, moves: int) -> int:
+        """
+        Returns the exact score of a position for the player to move.
+
+        The score is found by a sequence of null-window searches that narrow the
+        range of possible scores until it contains a single value.
+        """
+        if self.can_win_next(current, mask):
+            return (self.cells + 1 - moves) // 2
+        low = -((self.cells - moves) // 2)
+        high = (self.cells + 1 - moves) // 2
+        while low < high:
+            med = low + (high - low) // 2
+            if med <= 0 and low // 2 < med:
+                med = low // 2
+            elif med >= 0 and high // 2 > med:
+                med = high // 2
+            r = self.negamax(current, mask, moves, med, med + 1)
+            if r <= med:
+                high = r
+            else:
+                low = r
+        return low
+
+    def analyze(self, current: int, mask: int, moves: int) -> Dict[int, int]:
+        """
+        Returns the exact score of every playable column for the player to move.
+        """
+        scores = {}
+        possible = self.possible(mask)
+        for col in self.order:
+            move = possible & self.column_masks[col]
+            if not move:
+                continue
+            if self.winning_cells(current, mask) & move:
+                scores[col] = (self.cells + 1 - moves) // 2
+            else:
+                child_mask = mask | move
+                scores[col] = -self.solve(current ^ mask, child_mask, moves + 1)
+        return scores
+
+    def solve_board(self, board: np.ndarray, player: int, time_limit: Optional[float] = None) -> int:
+        """
+        Returns the exact score of an ndarray board for ``player`` to move.
+
+        Args:
+            board (np.ndarray): A board without four in a row.
+            player (int): The player to move.
+            time_limit (float or None): Seconds before SolverTimeout is raised.
+
+        Returns:
+            int: Positive if ``player`` wins with perfect play, 0 for a draw.
+        """
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        try:
+            return self.solve(*self.position_from_board(board, player))
+        finally:
+            self.deadline = None
+
+    def reset_stats(self) -> None:
+        """Resets the node counter."""
+        self.nodes = 0
+
+
+def exact_scores(boards: np.ndarray, player_id: int = 1, solver: Optional[Solver] = None,
+                 k: int = 4) -> np.ndarray:
+    """
+    Solves a batch of boards, e.g. to replace the win/loss/draw labels of the UCI
+    dataset (whose 8-ply positions all have player 1, "x", to move) with exact scores.
+
+    Args:
+        boards (np.ndarray): Boards of shape (N, rows, cols).
+        player_id (int): The player to move in every board.
+        solver (Solver or None): Solver to reuse, so its table is shared across boards.
+        k (int): Pieces in a row needed to win, for a new solver.
+
+    Returns:
+        np.ndarray: int8 scores for ``player_id``.
+    """
+    if solver is None:
+        solver = Solver(boards.shape[1], boards.shape[2], k=k)
+    return np.array([solver.solve_board(board, player_id) for board in boards], dtype=np.int8)
@@ -0,0 +1,298 @@
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from connect4.utils.game_state import GameState
+
+# Agents of the current worker process, unpickled once by ``_init_worker``.
+_WORKER_AGENTS = None
+
+
+class MatchResult:
+    """
+    Running totals of the games between two agents.
+
+    Attributes:
+        agent1 (str): Name of the first agent.
+        agent2 (str): Name of the second agent.
+        wins (Dict[str, int]): Games won by each agent.
+        draws (int): Drawn games.
+        games (int): Games recorded so far.
+        total_moves (int): Moves played over all recorded games.
+        move_counts (List[int]): Moves played in each recorded game.
+    """
+
+    def __init__(self, agent1: str, agent2: str) -> None:
+        self.agent1 = agent1
+        self.agent2 = agent2
+        self.wins = {agent1: 0, agent2: 0}
+        self.draws = 0
+        self.games = 0
+        self.total_moves = 0
+        self.move_counts = []
+
+    def record(self, winner: Optional[str], moves: int) -> None:
+        """
+        Adds one finished game; ``winner`` is None for a draw.
+        """
+        if winner is None:
+            self.draws += 1
+        else:
+            self.wins[winner] += 1
+        self.games += 1
+        self.total_moves += moves
+        self.move_counts.append(moves)
+
+    @property
+    def average_moves(self) -> float:
+        return self.total_moves / self.games if self.games else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.agent1} {self.wins[self.agent1]} - {self.wins[self.agent2]} {self.agent2} "
+                f"({self.draws} draws, {self.games} games, {self.average_moves:.1f} moves/game)")
+
+
+def game_seed(seed: int, pairing: int, game: int) -> int:
+    """
+    Returns the seed of one game, independent of which worker plays it.
+    """
+    return (seed * 1_000_003 + pairing) * 1_000_003 + game
+
+
+def play_game(agent1, agent2, seed: int, rows: int = 6, cols: int = 7, k: int = 4) -> Tuple[int, int]:
+    """
+    Plays one game with ``agent1`` moving first.
+
+    The global ``random`` and NumPy generators are seeded with ``seed`` first, and
+    both agents are reset, so a game's moves don't depend on the games played
+    before it. Both agents get the same ``GameState`` and are notified of every
+    move. Invalid moves are replaced by a random valid one.
+
+    Returns:
+        tuple: The winning player (1 or 2, 0 for a draw) and the number of moves.
+    """
+    random.seed(seed)
+    np.random.seed(seed % (1 << 32))
+    for player, agent in ((1, agent1), (2, agent2)):
+        agent.player_id = player
+        agent.reset()
+
+    game = GameState(np.zeros((rows, cols), dtype=int), 1, k)
+    while not game.is_terminal_node():
+        player = game.current_player
+        agent = agent1 if player == 1 else agent2
+        move = agent.get_move(game)
+        valid_moves = game.get_valid_moves()
+        if move not in valid_moves:
+            move = random.choice(valid_moves)
+        game.make_move(move, player)
+        agent1.notify_move(game, move, player)
+        agent2.notify_move(game, move, player)
+    return game.winner, game.position.move_count
+
+
+def _init_worker(agents: Dict[str, object]) -> None:
+    global _WORKER_AGENTS
+    _WORKER_AGENTS = agents
+
+
+def _play_task(pairing: int, name1: str, name2: str, games: List[int], seed: int,
+               geometry: Tuple[int, int, int] = (6, 7, 4)) -> List[Tuple[int, Optional[str], int]]:
+    """
+    Plays a chunk of one pairing's games with this worker's own agent instances.
+
+    Even-numbered games have ``name1`` move first, odd ones ``name2``. ``geometry``
+    is the ``(rows, cols, k)`` of the board.
+
+    Returns:
+        list: ``(pairing, winner name or None, moves)`` for each game.
+    """
+    results = []
+    for index in games:
+        first, second = (name1, name2) if index % 2 == 0 else (name2, name1)
+        winner, moves = play_game(_WORKER_AGENTS[first], _WORKER_AGENTS[second], game_seed(seed, pairing, index),
+                                  *geometry)
+        results.append((pairing, {0: None, 1: first, 2: second}[winner], moves))
+    return results
+
+
+class Tournament:
+    """
+    Plays matches between agents across a process pool.
+
+    Every worker unpickles its own copy of the agents once, so searches and caches
+    are never shared between processes. Each game is seeded from the tournament
+    seed, the pairing and the game number, so results don't depend on the number of
+    workers or on how games are split between them. Results are folded into
+    ``MatchResult`` totals as chunks finish.
+
+    Attributes:
+        agents (Dict[str, object]): Agents by name.
+        workers (int): Worker processes; 1 plays in this process.
+        seed (int): Tournament seed.
+        chunk_size (int): Games per worker task.
+        geometry (Tuple[int, int, int]): Rows, columns and win length of the board.
+        games_per_second (float): Throughput of the last run.
+    """
+
+    def __init__(self, agents: Dict[str, object], workers: int = 1, seed: int = 0, chunk_size: int = 10,
+                 rows: int = 6, cols: int = 7, k: int = 4) -> None:
+        """
+        Initializes the tournament.
+
+        Args:
+            agents (Dict[str, object]): Agents by name. Their ``player_id`` is set
+                for each game.
+            workers (int): Worker processes; 1 plays in this process.
+            seed (int): Tournament seed.
+            chunk_size (int): Games per worker task.
+            rows (int): Number of rows on the board.
+            cols (int): Number of columns on the board.
+            k (int): Pieces in a row needed to win.
+        """
+        self.agents = dict(agents)
+        self.workers = workers
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.geometry = (rows, cols, k)
+        self.games_per_second = 0.0
+
+    def play_match(self, name1: str, name2: str, games: int, swap_colors: bool = False,
+                   verbose: bool = True) -> MatchResult:
+        """
+        Plays ``games`` games between two agents.
+
+        Args:
+            name1 (str): First agent; moves first unless colors are swapped.
+            name2 (str): Second agent.
+            games (int): Number of games.
+            swap_colors (bool): Alternate which agent moves first.
+            verbose (bool): Show a progress bar.
+
+        Returns:
+            MatchResult: The totals.
+        """
+        return self._run([(name1, name2)], games, swap_colors, verbose)[0]
+
+    def round_robin(self, games_per_pair: int, verbose: bool = True) -> List[MatchResult]:
+        """
+        Plays every pair of agents, alternating who moves first.
+
+        Returns:
+            List[MatchResult]: One result per pair.
+        """
+        return self._run(list(combinations(self.agents, 2)), games_per_pair, True, verbose)
+
+    def standings(self, results: List[MatchResult]) -> List[Tuple[str, float, int, int, int]]:
+        """
+        Ranks agents by points: 1 per win and 0.5 per draw.
+
+        Returns:
+            list: ``(name, points, wins, draws, losses)`` tuples, best first.
+        """
+        table = {name: [0.0, 0, 0, 0] for name in self.agents}
+        for result in results:
+            for name, other in ((result.agent1, result.agent2), (result.agent2, result.agent1)):
+                row = table[name]
+                row[1] += result.wins[name]
+                row[2] += result.draws
+                row[3] += result.wins[other]
+                row[0] += result.wins[name] + 0.5 * result.draws
+        return sorted(((name, *row) for name, row in table.items()), key=lambda r: -r[1])
+
+    def _run(self, pairings: List[Tuple[str, str]], games: int, swap_colors: bool,
+             verbose: bool) -> List[MatchResult]:
+        results = [MatchResult(a, b) for a, b in pairings]
+        # Without swapping, only even game numbers are used, so name1 always starts.
+        numbers = list(range(games)) if swap_colors else list(range(0, 2 * games, 2))
+        tasks = [(pairing, a, b, numbers[i:i + self.chunk_size], self.seed, self.geometry)
+                 for pairing, (a, b) in enumerate(pairings)
+                 for i in range(0, games, self.chunk_size)]
+        total = len(pairings) * games
+        done = 0
+        start = time.time()
+
+        def collect(chunk):
+            nonlocal done
+            for pairing, winner, moves in chunk:
+                results[pairing].record(winner, moves)
+            done += len(chunk)
+            if verbose:
+                self._progress(done, total, time.time() - start)
+
+        if self.workers <= 1:
+            _init_worker(self.agents)
+            for task in tasks:
+                collect(_play_task(*task))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.agents,)) as pool:
+                futures = [pool.submit(_play_task, *task) for task in tasks]
+                for future in as_completed(futures):
+                    collect(future.result())
+
+        elapsed = time.time() - start
+        self.games_per_second = total / elapsed if elapsed > 0 else 0.0
+        if verbose:
+            print(f"\n✅ {total} games in {elapsed:.2f} seconds ({self.games_per_second:.1f} games/s)")
+        return results
+
+    @staticmethod
+    def _progress(done: int, total: int, elapsed: float, bar_length: int = 30) -> None:
+        progress = done / total
+        filled_length = int(bar_length * progress)
+        bar = "=" * filled_length + "-" * (bar_length - filled_length)
+        rate = done / elapsed if elapsed > 0 else 0.0
+        sys.stdout.write(f"\rPlaying: [{bar}] {progress * 100:.1f}% {rate:.1f} games/s")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    from connect4.agents.hybrid_agent import HybridAgent
+    from connect4.agents.mcts_agent import MCTSAgent
+    from connect4.agents.minimax_agent import MinimaxAgent
+    from connect4.agents.ml_agent import MLAgent, model_fits
+    from connect4.agents.random_agent import RandomAgent
+    from connect4.agents.smart_agent import SmartAgent
+
+    parser = argparse.ArgumentParser(description="Round-robin tournament between the built-in agents.")
+    parser.add_argument("--games", type=int, default=100, help="games per pair of agents")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="tournament seed")
+    parser.add_argument("--depth", type=int, default=4, help="MinimaxAgent and HybridAgent search depth")
+    parser.add_argument("--mcts-time", type=float, default=0.2, help="MCTSAgent seconds per move")
+    parser.add_argument("--rows", type=int, default=6, help="rows of the board")
+    parser.add_argument("--cols", type=int, default=7, help="columns of the board")
+    parser.add_argument("--connect", type=int, default=4, help="pieces in a row needed to win")
+    parser.add_argument("--no-ml", action="store_true", help="leave out the ML and Hybrid agents; "
+                        "they are always left out on boards other than 6x7, the only one their model knows")
+    args = parser.parse_args()
+
+    agents = {
+        "Random": RandomAgent(player_id=1),
+        "Smart": SmartAgent(player_id=1, k=args.connect),
+        "Minimax": MinimaxAgent(player_id=1, max_depth=args.depth),
+        "MCTS": MCTSAgent(player_id=1, time_limit=args.mcts_time, rows=args.rows, cols=args.cols, k=args.connect),
+    }
+    if not args.no_ml and not model_fits(args.rows, args.cols):
+        print(f"Leaving out ML and Hybrid: their model doesn't score {args.rows}x{args.cols} boards.")
+    elif not args.no_ml:
+        ml_agent = MLAgent(player_id=1)
+        agents["ML"] = ml_agent
+        agents["Hybrid"] = HybridAgent(player_id=1, depth=args.depth, ml_agent=ml_agent)
+    tournament = Tournament(agents, workers=args.workers, seed=args.seed,
+                            rows=args.rows, cols=args.cols, k=args.connect)
+    match_results = tournament.round_robin(args.games)
+    for match in match_results:
+        print(match)
+    print("\nStandings:")
+    for name, points, wins, draws, losses in tournament.standings(match_results):
+        print(f"  {name:<8} {points:6.1f} pts  {wins}W {draws}D {losses}L")
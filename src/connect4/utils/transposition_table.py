@@ -0,0 +1,116 @@
+import random
+from typing import Optional, Tuple
+
+# Bound flags stored with each entry.
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Rough size of one slot: the key, a pointer to the entry tuple and the tuple itself.
+ENTRY_BYTES = 128
+
+_ZOBRIST_CACHE = {}
+
+
+def zobrist_table(rows: int = 6, cols: int = 7, seed: int = 2025) -> list:
+    """
+    Returns the Zobrist keys for a board size, indexed as ``keys[player][bit]``.
+
+    ``bit`` is the Bitboard bit index of the cell, so a move can be hashed from the
+    column height before it is played. The keys are generated once per board size
+    from a fixed seed, so hashes are stable between runs.
+
+    Args:
+        rows (int): Number of rows on the board.
+        cols (int): Number of columns on the board.
+        seed (int): Seed for the key generator.
+
+    Returns:
+        list: Three lists of 64-bit keys; index 0 is unused.
+    """
+    keys = _ZOBRIST_CACHE.get((rows, cols, seed))
+    if keys is None:
+        rng = random.Random(seed)
+        size = (rows + 1) * cols
+        keys = [[0] * size] + [[rng.getrandbits(64) for _ in range(size)] for _ in range(2)]
+        _ZOBRIST_CACHE[(rows, cols, seed)] = keys
+    return keys
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by Zobrist hash.
+
+    Each slot holds one entry ``(depth, flag, value, best_move, generation)``. A new
+    entry replaces the one in its slot when the slot is empty, holds the same
+    position, was written during an earlier search, or was searched no deeper than
+    the new one (depth-preferred replacement with aging).
+
+    Attributes:
+        size (int): Number of slots.
+        generation (int): Counter bumped by ``new_search`` to age old entries.
+    """
+
+    def __init__(self, memory_mb: float = 16) -> None:
+        """
+        Allocates the table.
+
+        Args:
+            memory_mb (float): Approximate memory cap in megabytes.
+        """
+        self.size = max(1, int(memory_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.keys = [None] * self.size
+        self.entries = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self) -> None:
+        """Marks existing entries as belonging to an earlier search."""
+        self.generation += 1
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters."""
+        self.keys = [None] * self.size
+        self.entries = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, Optional[int], int]]:
+        """
+        Looks up a position.
+
+        Args:
+            key (int): Zobrist hash of the position.
+
+        Returns:
+            tuple or None: ``(depth, flag, value, best_move, generation)`` if stored.
+        """
+        self.probes += 1
+        index = key % self.size
+        if self.keys[index] == key:
+            self.hits += 1
+            return self.entries[index]
+        return None
+
+    def store(self, key: int, depth: int, flag: int, value: int, best_move: Optional[int]) -> None:
+        """
+        Stores a search result, subject to the replacement policy.
+
+        Args:
+            key (int): Zobrist hash of the position.
+            depth (int): Remaining depth the position was searched to.
+            flag (int): EXACT, LOWER_BOUND or UPPER_BOUND.
+            value (int): Score of the position.
+            best_move (int or None): Best column found, if any.
+        """
+        index = key % self.size
+        old = self.entries[index]
+        if old is not None and self.keys[index] != key and old[4] == self.generation and old[0] > depth:
+            return
+        self.keys[index] = key
+        self.entries[index] = (depth, flag, value, best_move, self.generation)
+        self.stores += 1
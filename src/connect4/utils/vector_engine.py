@@ -0,0 +1,278 @@
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from connect4.utils.bitboard import fits_uint64
+from connect4.utils.board_utils import winning_columns
+from connect4.utils.lines import line_table
+
+# Policies the engine can play for either side.
+POLICIES = ("random", "smart")
+
+
+class VectorEngine:
+    """
+    Advances K Connect 4 games per step with NumPy.
+
+    The boards live in one ``(K, rows, cols)`` int8 tensor, next to a ``(K, cols)``
+    column height array and one uint64 bit mask per player and game in the
+    ``Bitboard`` layout. Dropping a piece is a scatter into the tensor plus an OR
+    into the mask, and k-in-a-row checks are shift-and-AND passes over all K
+    masks at once (the packed form of sliding a k-cell window along each line).
+    Boards whose masks don't fit in 64 bits keep no masks; their win checks count
+    pieces in the ``lines.line_table`` windows of the tensor instead.
+
+    The "random" policy picks a uniformly random open column like ``RandomAgent``;
+    "smart" takes the leftmost winning column, else blocks the leftmost column
+    where the opponent would win, else plays randomly, like ``SmartAgent``.
+
+    Attributes:
+        num_games (int): Number of games K.
+        rows (int): Number of rows on the board.
+        cols (int): Number of columns on the board.
+        k (int): Pieces in a row needed to win.
+        boards (np.ndarray): int8 boards, shape (K, rows, cols).
+        heights (np.ndarray): Pieces in each column, shape (K, cols).
+        masks (np.ndarray or None): uint64 masks of player 1 and 2, shape (2, K),
+            or None for boards too large for 64-bit masks.
+        winners (np.ndarray): Winner of each finished game, 0 for a draw or unfinished game.
+        move_counts (np.ndarray): Moves played in each game.
+        to_move (np.ndarray): Player to move in each game.
+        active (np.ndarray): Indices of the unfinished games.
+    """
+
+    def __init__(self, num_games: int, rows: int = 6, cols: int = 7, seed: Optional[int] = None,
+                 k: int = 4) -> None:
+        """
+        Initializes K empty games.
+
+        Args:
+            num_games (int): Number of games K.
+            rows (int): Number of rows on the board.
+            cols (int): Number of columns on the board.
+            seed (int or None): Seed of the engine's random generator.
+            k (int): Pieces in a row needed to win.
+        """
+        self.num_games = num_games
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self._h1 = rows + 1
+        self._col_base = (np.arange(cols, dtype=np.uint64) * np.uint64(self._h1))
+        # Each run-doubling pass of ``_has_line`` ANDs a mask with itself shifted by
+        # ``step`` cells; for k = 4 that is steps 1 and 2.
+        steps, length = [], 1
+        while length < k:
+            steps.append(min(length, k - length))
+            length += steps[-1]
+        self._run_shifts = [[np.uint64(s * step) for step in steps] for s in (1, self._h1, rows, self._h1 + 1)]
+        self._lines = line_table(rows, cols, k)
+        self.boards = np.zeros((num_games, rows, cols), dtype=np.int8)
+        self.heights = np.zeros((num_games, cols), dtype=np.int8)
+        self.masks = np.zeros((2, num_games), dtype=np.uint64) if fits_uint64(rows, cols) else None
+        self.winners = np.zeros(num_games, dtype=np.int8)
+        self.move_counts = np.zeros(num_games, dtype=np.int16)
+        self.to_move = np.ones(num_games, dtype=np.int8)
+        self.active = np.arange(num_games)
+
+    def reset(self) -> None:
+        """Empties every board, with player 1 to move."""
+        self.boards[:] = 0
+        self.heights[:] = 0
+        if self.masks is not None:
+            self.masks[:] = 0
+        self.winners[:] = 0
+        self.move_counts[:] = 0
+        self.to_move[:] = 1
+        self.active = np.arange(self.num_games)
+
+    def set_position(self, board: np.ndarray, player: int) -> None:
+        """
+        Starts every game from the same non-terminal position, e.g. for rollouts.
+
+        Args:
+            board (np.ndarray): A (rows, cols) board with 0, 1 and 2.
+            player (int): The player to move.
+        """
+        self.reset()
+        board = np.asarray(board)
+        self.boards[:] = board
+        self.heights[:] = np.count_nonzero(board, axis=0)
+        if self.masks is not None:
+            bits = np.uint64(1) << self._bit_grid()
+            for p in (1, 2):
+                self.masks[p - 1] = np.bitwise_or.reduce(bits[board == p]) if (board == p).any() else 0
+        self.move_counts[:] = np.count_nonzero(board)
+        self.to_move[:] = player
+
+    def _bit_grid(self) -> np.ndarray:
+        """Returns the Bitboard bit index of each (row, col) cell."""
+        r = np.arange(self.rows)[:, None]
+        c = np.arange(self.cols)[None, :]
+        return (c * self._h1 + self.rows - 1 - r).astype(np.uint64)
+
+    def _has_line(self, masks: np.ndarray) -> np.ndarray:
+        """Returns which masks contain k in a row."""
+        found = np.zeros(masks.shape, dtype=bool)
+        for first, *rest in self._run_shifts:
+            runs = masks & (masks >> first)
+            for shift in rest:
+                runs &= runs >> shift
+            found |= runs != 0
+        return found
+
+    def valid_moves(self, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Returns a (n, cols) bool array of the open columns of ``games`` (default: active).
+        """
+        games = self.active if games is None else games
+        return self.heights[games] < self.rows
+
+    def winning_moves(self, player: np.ndarray, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Returns a (n, cols) bool array of the columns that would give ``player``
+        k in a row in each of ``games`` (default: active).
+
+        Args:
+            player (np.ndarray): The player of each game, or one int for all of them.
+            games (np.ndarray or None): Game indices.
+        """
+        games = self.active if games is None else games
+        player = np.broadcast_to(np.asarray(player), games.shape)
+        if self.masks is None:
+            return winning_columns(self.boards[games], self.k)[np.arange(len(games)), player]
+        own = np.where(player == 1, self.masks[0, games], self.masks[1, games])
+        heights = self.heights[games]
+        open_cols = heights < self.rows
+        landing = np.uint64(1) << (self._col_base + heights.astype(np.uint64))
+        wins = self._has_line(own[:, None] | landing)
+        return wins & open_cols
+
+    def random_moves(self, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns a uniformly random open column for each of ``games``."""
+        valid = self.valid_moves(games)
+        # Pick the r-th open column with r uniform below the number of open columns.
+        counts = valid.cumsum(axis=1, dtype=np.int8)
+        r = (self.rng.random(len(valid), dtype=np.float32) * counts[:, -1]).astype(np.int8)
+        return (counts <= r[:, None]).sum(axis=1, dtype=np.intp)
+
+    def smart_moves(self, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns SmartAgent's choice for the player to move in each of ``games``."""
+        games = self.active if games is None else games
+        player = self.to_move[games]
+        moves = self.random_moves(games)
+        block = self.winning_moves(3 - player, games)
+        has_block = block.any(axis=1)
+        moves[has_block] = block[has_block].argmax(axis=1)
+        win = self.winning_moves(player, games)
+        has_win = win.any(axis=1)
+        moves[has_win] = win[has_win].argmax(axis=1)
+        return moves
+
+    def play(self, moves: np.ndarray, games: Optional[np.ndarray] = None) -> None:
+        """
+        Plays one move in each of ``games`` (default: active) for its player to move,
+        then drops finished games from ``active``.
+
+        Args:
+            moves (np.ndarray): One open column per game.
+            games (np.ndarray or None): Game indices, a subset of ``active``.
+        """
+        games = self.active if games is None else games
+        moves = np.asarray(moves)
+        player = self.to_move[games]
+        cell = games * self.cols + moves
+        heights = self.heights.ravel()[cell].astype(np.intp)
+        self.boards.ravel()[cell + (self.rows - 1 - heights) * self.cols
+                            + games * ((self.rows - 1) * self.cols)] = player
+        self.heights.ravel()[cell] = heights + 1
+        self.move_counts[games] += 1
+
+        if self.masks is None:
+            # k in a row through the new piece, from the windows of its cell.
+            windows = self._lines.cell_windows[(self.rows - 1 - heights) * self.cols + moves]
+            cells = self.boards.reshape(self.num_games, -1)[games[:, None, None], windows]
+            won = (cells == player[:, None, None]).all(axis=2).any(axis=1)
+        else:
+            # masks is (2, K): flat index (player - 1) * K + game.
+            slot = (player.astype(np.intp) - 1) * self.num_games + games
+            flat_masks = self.masks.ravel()
+            own = flat_masks[slot] | (np.uint64(1) << (self._col_base[moves] + heights.astype(np.uint64)))
+            flat_masks[slot] = own
+            won = self._has_line(own)
+        self.winners[games[won]] = player[won]
+        self.to_move[games] = 3 - player
+        finished = np.zeros(self.num_games, dtype=bool)
+        finished[games[won | (self.move_counts[games] == self.rows * self.cols)]] = True
+        self.active = self.active[~finished[self.active]]
+
+    def moves_for(self, policy: str, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns the moves of ``policy`` ("random" or "smart") for ``games``."""
+        if policy == "random":
+            return self.random_moves(games)
+        if policy == "smart":
+            return self.smart_moves(games)
+        raise ValueError(f"Unknown policy {policy!r}; expected one of {POLICIES}.")
+
+    def run(self, policy1: str = "random", policy2: str = "random") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Plays every unfinished game to the end.
+
+        Args:
+            policy1 (str): Policy of player 1.
+            policy2 (str): Policy of player 2.
+
+        Returns:
+            tuple: The winner of each game (0 for a draw) and its number of moves.
+        """
+        while len(self.active):
+            games = self.active
+            player = self.to_move[games]
+            moves = np.empty(len(games), dtype=np.intp)
+            for p, policy in ((1, policy1), (2, policy2)):
+                mine = player == p
+                if mine.any():
+                    moves[mine] = self.moves_for(policy, games[mine])
+            self.play(moves, games)
+        return self.winners.copy(), self.move_counts.copy()
+
+
+def simulate(num_games: int, policy1: str = "random", policy2: str = "random",
+             seed: Optional[int] = None, batch_size: int = 1 << 18,
+             rows: int = 6, cols: int = 7, k: int = 4) -> np.ndarray:
+    """
+    Plays ``num_games`` games in batches and counts the results.
+
+    Returns:
+        np.ndarray: Draws, player 1 wins and player 2 wins.
+    """
+    counts = np.zeros(3, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_games, batch_size):
+        engine = VectorEngine(min(batch_size, num_games - start), rows, cols, int(rng.integers(1 << 63)), k)
+        winners, _ = engine.run(policy1, policy2)
+        counts += np.bincount(winners, minlength=3)
+    return counts
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play many Random/Smart games at once.")
+    parser.add_argument("--games", type=int, default=1_000_000, help="number of games")
+    parser.add_argument("--p1", choices=POLICIES, default="random", help="policy of player 1")
+    parser.add_argument("--p2", choices=POLICIES, default="smart", help="policy of player 2")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--rows", type=int, default=6, help="rows of the board")
+    parser.add_argument("--cols", type=int, default=7, help="columns of the board")
+    parser.add_argument("--connect", type=int, default=4, help="pieces in a row needed to win")
+    args = parser.parse_args()
+
+    start = time.time()
+    draws, wins_1, wins_2 = simulate(args.games, args.p1, args.p2, args.seed,
+                                     rows=args.rows, cols=args.cols, k=args.connect)
+    elapsed = time.time() - start
+    print(f"✅ {args.games} games in {elapsed:.2f} seconds ({args.games / elapsed:.0f} games/s)")
+    print(f"Player 1 ({args.p1}) wins: {wins_1}  Player 2 ({args.p2}) wins: {wins_2}  Draws: {draws}")